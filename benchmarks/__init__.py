@@ -0,0 +1,5 @@
+"""
+离线基准测试
+使用本地替身服务器（模拟币安广场主页、信息流接口和飞书 Webhook）测量爬虫各环节的吞吐量，
+运行方式: python -m benchmarks.run
+"""
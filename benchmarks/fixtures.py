@@ -0,0 +1,77 @@
+"""
+基准测试数据
+生成与信息流接口格式一致的合成文章条目，也可以加载录制的接口响应（JSON 文件），
+由替身服务器的页面脚本渲染为与真实页面相同类名（FeedList、nick-username、card__title 等）的卡片
+"""
+
+import json
+import random
+import time
+
+_WORDS = (
+    "BTC ETH BNB SOL 比特币 以太坊 行情 突破 支撑 阻力 回调 牛市 熊市 减半 ETF "
+    "链上 数据 资金 流入 流出 合约 现货 杠杆 爆仓 空头 多头 趋势 周线 日线 均线"
+).split()
+
+
+def make_feed_items(
+    author: str = "BenchKOL",
+    count: int = 200,
+    seed: int = 42,
+    pinned: int = 1,
+    images_per_card: int = 2,
+) -> list[dict]:
+    """
+    生成合成的信息流条目（字段名与 map_feed_item 识别的接口字段一致），按发布时间倒序
+
+    :param author: 作者昵称
+    :param count: 条目数量
+    :param seed: 随机种子（相同参数生成相同数据，便于对比多次结果）
+    :param pinned: 置顶条目数量（排在最前面）
+    :param images_per_card: 每条的图片数量
+    :return: 条目列表
+    """
+    rng = random.Random(seed)
+    now = int(time.time())
+    items = []
+    for i in range(count):
+        words = [rng.choice(_WORDS) for _ in range(rng.randint(20, 80))]
+        minutes_ago = (i + 1) * 17
+        items.append({
+            "id": str(10_000_000 + count - i),
+            "authorName": author,
+            "title": " ".join(words[:6]),
+            "content": f"#{i} " + " ".join(words),
+            "date": now - minutes_ago * 60,
+            "displayTime": _display_time(minutes_ago),
+            "images": [f"/img/{i}_{n}.png" for n in range(images_per_card)],
+            "isTop": i < pinned,
+        })
+    return items
+
+
+def load_feed_items(path: str) -> list[dict]:
+    """
+    加载录制的信息流接口响应（完整响应或条目列表）
+
+    :param path: JSON 文件路径
+    :return: 条目列表
+    """
+    from scrapers.binance_api import extract_feed_items
+
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    items = extract_feed_items(payload) or extract_feed_items(payload.get("data", {}))
+    if not items:
+        raise ValueError(f"文件中没有找到信息流条目: {path}")
+    return items
+
+
+def _display_time(minutes_ago: int) -> str:
+    """生成页面上的相对时间显示文本"""
+    if minutes_ago < 60:
+        return f"{minutes_ago}m"
+    if minutes_ago < 1440:
+        return f"{minutes_ago // 60}h"
+    return f"{minutes_ago // 1440}d"
+
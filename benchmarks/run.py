@@ -0,0 +1,277 @@
+"""
+基准测试入口
+在本地替身服务器和临时数据库上测量解析、入库、去重、检索、通知和页面提取各环节的吞吐量，
+结果保存为 JSON，并可与基线结果对比找出性能回退
+
+用法:
+    python -m benchmarks.run
+    python -m benchmarks.run --suites parse,db --rows 50000
+    python -m benchmarks.run --fixture recorded_feed.json --baseline benchmarks/results/baseline.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.fixtures import load_feed_items, make_feed_items
+from benchmarks.server import StandInServer
+
+SUITES = ("parse", "db", "notifier", "extract")
+EXTRACT_MODES = ("dom", "js", "network")
+
+
+def _rate(count: int, seconds: float) -> float:
+    """计算每秒处理数量"""
+    return round(count / seconds, 2) if seconds > 0 else 0.0
+
+
+def _timed(func, *args, **kwargs):
+    """执行函数并返回 (结果, 耗时秒数)"""
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def _make_articles(rows: int, authors: int = 10) -> list[dict]:
+    """将合成条目转换为入库用的文章字典"""
+    from scrapers.binance_api import map_feed_item
+
+    articles = []
+    per_author = max(1, rows // authors)
+    for index in range(authors):
+        items = make_feed_items(
+            author=f"BenchKOL{index}", count=per_author, seed=index, pinned=0
+        )
+        articles.extend(map_feed_item(item) for item in items)
+    return articles[:rows]
+
+
+def bench_parse(items: list[dict], repeat: int = 20) -> dict:
+    """接口条目解析（map_feed_item）"""
+    from scrapers.binance_api import map_feed_item
+
+    _, seconds = _timed(
+        lambda: [map_feed_item(item) for _ in range(repeat) for item in items]
+    )
+    return {"map_feed_item_per_sec": _rate(len(items) * repeat, seconds)}
+
+
+def bench_db(rows: int, workdir: str) -> dict:
+    """数据库写入、去重、检索和流式读取"""
+    from utils.database import DatabaseManager
+    from utils.hash_index import KnownHashIndex
+
+    articles = _make_articles(rows)
+    results = {"rows": len(articles)}
+
+    with DatabaseManager(
+        os.path.join(workdir, "bench.db"), performance_profile=True
+    ) as db:
+        db.init_table()
+
+        (inserted, _), seconds = _timed(db.insert_articles_batch, articles)
+        # 吞吐量按写入的文章数计算；返回的插入数与表中实际行数核对，避免计数错误污染结果
+        results["rows_inserted"] = db.get_article_count()
+        if inserted != results["rows_inserted"]:
+            raise RuntimeError(
+                f"insert_articles_batch 返回 {inserted} 行，实际写入 {results['rows_inserted']} 行"
+            )
+        results["insert_batch_rows_per_sec"] = _rate(len(articles), seconds)
+
+        hashes = [DatabaseManager.generate_content_hash(article) for article in articles]
+        for mode in ("set", "bloom"):
+            index = KnownHashIndex(db, use_bloom=mode == "bloom")
+            # 首次访问加载作者索引，不计入查询耗时
+            for article in articles[:: max(1, len(articles) // 10)]:
+                index.contains(article)
+            _, seconds = _timed(
+                lambda: [index.contains(a, h) for a, h in zip(articles, hashes)]
+            )
+            results[f"hash_index_{mode}_lookups_per_sec"] = _rate(len(articles), seconds)
+
+        sample = hashes[:: max(1, len(hashes) // 1000)]
+        _, seconds = _timed(lambda: [db.get_article_by_hash(h) for h in sample])
+        results["get_article_by_hash_per_sec"] = _rate(len(sample), seconds)
+
+        queries = ("比特币", "ETF 资金", "BTC", "回调 支撑")
+        _, seconds = _timed(
+            lambda: [db.search_articles(q, limit=20) for _ in range(25) for q in queries]
+        )
+        results["search_queries_per_sec"] = _rate(25 * len(queries), seconds)
+
+        count, seconds = _timed(lambda: sum(1 for _ in db.iter_articles(chunk_size=1000)))
+        results["iter_articles_rows_per_sec"] = _rate(count, seconds)
+
+    return results
+
+
+def bench_notifier(server: StandInServer, messages: int) -> dict:
+    """飞书通知（请求发往替身服务器的 Webhook）"""
+    from utils.feishu_notifier import FeishuNotifier
+
+    articles = _make_articles(messages, authors=1)
+    notifier = FeishuNotifier(webhook_url=server.webhook_url)
+    try:
+        sent, seconds = _timed(lambda: sum(notifier.notify_new_article(a) for a in articles))
+        results = {"single_messages_per_sec": _rate(sent, seconds)}
+
+        batches = [articles[i:i + 10] for i in range(0, len(articles), 10)]
+        _, seconds = _timed(lambda: [notifier.notify_articles_digest(b) for b in batches])
+        results["digest_articles_per_sec"] = _rate(len(articles), seconds)
+    finally:
+        notifier.close()
+    return results
+
+
+def bench_extract(server: StandInServer, cards: int, workdir: str) -> dict:
+    """浏览器提取（三种 extract_mode 分别使用全新数据库完整爬取替身主页）"""
+    from scrapers.base import DRISSION_AVAILABLE
+
+    if not DRISSION_AVAILABLE:
+        return {"skipped": "未安装 DrissionPage"}
+
+    from scrapers.binance_square import BinanceSquareScraper
+
+    scroll_times = (cards + server.page_size - 1) // server.page_size + 1
+    results = {}
+    for mode in EXTRACT_MODES:
+        scraper = BinanceSquareScraper(
+            kol_username="BenchKOL",
+            headless=True,
+            db_path=os.path.join(workdir, f"extract_{mode}.db"),
+            extract_mode=mode,
+            scroll_times=scroll_times,
+            use_watermark=False,
+            base_url=server.base_url,
+        )
+        try:
+            scraper.init_browser()
+            if not scraper.navigate_to_profile():
+                results[f"{mode}_error"] = "页面加载失败"
+                continue
+            articles, seconds = _timed(scraper.extract_articles)
+            results[f"{mode}_cards"] = scraper.last_run_stats["processed"]
+            results[f"{mode}_new_articles"] = len(articles)
+            results[f"{mode}_cards_per_sec"] = _rate(scraper.last_run_stats["processed"], seconds)
+        finally:
+            scraper.close()
+    return results
+
+
+def _git_commit() -> str | None:
+    """当前代码的 git 提交（便于对比不同版本的结果）"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare_with_baseline(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    对比基线结果，找出吞吐量下降超过阈值的指标
+
+    :param results: 本次结果
+    :param baseline: 基线结果
+    :param threshold: 允许的下降比例（如 0.2 表示 20%）
+    :return: 回退说明列表
+    """
+    regressions = []
+    for suite, metrics in results["suites"].items():
+        for name, value in metrics.items():
+            if not name.endswith("_per_sec"):
+                continue
+            before = baseline.get("suites", {}).get(suite, {}).get(name)
+            if not before:
+                continue
+            change = (value - before) / before
+            if change < -threshold:
+                regressions.append(f"{suite}.{name}: {before} -> {value} ({change:+.1%})")
+    return regressions
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="离线基准测试")
+    parser.add_argument("--suites", default=",".join(SUITES), help=f"要运行的测试（{','.join(SUITES)}）")
+    parser.add_argument("--fixture", help="录制的信息流接口响应 JSON（默认使用合成数据）")
+    parser.add_argument("--cards", type=int, default=200, help="替身主页上的文章数量")
+    parser.add_argument("--page-size", type=int, default=20, help="信息流接口每页条目数")
+    parser.add_argument("--rows", type=int, default=20000, help="数据库测试写入的文章数量")
+    parser.add_argument("--messages", type=int, default=200, help="通知测试发送的文章数量")
+    parser.add_argument("--output", default="benchmarks/results", help="结果保存目录")
+    parser.add_argument("--baseline", help="基线结果 JSON 文件")
+    parser.add_argument("--threshold", type=float, default=0.2, help="判定性能回退的下降比例")
+    parser.add_argument("--verbose", action="store_true", help="输出各模块的 INFO 日志")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # 逐条输出日志会显著拉低吞吐量，默认只保留警告和错误
+        logging.disable(logging.INFO)
+
+    suites = [name.strip() for name in args.suites.split(",") if name.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"未知的测试: {', '.join(sorted(unknown))}")
+
+    items = load_feed_items(args.fixture) if args.fixture else make_feed_items(count=args.cards)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "fixture": args.fixture or "synthetic",
+            "cards": len(items),
+        },
+        "suites": {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="bench_") as workdir, \
+            StandInServer(items, page_size=args.page_size) as server:
+        for suite in suites:
+            print(f"运行 {suite} ...", flush=True)
+            if suite == "parse":
+                metrics = bench_parse(items)
+            elif suite == "db":
+                metrics = bench_db(args.rows, workdir)
+            elif suite == "notifier":
+                metrics = bench_notifier(server, args.messages)
+            else:
+                metrics = bench_extract(server, len(items), workdir)
+            results["suites"][suite] = metrics
+            for name, value in metrics.items():
+                print(f"  {name}: {value}")
+        results["meta"]["server"] = dict(server.stats)
+
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"结果已保存: {path}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_with_baseline(results, json.load(f), args.threshold)
+        if regressions:
+            print("性能回退:")
+            for line in regressions:
+                print(f"  × {line}")
+            sys.exit(1)
+        print("✓ 未发现性能回退")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+本地替身服务器
+模拟币安广场 KOL 主页（信息流由页面脚本调用 bapi/composite 接口分页加载，滚动到底部时加载下一页）、
+信息流 JSON 接口、图片和飞书 Webhook，供基准测试在不访问 binance.com 的情况下运行
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# 信息流接口路径（包含默认的 listen_targets 片段 bapi/composite）
+FEED_PATH = "/bapi/composite/v1/friendly/pgc/feed/profile"
+WEBHOOK_PATH = "/feishu/webhook"
+
+# 最小的 1x1 PNG
+_PNG_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f6f0000000049454e44ae426082"
+)
+
+_PROFILE_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Binance Square stand-in</title>
+<style>
+  .FeedItem { min-height: 320px; border-bottom: 1px solid #ddd; padding: 12px; }
+  .card-images-box img { width: 80px; height: 80px; }
+</style>
+</head>
+<body>
+<div class="css-feed FeedList"></div>
+<script>
+const feedUrl = __FEED_URL__;
+const list = document.querySelector('.FeedList');
+let page = 1;
+let loading = false;
+let finished = false;
+
+function el(tag, className, text) {
+    const node = document.createElement(tag);
+    if (className) node.className = className;
+    if (text !== undefined) node.textContent = text;
+    return node;
+}
+
+function displayTime(item) {
+    if (item.displayTime) return item.displayTime;
+    const date = new Date((item.date > 1e12 ? item.date : item.date * 1000) || Date.now());
+    return date.toISOString().slice(0, 16).replace('T', ' ');
+}
+
+function renderCard(item) {
+    const card = el('div', 'css-card FeedItem');
+    if (item.isTop) card.appendChild(el('span', 'text-EmphasizeText', '置顶'));
+    const author = el('div', 'nick-username');
+    author.appendChild(el('span', '', item.authorName || ''));
+    card.appendChild(author);
+    const title = el('div', 'css-1 card__title');
+    title.appendChild(el('h3', '', item.title || ''));
+    card.appendChild(title);
+    card.appendChild(el('div', 'css-2 card__description', item.content || ''));
+    card.appendChild(el('div', 'create-time', displayTime(item)));
+    if (item.images && item.images.length) {
+        const box = el('div', 'css-3 card-images-box');
+        for (const url of item.images) {
+            const img = el('img');
+            img.src = typeof url === 'string' ? url : (url.url || '');
+            box.appendChild(img);
+        }
+        card.appendChild(box);
+    }
+    return card;
+}
+
+async function loadNextPage() {
+    if (loading || finished) return;
+    loading = true;
+    try {
+        const response = await fetch(feedUrl + '&pageIndex=' + page);
+        const payload = await response.json();
+        const items = payload.data.contents;
+        for (const item of items) list.appendChild(renderCard(item));
+        finished = items.length === 0;
+        page += 1;
+    } finally {
+        loading = false;
+    }
+}
+
+window.addEventListener('scroll', () => {
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 100) loadNextPage();
+});
+loadNextPage();
+</script>
+</body>
+</html>
+"""
+
+
+class StandInServer:
+    """在后台线程中运行的本地替身服务器"""
+
+    def __init__(
+        self,
+        items: list[dict],
+        page_size: int = 20,
+        feed_latency: float = 0.0,
+        webhook_latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        初始化替身服务器
+
+        :param items: 信息流条目（按发布时间倒序）
+        :param page_size: 每页条目数
+        :param feed_latency: 信息流接口的模拟延迟（秒）
+        :param webhook_latency: 飞书 Webhook 的模拟延迟（秒）
+        :param host: 监听地址
+        :param port: 监听端口（0 表示随机可用端口）
+        """
+        self.items = items
+        self.page_size = page_size
+        self.feed_latency = feed_latency
+        self.webhook_latency = webhook_latency
+        self.stats = {"pages": 0, "feed_requests": 0, "webhook_requests": 0, "images": 0}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """服务器根地址（对应 BinanceSquareScraper 的 base_url）"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def webhook_url(self) -> str:
+        """模拟的飞书 Webhook 地址"""
+        return self.base_url + WEBHOOK_PATH
+
+    def feed_url(self, username: str) -> str:
+        """信息流接口地址（不含页码）"""
+        return f"{self.base_url}{FEED_PATH}?username={username}&pageSize={self.page_size}"
+
+    def start(self):
+        """在后台线程中启动服务器"""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="stand-in-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def close(self):
+        """停止服务器"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                # 基准测试时不输出访问日志
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_json(self, payload, status: int = 200):
+                self._send(
+                    status,
+                    json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                    "application/json; charset=utf-8",
+                )
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+
+                match = re.fullmatch(r"/[\w-]+/square/profile/([^/]+)", url.path)
+                if match:
+                    server._count("pages")
+                    page = _PROFILE_HTML.replace(
+                        "__FEED_URL__", json.dumps(f"{FEED_PATH}?username={match.group(1)}")
+                    )
+                    self._send(200, page.encode("utf-8"), "text/html; charset=utf-8")
+                    return
+
+                if url.path == FEED_PATH:
+                    server._count("feed_requests")
+                    if server.feed_latency:
+                        time.sleep(server.feed_latency)
+                    page_index = int(query.get("pageIndex", ["1"])[0])
+                    page_size = int(query.get("pageSize", [server.page_size])[0])
+                    start = (page_index - 1) * page_size
+                    self._send_json({
+                        "code": "000000",
+                        "data": {"contents": server.items[start:start + page_size]},
+                    })
+                    return
+
+                if url.path.startswith("/img/"):
+                    server._count("images")
+                    self._send(200, _PNG_BYTES, "image/png")
+                    return
+
+                self._send_json({"code": 404, "msg": "not found"}, status=404)
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+
+                if url.path == WEBHOOK_PATH:
+                    server._count("webhook_requests")
+                    if server.webhook_latency:
+                        time.sleep(server.webhook_latency)
+                    self._send_json({"code": 0, "msg": "success"})
+                    return
+
+                self._send_json({"code": 404, "msg": "not found"}, status=404)
+
+        return Handler
+
+    def __enter__(self):
+        """上下文管理器入口"""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """上下文管理器出口"""
+        self.close()
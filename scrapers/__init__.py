@@ -5,5 +5,10 @@ Scrapers 模块
 
 from .base import BaseScraper
 from .binance_square import BinanceSquareScraper
+from .browser_session import BrowserSession
+from .kol_pool import KOLScraperPool
+from .farm import ScraperFarm
+from .resource_blocker import ResourceBlocker
+from .session_store import SessionStore
 
-__all__ = ['BaseScraper', 'BinanceSquareScraper']
+__all__ = ['BaseScraper', 'BinanceSquareScraper', 'BrowserSession', 'KOLScraperPool', 'ScraperFarm', 'ResourceBlocker', 'SessionStore']
@@ -3,7 +3,11 @@
 提供通用的浏览器初始化和配置功能
 """
 
+import os
+
+from scrapers.session_store import clear_stale_profile_locks
 from utils.logger import setup_logger
+from utils.metrics import observe_phase
 
 try:
     from DrissionPage import ChromiumPage, ChromiumOptions
@@ -23,20 +27,35 @@ logger = setup_logger(
 class BaseScraper:
     """基础爬虫类，提供通用的浏览器配置和管理"""
 
-    def __init__(self, headless: bool = False):
+    def __init__(
+        self,
+        headless: bool = False,
+        page=None,
+        debug_port: int = 9222,
+        user_data_dir: str = "/tmp/chrome-debug",
+        resource_blocker=None,
+    ):
         """
         初始化基础爬虫
 
         :param headless: 是否使用无头模式（不显示浏览器窗口）
+        :param page: 外部传入的页面/标签页对象（共享浏览器时使用，不由本实例关闭）
+        :param debug_port: Chrome 远程调试端口（同一主机多个浏览器需使用不同端口）
+        :param user_data_dir: Chrome 用户数据目录（同一主机多个浏览器需使用不同目录）
+        :param resource_blocker: 请求拦截器（ResourceBlocker），启动浏览器后在页面上启用
         """
         if not DRISSION_AVAILABLE:
             raise ImportError("请先安装 DrissionPage: pip install DrissionPage")
 
         self.headless = headless
-        self.page = None
+        self.debug_port = debug_port
+        self.user_data_dir = user_data_dir
+        self.page = page
+        self.resource_blocker = resource_blocker
+        self._owns_browser = page is None  # 是否由本实例负责启动和关闭浏览器
         self.options = self._setup_options()
 
-    def _setup_options(self) -> ChromiumOptions:
+    def _setup_options(self) -> "ChromiumOptions":
         """
         配置浏览器选项
 
@@ -58,23 +77,39 @@ class BaseScraper:
         options.set_argument('--disable-gpu')
         options.set_argument('--disable-setuid-sandbox')
         options.set_argument('--headless=new')
-        options.set_argument('--remote-debugging-port=9222')
+        # 调试端口同时决定 DrissionPage 连接的地址，必须通过 set_local_port 设置
+        options.set_local_port(self.debug_port)
+
+        # 多标签页并发时避免后台标签页被节流
+        options.set_argument('--disable-background-timer-throttling')
+        options.set_argument('--disable-backgrounding-occluded-windows')
+        options.set_argument('--disable-renderer-backgrounding')
 
-        # 指定临时用户目录避免冲突
-        options.set_argument('--user-data-dir=/tmp/chrome-debug')
+        # 指定用户目录避免冲突（相对路径按工作目录解析，便于放在挂载卷上持久化）
+        options.set_user_data_path(os.path.abspath(self.user_data_dir))
 
         return options
 
     def init_browser(self):
         """初始化浏览器"""
+        if self.page is not None:
+            # 使用外部共享的浏览器标签页，无需重新启动
+            return
+
         logger.info("正在启动浏览器...")
-        self.page = ChromiumPage(addr_or_opts=self.options)
+        # 容器重建后持久化的用户数据目录中可能残留上一个 Chrome 的锁，不清理会导致启动失败
+        clear_stale_profile_locks(os.path.abspath(self.user_data_dir))
+        with observe_phase("browser_launch"):
+            self.page = ChromiumPage(addr_or_opts=self.options)
+        if self.resource_blocker is not None:
+            self.resource_blocker.attach(self.page)
         logger.info("✓ 浏览器启动成功")
 
     def close(self):
         """关闭浏览器"""
-        if self.page:
+        if self.page and self._owns_browser:
             self.page.quit()
+            self.page = None
             logger.info("✓ 浏览器已关闭")
 
     def __enter__(self):
@@ -84,4 +119,4 @@ class BaseScraper:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """上下文管理器出口"""
-        # self.close()
+        self.close()
@@ -0,0 +1,259 @@
+"""
+币安广场 HTTP API 拉取器
+不启动浏览器，直接通过 JSON 接口分页拉取 KOL 的文章列表
+"""
+
+import time
+from datetime import datetime
+from typing import Iterator, Optional
+
+from utils.logger import setup_logger
+
+try:
+    import httpx
+
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+
+logger = setup_logger(
+    logger_name="binance_api",
+    log_file="binance_api.log",
+    log_level=20,  # logging.INFO
+)
+
+# 接口返回中可能承载文章列表的字段名
+_LIST_KEYS = ("contents", "list", "vos", "items", "records", "feeds", "data")
+# 文章字段的候选键名（不同接口版本字段名不一致）
+_AUTHOR_KEYS = ("authorName", "nickName", "nickname", "displayName", "userName", "username")
+_TITLE_KEYS = ("title", "cardTitle", "headline")
+_DESCRIPTION_KEYS = ("content", "bodyTextOnly", "textContent", "subTitle", "summary", "description", "text")
+_TIME_KEYS = ("date", "createTime", "publishTime", "firstReleaseTime", "createdAt", "timestamp")
+_IMAGE_KEYS = ("images", "imageList", "imgs", "pictures")
+_PINNED_KEYS = ("isTop", "pinned", "isPinned", "top")
+_UID_KEYS = ("squareUid", "uid", "userId", "id")
+
+
+def _first_value(item: dict, keys: tuple):
+    """返回字典中第一个非空的候选字段值"""
+    for key in keys:
+        value = item.get(key)
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def _format_time(value) -> str:
+    """将接口中的时间（秒/毫秒时间戳或字符串）格式化为页面上的显示格式"""
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.isdigit()):
+        timestamp = float(value)
+        if timestamp > 1e12:  # 毫秒时间戳
+            timestamp /= 1000
+        return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+    return str(value or "")
+
+
+def extract_feed_items(payload) -> list[dict]:
+    """
+    从接口返回的 JSON 中找出文章列表
+
+    :param payload: 接口返回的 JSON 对象
+    :return: 文章条目列表（找不到时返回空列表）
+    """
+    if isinstance(payload, list):
+        return [item for item in payload if isinstance(item, dict)]
+    if not isinstance(payload, dict):
+        return []
+
+    for key in _LIST_KEYS:
+        value = payload.get(key)
+        if isinstance(value, list):
+            return [item for item in value if isinstance(item, dict)]
+        if isinstance(value, dict):
+            items = extract_feed_items(value)
+            if items:
+                return items
+    return []
+
+
+def map_feed_item(item: dict) -> Optional[dict]:
+    """
+    将接口返回的文章条目转换为与 `_parse_article_element` 相同格式的文章字典
+
+    :param item: 接口返回的单个文章条目
+    :return: 文章字典；置顶文章或没有内容时返回 None
+    """
+    if any(item.get(key) for key in _PINNED_KEYS):
+        return None
+
+    author = _first_value(item, _AUTHOR_KEYS)
+    if author is None:
+        # 作者信息可能嵌套在 author/user 对象中
+        for nested_key in ("author", "user", "authorInfo"):
+            nested = item.get(nested_key)
+            if isinstance(nested, dict):
+                author = _first_value(nested, _AUTHOR_KEYS)
+                if author:
+                    break
+
+    description = _first_value(item, _DESCRIPTION_KEYS)
+    if not description:
+        return None
+
+    imgs = []
+    for image in _first_value(item, _IMAGE_KEYS) or []:
+        if isinstance(image, str):
+            imgs.append(image)
+        elif isinstance(image, dict):
+            url = _first_value(image, ("url", "imageUrl", "src", "originalUrl"))
+            if url:
+                imgs.append(url)
+
+    return {
+        "author": str(author or "").strip(),
+        "card_title": str(_first_value(item, _TITLE_KEYS) or "").strip(),
+        "card_description": str(description).strip(),
+        "create-time": _format_time(_first_value(item, _TIME_KEYS)),
+        "imgs": imgs,
+    }
+
+
+class BinanceSquareApiFetcher:
+    """币安广场 JSON 接口拉取器，使用 config.json 中的 api_config 配置"""
+
+    def __init__(
+        self,
+        api_config: dict,
+        timeout: float = 30,
+        max_retries: int = 3,
+        request_delay: float = 0,
+    ):
+        """
+        初始化接口拉取器
+
+        api_config 中的 articles_endpoint / profile_endpoint 以及 params 的字符串值
+        支持 {username} 和 {uid} 占位符，其中 {uid} 会通过 profile_endpoint 解析；
+        api_config 中的 timeout / max_retries / request_delay 优先于同名参数
+
+        :param api_config: 接口配置（base_url、articles_endpoint、headers、params 等）
+        :param timeout: 单次请求超时时间（秒）
+        :param max_retries: 单页最大重试次数
+        :param request_delay: 翻页间隔（秒）
+        """
+        self.api_config = api_config or {}
+        self.base_url = self.api_config.get("base_url", "https://www.binance.com")
+        self.articles_endpoint = self.api_config.get("articles_endpoint", "")
+        self.profile_endpoint = self.api_config.get("profile_endpoint", "")
+        self.params = dict(self.api_config.get("params", {}))
+        self.max_pages = self.api_config.get("max_pages", 5)
+        self.timeout = self.api_config.get("timeout", timeout)
+        self.max_retries = max(1, self.api_config.get("max_retries", max_retries))
+        self.request_delay = self.api_config.get("request_delay", request_delay)
+        self._client = None
+
+    @property
+    def available(self) -> bool:
+        """接口模式是否可用（已安装 httpx 且配置了文章接口）"""
+        return HTTPX_AVAILABLE and bool(self.articles_endpoint)
+
+    @property
+    def client(self):
+        """复用连接的 httpx 客户端"""
+        if self._client is None:
+            if not HTTPX_AVAILABLE:
+                raise ImportError("请先安装 httpx: pip install httpx")
+            self._client = httpx.Client(
+                base_url=self.base_url,
+                headers=self.api_config.get("headers", {}),
+                timeout=self.timeout,
+                follow_redirects=True,
+            )
+        return self._client
+
+    def close(self):
+        """关闭 HTTP 客户端"""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _get_json(self, endpoint: str, params: dict):
+        """
+        请求接口并返回 JSON，失败时按指数退避重试
+
+        :param endpoint: 接口路径
+        :param params: 查询参数
+        :return: JSON 对象
+        """
+        last_error = None
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                response = self.client.get(endpoint, params=params)
+                response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                last_error = e
+                logger.warning(f"! 接口请求失败 [{attempt}/{self.max_retries}]: {str(e)}")
+                if attempt < self.max_retries:
+                    time.sleep(2 ** (attempt - 1))
+        raise last_error
+
+    def _resolve_uid(self, kol_username: str) -> str:
+        """
+        通过 profile_endpoint 获取 KOL 的 uid
+
+        :param kol_username: KOL 用户名
+        :return: uid
+        """
+        if not self.profile_endpoint:
+            raise ValueError("articles_endpoint 需要 {uid}，但未配置 profile_endpoint")
+
+        payload = self._get_json(self.profile_endpoint.format(username=kol_username), {})
+        data = payload.get("data", payload) if isinstance(payload, dict) else {}
+        uid = _first_value(data, _UID_KEYS) if isinstance(data, dict) else None
+        if uid is None:
+            raise ValueError(f"无法从 profile_endpoint 返回中解析 {kol_username} 的 uid")
+        return str(uid)
+
+    def iter_articles(self, kol_username: str) -> Iterator[Optional[dict]]:
+        """
+        分页拉取 KOL 的文章（从新到旧）
+
+        :param kol_username: KOL 用户名
+        :return: 文章字典生成器（置顶或无内容的条目产出 None）
+        """
+        placeholders = {"username": kol_username, "uid": ""}
+        needs_uid = "{uid}" in self.articles_endpoint or any(
+            isinstance(v, str) and "{uid}" in v for v in self.params.values()
+        )
+        if needs_uid:
+            placeholders["uid"] = self._resolve_uid(kol_username)
+
+        endpoint = self.articles_endpoint.format(**placeholders)
+        page = int(self.params.get("page", 1))
+
+        for page_index in range(self.max_pages):
+            params = {
+                key: value.format(**placeholders) if isinstance(value, str) else value
+                for key, value in self.params.items()
+            }
+            params["page"] = page + page_index
+
+            items = extract_feed_items(self._get_json(endpoint, params))
+            logger.info(f"✓ 接口第 {params['page']} 页返回 {len(items)} 条")
+            if not items:
+                return
+
+            for item in items:
+                yield map_feed_item(item)
+
+            if self.request_delay:
+                time.sleep(self.request_delay)
+
+    def __enter__(self):
+        """上下文管理器入口"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """上下文管理器出口"""
+        self.close()
@@ -3,13 +3,21 @@
 专门用于爬取币安广场 KOL 的文章
 """
 
-import time
-from time import sleep
+import itertools
+import json
+from concurrent.futures import wait
 from typing import Optional
 
-from scrapers import BaseScraper
+from scrapers.base import BaseScraper
+from scrapers.binance_api import BinanceSquareApiFetcher, extract_feed_items, map_feed_item
+from scrapers.readiness import ADAPTIVE_TIMEOUTS, wait_for_feed
 from utils.logger import setup_logger
+from utils.connection_manager import ConnectionManager
 from utils.database import DatabaseManager
+from utils.hash_index import KnownHashIndex
+from utils.metrics import CARDS_TOTAL, observe_phase
+from utils.text_normalizer import NORMALIZE_TEXT_JS, normalize_text
+from utils.time_parser import parse_display_time
 
 logger = setup_logger(
     logger_name="binance_square_scraper",
@@ -17,6 +25,65 @@ logger = setup_logger(
     log_level=20,  # logging.INFO
 )
 
+# 水位比对使用的文章内容前缀长度
+_WATERMARK_PREFIX_LENGTH = 200
+
+
+def _watermark_prefix(description: str) -> str:
+    """
+    计算水位比对使用的内容前缀（先规范化，不同提取方式得到的同一篇文章前缀一致）
+
+    :param description: 文章内容（原文）
+    :return: 内容前缀
+    """
+    return normalize_text(description)[:_WATERMARK_PREFIX_LENGTH]
+
+
+# 序列化 FeedList 中尚未处理过的卡片（与 _parse_article_element 使用相同的类名）
+# 已返回的卡片会打上 data-bss-seen 标记，下一批只序列化新加载的卡片；
+# 传入水位（作者 + 内容前缀）时，遇到水位卡片立即停止，不再序列化之后的旧卡片
+# 卡片文本原样返回，只在比对水位前缀时按与 Python 相同的规则规范化（NORMALIZE_TEXT_JS）
+_EXTRACT_CARDS_JS = NORMALIZE_TEXT_JS + """
+const stop = arguments[0] ? JSON.parse(arguments[0]) : null;
+const list = document.querySelector('[class*="FeedList"]');
+if (!list) {
+    return JSON.stringify(null);
+}
+const text = (el) => (el ? el.innerText.trim() : '');
+const cards = [];
+let reachedWatermark = false;
+for (const card of list.querySelectorAll(':scope > :not([data-bss-seen])')) {
+    card.setAttribute('data-bss-seen', '1');
+    const pinned = card.querySelector('[class*="text-EmphasizeText"]') !== null;
+    const author = card.querySelector('[class="nick-username"]');
+    const authorName = text(author && author.firstElementChild);
+    const description = text(card.querySelector('[class*="card__description"]'));
+    if (stop && !pinned && authorName === stop.author
+            // 按码点截取前缀，与 Python 的字符串切片一致（emoji 等字符在 JS 中占两个单元）
+            && Array.from(normalizeText(description)).slice(0, stop.prefix_length).join('')
+                === stop.description_prefix) {
+        reachedWatermark = true;
+        break;
+    }
+    const title = card.querySelector('[class*="card__title"]');
+    const imgBox = card.querySelector('[class*="card-images-box"]');
+    cards.push({
+        pinned: pinned,
+        author: authorName,
+        card_title: text(title && title.firstElementChild),
+        card_description: description,
+        create_time: text(card.querySelector('[class="create-time"]')),
+        imgs: imgBox
+            ? Array.from(imgBox.querySelectorAll('img'))
+                .map((img) => img.getAttribute('src') || img.dataset.src || '')
+                .filter((src) => src)
+            : [],
+    });
+}
+return JSON.stringify({cards: cards, reached_watermark: reachedWatermark});
+"""
+
+
 
 class BinanceSquareScraper(BaseScraper):
     """币安广场爬虫类，继承自 BaseScraper"""
@@ -29,6 +96,23 @@ class BinanceSquareScraper(BaseScraper):
         db_path: str = "database/binance_square.db",
         save_to_db: bool = True,
         feishu_notifier=None,
+        page=None,
+        scrape_method: str = "drission",
+        api_config: dict = None,
+        extract_mode: str = "dom",
+        listen_targets: list[str] = None,
+        scroll_times: int = 3,
+        max_articles: int = None,
+        scroll_delay: float = 1.5,
+        hash_index_mode: str = "set",
+        db_performance_profile: bool = False,
+        db_fts_tokenizer: str = "trigram",
+        pipeline=None,
+        max_consecutive_duplicates: int = 2,
+        use_watermark: bool = True,
+        base_url: str = "https://www.binance.com",
+        resource_blocker=None,
+        session_store=None,
     ):
         """
         初始化币安广场爬虫
@@ -39,17 +123,57 @@ class BinanceSquareScraper(BaseScraper):
         :param db_path: 数据库文件路径
         :param save_to_db: 是否保存到数据库
         :param feishu_notifier: 飞书通知器实例
+        :param page: 共享浏览器的标签页（多 KOL 并发爬取时由 KOLScraperPool 传入）
+        :param scrape_method: 爬取方式（drission: 浏览器; api: 仅 HTTP 接口; auto: 优先接口，失败回退浏览器）
+        :param api_config: HTTP 接口配置（对应 config.json 中的 api_config）
+        :param extract_mode: 浏览器模式下的提取方式（dom: 逐个解析页面元素; js: 注入脚本批量序列化卡片;
+                             network: 监听信息流接口响应，失败回退 js）
+        :param listen_targets: network 模式下需要监听的接口 URL 片段
+        :param scroll_times: 最多向下滚动加载的次数
+        :param max_articles: 单次爬取最多获取的新文章数（None 或 0 表示不限制）
+        :param scroll_delay: 滚动后等待新卡片加载的最长时间（秒），超时视为已到底
+        :param hash_index_mode: 已知文章哈希索引类型（set: 内存集合; bloom: 布隆过滤器 + SQLite 确认）
+        :param db_performance_profile: 是否启用数据库性能模式（WAL 等 PRAGMA）
+        :param db_fts_tokenizer: 新建全文索引时使用的分词器（trigram/unicode61）
+        :param pipeline: 异步写入流水线（ArticlePipeline），传入时新文章由流水线入库并通知
+        :param max_consecutive_duplicates: 连续遇到多少篇重复文章时停止爬取
+        :param use_watermark: 是否使用爬取水位（遇到上次爬到的最新文章时立即停止）
+        :param base_url: 站点根地址（基准测试时指向本地替身服务器）
+        :param resource_blocker: 请求拦截器（自行启动浏览器时使用；共享标签页由 BrowserSession 负责拦截）
+        :param session_store: 会话存储（SessionStore），打开主页前恢复 Cookie 和 localStorage，过期时重新保存
         """
-        super().__init__(headless=headless)
+        super().__init__(headless=headless, page=page, resource_blocker=resource_blocker)
 
         self.kol_username = kol_username
         self.profile_url = (
-            f"https://www.binance.com/zh-CN/square/profile/{kol_username}"
+            f"{base_url.rstrip('/')}/zh-CN/square/profile/{kol_username}"
         )
         self.save_to_db = save_to_db
         self.db_path = db_path
         self.db_manager = None  # 数据库管理器实例
+        self.known_hashes = None  # 已知文章哈希索引（每次运行加载一次）
+        self.hash_index_mode = hash_index_mode
+        self.db_performance_profile = db_performance_profile
+        self.db_fts_tokenizer = db_fts_tokenizer
+        self.pipeline = pipeline
         self.feishu_notifier = feishu_notifier  # 飞书通知器
+        self.last_run_stats = {"processed": 0, "new": 0}  # 最近一次提取的统计
+        self.scrape_method = scrape_method
+        self.api_config = api_config or {}
+        self.extract_mode = extract_mode
+        self.listen_targets = listen_targets or ["bapi/composite"]
+        self.scroll_times = scroll_times
+        self.max_articles = max_articles
+        self.scroll_delay = scroll_delay
+        self.network_idle_timeout = 3  # network 模式下等待下一个数据包的超时时间（秒）
+        self.session_store = session_store
+        self.challenge_timeout = 30  # 遇到 Cloudflare 验证时最多等待其通过的时间（秒）
+        self.max_consecutive_duplicates = max(1, max_consecutive_duplicates)
+        self.use_watermark = use_watermark
+        self.watermark = None  # 当前 KOL 的爬取水位（每次运行加载一次）
+        self.watermark_time_tolerance = 86400  # 文章早于水位发布时间超过该秒数时视为已到达水位
+        self._reached_watermark = False  # 提取过程中是否已在完整解析前遇到水位卡片
+        self._pending_writes = []  # 本次提取中提交给写入流水线、尚未确认入库的 Future
 
         # 默认选择器
         self.selectors = selectors or {
@@ -69,41 +193,63 @@ class BinanceSquareScraper(BaseScraper):
         logger.info(f"{'=' * 60}")
 
         try:
-            self.page.set.window.max()
-            self.page.get(self.profile_url)
-            logger.info("✓ 页面加载成功")
-
-            # 检查是否有Cloudflare验证
-            page_text = self.page.html
-            if (
-                "cloudflare" in page_text.lower()
-                or "checking your browser" in page_text.lower()
-            ):
-                logger.warning("! 检测到Cloudflare验证，等待验证通过...")
-                time.sleep(5)
-
-            # 接受所有 Cookie
-            cookie_ele = self.page.ele("text:接受所有 Cookie", timeout=0)
-            if cookie_ele and cookie_ele.states.is_in_viewport:
-                cookie_ele.click()
-
-            # 提示跳转
-            confirm_ele = self.page.ele("@class=bn-modal-confirm", timeout=1)
-            try:
-                confirm_ele.ele("tag=button").click()
-            except Exception as e:
-                logger.error(f"未点击到弹窗: {str(e)}")
-                
-            # 等待页面主要内容加载
-            self.page.ele(".:FeedList", timeout=2).wait.displayed(timeout=2)
-            # 截屏
-            self.page.get_screenshot(path='logs/screenshots/', name=f'{self.kol_username}_profile.png')
-            return True
+            with observe_phase("navigate"):
+                self.page.set.window.max()
+                # DOMContentLoaded 后即返回，之后由就绪等待判断信息流是否已渲染，无需等待所有资源加载完成
+                self.page.set.load_mode.eager()
+                if self.extract_mode == "network":
+                    # 在页面加载前开始监听，确保首屏信息流请求也能被捕获
+                    self.page.listen.start(self.listen_targets)
+                restored = self.session_store is not None and self.session_store.restore(self.page)
+                self.page.get(self.profile_url)
+                logger.info("✓ 页面加载成功")
+
+                # 等待信息流渲染完成，期间自动关闭跳转提示弹窗和 Cookie 横幅，遇到 Cloudflare 验证时继续等待其通过
+                ready = wait_for_feed(
+                    self.page,
+                    "feed_ready",
+                    timeout=ADAPTIVE_TIMEOUTS.timeout("feed_ready", default=10, minimum=3, maximum=20),
+                    dismiss=True,
+                    challenge_timeout=self.challenge_timeout,
+                )
+                if ready["challenge"]:
+                    logger.warning(f"! 检测到Cloudflare验证，已等待 {ready['elapsed']:.1f}s")
+                if ready["state"] != "ready":
+                    logger.error(f"× 等待信息流加载超时 ({ready['state']}, {ready['elapsed']:.1f}s)")
+                    return False
+                logger.info(
+                    f"✓ 信息流已就绪: {ready['cards']} 张卡片, 耗时 {ready['elapsed']:.2f}s"
+                    + (f", 已关闭 {ready['dismissed']} 个弹窗" if ready["dismissed"] else "")
+                )
+                self._refresh_session(ready, restored)
+
+                # 截屏
+                self.page.get_screenshot(path='logs/screenshots/', name=f'{self.kol_username}_profile.png')
+                return True
 
         except Exception as e:
             logger.error(f"× 页面加载失败: {str(e)}")
             return False
 
+    def _refresh_session(self, ready: dict, restored: bool):
+        """
+        根据本次加载结果维护持久化会话：
+        仍出现弹窗/验证或会话已过期时，在页面就绪后重新保存（预热），否则直接沿用
+
+        :param ready: wait_for_feed 的结果
+        :param restored: 本次加载前是否恢复了已保存的会话
+        """
+        if self.session_store is None:
+            return
+        if ready["dismissed"] or ready["challenge"]:
+            if restored:
+                logger.warning("! 已恢复的会话未能跳过弹窗或验证，重新保存会话")
+            self.session_store.mark_stale()
+        if self.session_store.is_stale():
+            self.session_store.save(self.page)
+        elif restored:
+            logger.info("✓ 会话有效，直接进入信息流")
+
     def _parse_article_element(self, article_elem) -> dict | None:
         """
         解析单个文章元素
@@ -117,11 +263,9 @@ class BinanceSquareScraper(BaseScraper):
                 logger.info("跳过置顶文章")
                 return None
 
-            # 滚动到元素可见
+            # 滚动到元素可见（触发懒加载图片写入 src），卡片已渲染完成，无需再等待图片区域显示
             self.page.scroll.to_see(article_elem)
-            has_img = article_elem.ele(
-                "@class:card-images-box", timeout=1
-            ).wait.displayed(timeout=1, raise_err=False)
+            image_box = article_elem.ele("@class:card-images-box", timeout=0)
 
             # 提取文章信息
             article = {
@@ -138,12 +282,13 @@ class BinanceSquareScraper(BaseScraper):
                 ).text,
                 "create-time": article_elem.ele("@class=create-time", timeout=0).text,
                 "imgs": [
-                    img_ele.attr("src")
-                    for img_ele in article_elem.ele(
-                        "@class:card-images-box", timeout=0
-                    ).eles("tag:img")
-                    if has_img
-                ],
+                    src
+                    for src in (
+                        img_ele.attr("src") or img_ele.attr("data-src")
+                        for img_ele in image_box.eles("tag:img")
+                    )
+                    if src
+                ] if image_box else [],
             }
 
             return article
@@ -154,141 +299,553 @@ class BinanceSquareScraper(BaseScraper):
 
     def _is_article_in_db(self, article: dict) -> bool:
         """
-        检查文章是否已存在于数据库中
+        检查文章是否已存在于数据库中（查询预加载的哈希索引，不访问 SQLite）
 
         :param article: 文章字典
         :return: 是否存在
         """
-        if not self.db_manager:
+        if self.known_hashes is None:
             return False
 
-        content_hash = self.db_manager.generate_content_hash(article)
-        existing_article = self.db_manager.get_article_by_hash(content_hash)
-        return existing_article is not None
+        with observe_phase("db_lookup"):
+            return self.known_hashes.contains(article)
 
-    def extract_articles(self) -> list[dict]:
+    def _record_run_stats(self, processed: int, new_articles: list[dict]):
         """
-        递归提取文章信息（边滚动边检查数据库）
-        当遇到已存在的文章时停止
+        记录最近一次提取的统计信息（供并发调度汇总吞吐量）
 
-        :return: 新文章列表
+        :param processed: 已处理的卡片数
+        :param new_articles: 新文章列表
         """
-        logger.info(f"\n{'=' * 60}")
-        logger.info("开始提取文章（遇到重复则停止）")
-        logger.info(f"{'=' * 60}")
+        self.last_run_stats = {"processed": processed, "new": len(new_articles)}
+
+    def _open_db(self):
+        """初始化数据库管理器（如果启用）并加载当前 KOL 的爬取水位"""
+        if self.save_to_db and not self.db_manager:
+            # 复用当前线程的数据库长连接（建表只在进程内执行一次）
+            self.db_manager = ConnectionManager.get(
+                self.db_path,
+                performance_profile=self.db_performance_profile,
+                fts_tokenizer=self.db_fts_tokenizer,
+            ).database()
+            self.known_hashes = KnownHashIndex(
+                self.db_manager, use_bloom=self.hash_index_mode == "bloom"
+            )
+
+        self.watermark = None
+        self._reached_watermark = False
+        if self.use_watermark and self.db_manager:
+            self.watermark = self.db_manager.get_crawl_watermark(self.kol_username)
+
+    def _close_db(self):
+        """释放数据库管理器（共享长连接不会被关闭）"""
+        self.known_hashes = None
+        self.watermark = None
+        if self.db_manager:
+            self.db_manager.close()
+            self.db_manager = None
+
+    def _watermark_stop_key(self) -> Optional[str]:
+        """
+        构造传给注入脚本的水位比对参数
+
+        :return: JSON 字符串，没有水位时返回 None
+        """
+        if not self.watermark:
+            return None
+        return json.dumps(
+            {
+                "author": self.watermark["author"],
+                "description_prefix": self.watermark["description_prefix"],
+                "prefix_length": _WATERMARK_PREFIX_LENGTH,
+            },
+            ensure_ascii=False,
+        )
+
+    def _matches_watermark(self, article: dict) -> bool:
+        """
+        判断文章是否已到达水位（即上次爬到的最新文章或更早的文章）
+
+        :param article: 文章字典
+        :return: 是否到达水位
+        """
+        if not self.watermark:
+            return False
+
+        if (
+            article.get("author") == self.watermark["author"]
+            and _watermark_prefix(article.get("card_description", ""))
+            == self.watermark["description_prefix"]
+        ):
+            return True
+        if DatabaseManager.generate_content_hash(article) == self.watermark["content_hash"]:
+            return True
+
+        # 水位文章被删除时，依据发布时间判断（允许相对时间的解析误差）
+        published_at = parse_display_time(article.get("create-time", ""))
+        return bool(
+            published_at
+            and self.watermark["published_at"]
+            and published_at < self.watermark["published_at"] - self.watermark_time_tolerance
+        )
+
+    def _element_matches_watermark(self, article_elem) -> bool:
+        """
+        完整解析前快速判断卡片是否为水位文章（只读取作者和内容文本）
+
+        :param article_elem: 文章元素
+        :return: 是否为水位文章
+        """
+        if not self.watermark:
+            return False
+        try:
+            if article_elem.ele(".:text-EmphasizeText", timeout=0):
+                return False
+            author = article_elem.ele("@class=nick-username", timeout=0).child().text
+            description = article_elem.ele("@class:card__description", timeout=0).text
+        except Exception:
+            return False
+        return (
+            author == self.watermark["author"]
+            and _watermark_prefix(description) == self.watermark["description_prefix"]
+        )
+
+    def _update_watermark(self, newest_article: dict):
+        """
+        将本次爬到的最新文章记录为水位
+
+        :param newest_article: 本次运行中第一篇（最新的）非置顶文章
+        """
+        if not (self.use_watermark and self.db_manager):
+            return
+        try:
+            self.db_manager.update_crawl_watermark(
+                self.kol_username,
+                author=newest_article.get("author", ""),
+                content_hash=DatabaseManager.generate_content_hash(newest_article),
+                description_prefix=_watermark_prefix(newest_article.get("card_description", "")),
+                published_at=parse_display_time(newest_article.get("create-time", "")),
+            )
+        except Exception as e:
+            logger.error(f"× 更新爬取水位失败: {str(e)}")
+
+    def _save_new_article(self, article: dict) -> bool:
+        """
+        保存新文章并发送飞书通知
+
+        :param article: 文章字典
+        :return: 是否作为新文章保存成功
+        """
+        if self.pipeline is not None:
+            # 交给写入流水线异步入库和通知，爬虫继续解析下一张卡片；
+            # 哈希索引只在本次运行内防止重复提交，入库失败时水位不推进，下次运行会重新发现该文章
+            self._pending_writes.append(self.pipeline.submit(article))
+            if self.known_hashes is not None:
+                self.known_hashes.add(article)
+            logger.info(f"✓ 新文章已提交: {article.get('card_title', '无标题')[:30]}...")
+            return True
+
+        if self.save_to_db and self.db_manager:
+            with observe_phase("db_insert"):
+                inserted = self.db_manager.insert_article(article)
+            if not inserted:
+                logger.warning("! 文章插入数据库失败")
+                return False
+            self.known_hashes.add(article)
+            logger.info(f"✓ 新文章已保存: {article.get('card_title', '无标题')[:30]}...")
+        else:
+            logger.info(f"✓ 新文章: {article.get('card_title', '无标题')[:30]}...")
+
+        # 发送飞书通知
+        if self.feishu_notifier:
+            try:
+                self.feishu_notifier.notify_new_article(article)
+            except Exception as e:
+                logger.error(f"× 发送飞书通知失败: {str(e)}")
+
+        return True
+
+    def _confirm_pending_writes(self) -> bool:
+        """
+        等待本次提交给写入流水线的文章全部完成入库
+
+        :return: 是否全部写入成功（有文章写入失败时不能推进水位）
+        """
+        pending, self._pending_writes = self._pending_writes, []
+        if not pending:
+            return True
+
+        wait(pending)
+        failed = sum(1 for future in pending if future.exception() is not None)
+        if failed:
+            logger.error(f"× {failed}/{len(pending)} 篇新文章入库失败，保留旧水位")
+            return False
+        return True
+
+    def _process_articles(self, articles) -> list[dict]:
+        """
+        依次处理文章：去重 → 入库 → 通知，到达水位或连续遇到重复文章时停止
+        DOM 解析和 API 拉取共用该流程
 
+        :param articles: 文章字典的可迭代对象（None 表示应跳过的卡片，如置顶文章）
+        :return: 新文章列表
+        """
         new_articles = []  # 新文章列表
         total_processed = 0  # 已处理的文章数
         consecutive_duplicates = 0  # 连续重复计数
-        max_consecutive_duplicates = 2  # 连续重复次数阈值
+        max_consecutive_duplicates = self.max_consecutive_duplicates  # 连续重复次数阈值
+        newest_article = None  # 本次运行中最新的文章（用于更新水位）
+        truncated = False  # 是否因达到单次上限而提前停止（此时不能推进水位）
+        self._pending_writes = []
 
         try:
-            # 初始化数据库管理器（如果启用）
-            if self.save_to_db and not self.db_manager:
-                self.db_manager = DatabaseManager(self.db_path)
-                self.db_manager.connect()
-                self.db_manager.init_table()
+            for article in articles:
+                total_processed += 1
+
+                if article is None:
+                    # 置顶文章或解析失败，跳过
+                    CARDS_TOTAL.inc(result="skipped")
+                    continue
+
+                # 到达上次爬取的水位，之后都是旧文章
+                if self._matches_watermark(article):
+                    self._reached_watermark = True
+                    logger.info(
+                        f"\n{'=' * 60}\n"
+                        f"已到达爬取水位，停止爬取\n"
+                        f"{'=' * 60}"
+                    )
+                    break
+
+                if newest_article is None:
+                    newest_article = article
+
+                # 检查是否已存在于数据库
+                if self._is_article_in_db(article):
+                    CARDS_TOTAL.inc(result="duplicate")
+                    consecutive_duplicates += 1
+                    logger.warning(
+                        f"! 发现重复文章 [{consecutive_duplicates}/{max_consecutive_duplicates}]: "
+                        f"{article.get('card_title', '无标题')[:30]}..."
+                    )
+
+                    # 如果连续遇到多个重复，停止爬取
+                    if consecutive_duplicates >= max_consecutive_duplicates:
+                        logger.info(
+                            f"\n{'=' * 60}\n"
+                            f"连续遇到 {consecutive_duplicates} 篇重复文章，停止爬取\n"
+                            f"{'=' * 60}"
+                        )
+                        break
+                    continue
 
-            # 获取当前页面的所有文章元素
-            try:
-                article_elements = self.page.ele(".:FeedList", timeout=2).children()
+                # 重置连续重复计数
+                consecutive_duplicates = 0
+
+                # 新文章，保存到数据库并通知
+                if self._save_new_article(article):
+                    CARDS_TOTAL.inc(result="new")
+                    new_articles.append(article)
+
+                # 达到单次爬取上限，停止
+                if self.max_articles and len(new_articles) >= self.max_articles:
+                    logger.info(f"已达到最大文章数 {self.max_articles}，停止爬取")
+                    truncated = True
+                    break
+
+            if self._reached_watermark and not new_articles:
+                logger.info("没有新文章（首张卡片即为水位）")
+
+            logger.info(f"\n{'=' * 60}")
+            logger.info(f"提取完成 - 共获取 {len(new_articles)} 篇新文章")
+            logger.info(f"{'=' * 60}\n")
+
+            # 达到单次上限时，水位与本次最新文章之间还有未爬取的文章，保留旧水位；
+            # 使用写入流水线时，确认本次的新文章全部入库后才推进水位
+            persisted = self._confirm_pending_writes()
+            if newest_article is not None and not truncated and persisted:
+                self._update_watermark(newest_article)
+
+        except Exception as e:
+            logger.error(f"× 提取文章失败: {str(e)}")
+
+        self._record_run_stats(total_processed, new_articles)
+        return new_articles
+
+    def _scroll_for_more(self, min_children: Optional[int] = None) -> bool:
+        """
+        滚动到页面底部并等待新卡片加载（新卡片渲染完成即返回）
+
+        :param min_children: 信息流中至少应有的卡片数（dom 模式按已处理下标计算）；
+                             None 表示等待出现未处理过的卡片（js 模式）
+        :return: 是否加载出了新卡片（False 表示已到底）
+        """
+        self.page.scroll.to_bottom()
+
+        result = wait_for_feed(
+            self.page,
+            "scroll_load",
+            timeout=ADAPTIVE_TIMEOUTS.timeout(
+                "scroll_load",
+                default=self.scroll_delay,
+                minimum=min(1.0, self.scroll_delay),
+                maximum=self.scroll_delay,
+            ),
+            min_children=min_children or 1,
+            unseen=min_children is None,
+            quiet=0.1,
+        )
+        return result["state"] == "ready"
 
-                # 处理新加载的文章
-                for idx in range(total_processed, len(article_elements)):
-                    article_elem = article_elements[-idx]
+    def _iter_dom_articles(self):
+        """
+        从页面 DOM 中逐个解析文章，处理完当前批次后向下滚动加载下一批
+        通过已处理卡片的下标只获取新增的卡片
 
-                    # 解析文章
+        :return: 文章字典生成器（置顶或解析失败时产出 None）
+        """
+        try:
+            feed_list = self.page.ele(".:FeedList", timeout=2)
+        except Exception as e:
+            logger.error(f"× 获取文章列表失败: {str(e)}")
+            raise
+
+        seen_count = 0  # 已处理的卡片数（前沿下标）
+
+        def new_elements():
+            return feed_list.eles(f"xpath:./*[position()>{seen_count}]", timeout=0)
+
+        for scroll_round in range(self.scroll_times + 1):
+            batch = new_elements()
+            for article_elem in batch:
+                seen_count += 1
+                if self._element_matches_watermark(article_elem):
+                    # 完整解析（滚动、等待图片）前即可确定之后都是旧文章
+                    self._reached_watermark = True
+                    logger.info("已到达爬取水位，停止解析")
+                    return
+                with observe_phase("parse_card"):
                     article = self._parse_article_element(article_elem)
+                yield article
 
-                    if article is None:
-                        # 置顶文章，跳过
-                        total_processed += 1
-                        continue
+            if scroll_round == self.scroll_times:
+                return
+            if not self._scroll_for_more(min_children=seen_count + 1):
+                logger.info("页面已滚动到底部，没有更多文章")
+                return
 
-                    # 检查是否已存在于数据库
-                    if self._is_article_in_db(article):
-                        consecutive_duplicates += 1
-                        logger.warning(
-                            f"! 发现重复文章 [{consecutive_duplicates}/{max_consecutive_duplicates}]: "
-                            f"{article.get('card_title', '无标题')[:30]}..."
-                        )
+    @staticmethod
+    def _card_to_article(card: dict) -> dict | None:
+        """
+        将注入脚本序列化的卡片转换为文章字典
+
+        :param card: 卡片字典
+        :return: 文章字典或 None（置顶或没有内容时）
+        """
+        if card.get("pinned"):
+            logger.info("跳过置顶文章")
+            return None
+        if not card.get("card_description"):
+            return None
+
+        return {
+            "author": card.get("author", ""),
+            "card_title": card.get("card_title", ""),
+            "card_description": card.get("card_description", ""),
+            "create-time": card.get("create_time", ""),
+            "imgs": card.get("imgs", []),
+        }
 
-                        # 如果连续遇到多个重复，停止爬取
-                        if consecutive_duplicates >= max_consecutive_duplicates:
-                            logger.info(
-                                f"\n{'=' * 60}\n"
-                                f"连续遇到 {consecutive_duplicates} 篇重复文章，停止爬取\n"
-                                f"{'=' * 60}"
-                            )
-                            total_processed += 1
-                            # 关闭数据库连接
-                            if self.db_manager:
-                                self.db_manager.close()
-                                self.db_manager = None
-                            return new_articles
-
-                        total_processed += 1
+    def _extract_cards_js(self) -> tuple[list[dict], bool]:
+        """
+        执行一次注入脚本，获取当前页面中尚未处理过的卡片的序列化结果
+
+        :return: (卡片字典列表, 是否遇到水位卡片)
+        """
+        result = json.loads(
+            self.page.run_js(_EXTRACT_CARDS_JS, self._watermark_stop_key()) or "null"
+        )
+        if result is None:
+            raise RuntimeError("页面中未找到 FeedList")
+        return result["cards"], result["reached_watermark"]
+
+    def _iter_js_articles(self):
+        """
+        通过注入脚本按批次取回卡片，每批只包含上次之后新加载的卡片，
+        处理完当前批次后向下滚动加载下一批
+
+        :return: 文章字典生成器（置顶卡片产出 None）
+        """
+        for scroll_round in range(self.scroll_times + 1):
+            # 脚本一次序列化整批卡片，按批记录耗时
+            with observe_phase("extract_batch"):
+                cards, reached_watermark = self._extract_cards_js()
+            for card in cards:
+                yield self._card_to_article(card)
+
+            if reached_watermark:
+                self._reached_watermark = True
+                logger.info("已到达爬取水位，停止加载")
+                return
+
+            if scroll_round == self.scroll_times:
+                return
+            if not self._scroll_for_more():
+                logger.info("页面已滚动到底部，没有更多文章")
+                return
+
+    def _iter_network_articles(self):
+        """
+        从监听到的信息流接口响应中直接解析文章，每轮数据包处理完后滚动页面触发下一页请求
+
+        :return: 文章字典生成器
+        """
+        seen_keys = set()  # 同一接口可能被重复请求，避免重复产出
+
+        for scroll_round in range(self.scroll_times + 1):
+            received = False
+
+            for packet in self.page.listen.steps(timeout=self.network_idle_timeout):
+                body = packet.response.body if packet.response else None
+                for item in extract_feed_items(body):
+                    with observe_phase("parse_card"):
+                        article = map_feed_item(item)
+                    # 监听范围内可能混入其它接口，只接受带作者和正文的条目
+                    if not article or not article["author"] or not article["card_description"]:
                         continue
 
-                    # 重置连续重复计数
-                    consecutive_duplicates = 0
-
-                    # 新文章，保存到数据库
-                    if self.save_to_db and self.db_manager:
-                        if self.db_manager.insert_article(article):
-                            logger.info(
-                                f"✓ 新文章已保存: {article.get('card_title', '无标题')[:30]}..."
-                            )
-                            new_articles.append(article)
-                        else:
-                            logger.warning("! 文章插入数据库失败")
-                    else:
-                        # 不使用数据库时，直接添加
-                        new_articles.append(article)
-                        logger.info(
-                            f"✓ 第 {len(new_articles)} 篇: {article.get('card_title', '无标题')[:30]}..."
-                        )
+                    key = (article["author"], article["card_description"])
+                    if key in seen_keys:
+                        continue
+                    seen_keys.add(key)
+                    received = True
+                    yield article
 
-                    # 发送飞书通知
-                    if self.feishu_notifier:
-                        try:
-                            self.feishu_notifier.notify_new_article(article)
-                        except Exception as e:
-                            logger.error(f"× 发送飞书通知失败: {str(e)}")
+            if not received:
+                # 没有新的信息流数据，说明已到底或接口未命中
+                return
 
-                    total_processed += 1
+            if scroll_round < self.scroll_times:
+                self.page.scroll.to_bottom()
 
-                logger.info(f"\n{'=' * 60}")
-                logger.info(f"提取完成 - 共获取 {len(new_articles)} 篇新文章")
-                logger.info(f"{'=' * 60}\n")
+    def _extract_articles_from_network(self) -> Optional[list[dict]]:
+        """
+        network 模式：从接口响应中提取文章
 
-                # 关闭数据库连接
-                if self.db_manager:
-                    self.db_manager.close()
-                    self.db_manager = None
+        :return: 新文章列表；未捕获到任何信息流数据时返回 None（由调用方回退到 DOM 解析）
+        """
+        try:
+            articles = self._iter_network_articles()
+            try:
+                first_article = next(articles)
+            except StopIteration:
+                logger.warning("! 未捕获到信息流接口数据，回退到 DOM 解析")
+                return None
 
-                return new_articles
-            except Exception as e:
-                logger.error(f"× 获取文章列表失败: {str(e)}")
-                raise e
+            logger.info("✓ 已捕获信息流接口数据，直接从 JSON 中解析文章")
+            return self._process_articles(itertools.chain([first_article], articles))
+
+        except Exception as e:
+            logger.error(f"× 解析信息流接口数据失败，回退到 DOM 解析: {str(e)}")
+            return None
+
+        finally:
+            try:
+                self.page.listen.stop()
+            except Exception:
+                pass
+
+    def extract_articles(self) -> list[dict]:
+        """
+        递归提取文章信息（边滚动边检查数据库）
+        当遇到已存在的文章时停止
+
+        :return: 新文章列表
+        """
+        logger.info(f"\n{'=' * 60}")
+        logger.info("开始提取文章（遇到重复则停止）")
+        logger.info(f"{'=' * 60}")
+
+        try:
+            self._open_db()
+
+            if self.extract_mode == "network":
+                new_articles = self._extract_articles_from_network()
+                if new_articles is not None:
+                    return new_articles
 
+            # network 模式回退时同样使用批量脚本解析 DOM
+            if self.extract_mode in ("js", "network"):
+                return self._process_articles(self._iter_js_articles())
+
+            return self._process_articles(self._iter_dom_articles())
         except Exception as e:
             logger.error(f"× 提取文章失败: {str(e)}")
+            self._record_run_stats(0, [])
+            return []
+        finally:
             # 确保关闭数据库连接
-            if self.db_manager:
-                self.db_manager.close()
-                self.db_manager = None
-            return new_articles
+            self._close_db()
+
+    def init_browser(self):
+        """初始化浏览器（api/auto 模式下延迟到需要回退时再启动）"""
+        if self.scrape_method in ("api", "auto"):
+            return
+        super().init_browser()
+
+    def _scrape_via_api(self) -> Optional[list[dict]]:
+        """
+        通过 HTTP 接口拉取文章，复用去重 → 入库 → 通知流程
+
+        :return: 新文章列表；接口不可用或首个请求失败时返回 None
+        """
+        with BinanceSquareApiFetcher(self.api_config) as fetcher:
+            if not fetcher.available:
+                logger.warning("! 未配置 api_config.articles_endpoint 或未安装 httpx，接口模式不可用")
+                return None
+
+            logger.info(f"\n{'=' * 60}")
+            logger.info(f"通过接口拉取 {self.kol_username} 的文章（遇到重复则停止）")
+            logger.info(f"{'=' * 60}")
+
+            articles = fetcher.iter_articles(self.kol_username)
+            try:
+                # 先取第一条，确认接口可用后再进入处理流程
+                first_article = next(articles)
+            except StopIteration:
+                logger.warning("! 接口未返回任何文章")
+                return None
+            except Exception as e:
+                logger.error(f"× 接口请求失败: {str(e)}")
+                return None
+
+            try:
+                self._open_db()
+                return self._process_articles(itertools.chain([first_article], articles))
+            finally:
+                self._close_db()
 
     def scrape(self) -> list[dict]:
         """
         执行完整的爬取流程
 
-        :return: 新文章列表
+        :return: 新文章列表（接口不可用或无法访问主页时抛出 RuntimeError，调用方据此记为爬取失败）
         """
+        if self.scrape_method in ("api", "auto"):
+            new_articles = self._scrape_via_api()
+            if new_articles is not None:
+                return new_articles
+            if self.scrape_method == "api":
+                logger.error("× 接口模式爬取失败")
+                raise RuntimeError(f"接口模式爬取 {self.kol_username} 失败")
+            logger.info("接口模式不可用，回退到浏览器模式")
+            # auto 模式回退时才启动浏览器
+            BaseScraper.init_browser(self)
+
         if not self.navigate_to_profile():
+            # Cloudflare 拦截、信息流加载超时等，不能当作"没有新文章"
             logger.error("× 无法访问页面，爬取中止")
-            return []
+            raise RuntimeError(f"无法访问 {self.kol_username} 的主页")
 
         # 提取文章（递归模式，文章已在提取过程中存入数据库）
         return self.extract_articles()
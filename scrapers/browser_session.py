@@ -0,0 +1,260 @@
+"""
+常驻浏览器会话管理
+Chrome 只启动一次并在多次调度之间保持预热，每个任务分配一个全新的标签页，
+达到任务数或内存阈值后自动回收重启浏览器
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+from scrapers.base import BaseScraper
+from utils.logger import setup_logger
+
+try:
+    import psutil
+
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = setup_logger(
+    logger_name="browser_session",
+    log_file="browser_session.log",
+    log_level=20,  # logging.INFO
+)
+
+
+class BrowserSession:
+    """常驻浏览器会话，负责浏览器的启动、标签页分配和回收"""
+
+    def __init__(
+        self,
+        headless: bool = True,
+        max_jobs: int = 50,
+        max_memory_mb: int = 1200,
+        debug_port: int = 9222,
+        user_data_dir: str = "/tmp/chrome-debug",
+        resource_blocker=None,
+    ):
+        """
+        初始化浏览器会话
+
+        :param headless: 是否使用无头模式
+        :param max_jobs: 浏览器处理多少个任务后回收重启（0 表示不限制）
+        :param max_memory_mb: 浏览器进程树内存超过该值（MB）后回收重启（0 表示不限制）
+        :param debug_port: Chrome 远程调试端口
+        :param user_data_dir: Chrome 用户数据目录
+        :param resource_blocker: 请求拦截器（ResourceBlocker），在每个新标签页上启用
+        """
+        self.headless = headless
+        self.debug_port = debug_port
+        self.user_data_dir = user_data_dir
+        self.max_jobs = max_jobs
+        self.max_memory_mb = max_memory_mb
+        self.resource_blocker = resource_blocker
+
+        self._browser = None  # 持有浏览器的 BaseScraper
+        self._jobs_since_start = 0  # 本次启动以来完成的任务数
+        self._active_tabs = 0  # 正在使用的标签页数
+        self._recycle_pending = False  # 是否等待回收
+        self._condition = threading.Condition()
+
+    @property
+    def page(self):
+        """当前浏览器的主页面对象（未启动时自动启动）"""
+        with self._condition:
+            self._ensure_started()
+            return self._browser.page
+
+    @property
+    def is_running(self) -> bool:
+        """浏览器是否已启动"""
+        return self._browser is not None
+
+    def _ensure_started(self):
+        """确保浏览器已启动（调用方需持有锁）"""
+        if self._browser is None:
+            browser = BaseScraper(
+                headless=self.headless,
+                debug_port=self.debug_port,
+                user_data_dir=self.user_data_dir,
+            )
+            browser.init_browser()
+            self._browser = browser
+            self._jobs_since_start = 0
+            self._recycle_pending = False
+
+    def _shutdown(self):
+        """关闭浏览器（调用方需持有锁）"""
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception as e:
+                logger.warning(f"! 关闭浏览器失败: {str(e)}")
+            self._browser = None
+
+    def start(self):
+        """启动浏览器"""
+        with self._condition:
+            self._ensure_started()
+
+    def close(self):
+        """关闭浏览器，等待所有标签页归还"""
+        with self._condition:
+            while self._active_tabs > 0:
+                self._condition.wait()
+            self._shutdown()
+
+    def memory_usage_mb(self) -> float:
+        """
+        获取浏览器进程树（主进程 + 渲染进程等子进程）占用的内存
+
+        :return: 常驻内存（MB），无法获取时返回 0
+        """
+        if self._browser is None:
+            return 0.0
+
+        pid = getattr(self._browser.page, "process_id", None)
+        if not pid:
+            return 0.0
+
+        try:
+            if PSUTIL_AVAILABLE:
+                process = psutil.Process(pid)
+                processes = [process] + process.children(recursive=True)
+                total = 0
+                for proc in processes:
+                    try:
+                        total += proc.memory_info().rss
+                    except psutil.Error:
+                        continue
+                return total / 1024 / 1024
+            return _proc_tree_rss_bytes(pid) / 1024 / 1024
+        except Exception as e:
+            logger.warning(f"! 获取浏览器内存占用失败: {str(e)}")
+            return 0.0
+
+    def _should_recycle(self) -> bool:
+        """判断浏览器是否需要回收（调用方需持有锁）"""
+        if self.max_jobs and self._jobs_since_start >= self.max_jobs:
+            logger.info(f"浏览器已处理 {self._jobs_since_start} 个任务，准备回收")
+            return True
+
+        if self.max_memory_mb:
+            memory_mb = self.memory_usage_mb()
+            if memory_mb >= self.max_memory_mb:
+                logger.info(
+                    f"浏览器内存占用 {memory_mb:.0f}MB 超过阈值 {self.max_memory_mb}MB，准备回收"
+                )
+                return True
+
+        return False
+
+    def recycle(self):
+        """立即回收浏览器（等待正在使用的标签页归还后重启）"""
+        with self._condition:
+            self._recycle_pending = True
+            while self._active_tabs > 0:
+                self._condition.wait()
+            self._restart()
+
+    def _restart(self):
+        """重启浏览器（调用方需持有锁）"""
+        logger.info("正在回收浏览器...")
+        self._shutdown()
+        self._ensure_started()
+        logger.info("✓ 浏览器已回收重启")
+        self._condition.notify_all()
+
+    @contextmanager
+    def acquire_tab(self):
+        """
+        获取一个全新的标签页，使用完毕后自动关闭
+
+        用法::
+
+            with session.acquire_tab() as tab:
+                tab.get(url)
+        """
+        with self._condition:
+            # 等待回收完成，避免在即将关闭的浏览器上开新标签页
+            while self._recycle_pending and self._active_tabs > 0:
+                self._condition.wait()
+            if self._recycle_pending:
+                self._restart()
+            self._ensure_started()
+            self._active_tabs += 1
+            page = self._browser.page
+
+        tab = None
+        try:
+            try:
+                tab = page.new_tab()
+                if self.resource_blocker is not None:
+                    self.resource_blocker.attach(tab)
+            except Exception:
+                # 浏览器可能已崩溃，标记回收，待所有标签页归还后重启
+                with self._condition:
+                    self._recycle_pending = True
+                logger.warning("! 新建标签页失败，浏览器将在空闲后重启")
+                raise
+            yield tab
+
+        finally:
+            if tab is not None:
+                try:
+                    tab.close()
+                except Exception as e:
+                    logger.warning(f"! 关闭标签页失败: {str(e)}")
+
+            with self._condition:
+                self._active_tabs -= 1
+                self._jobs_since_start += 1
+                if not self._recycle_pending and self._should_recycle():
+                    self._recycle_pending = True
+                if self._recycle_pending and self._active_tabs == 0:
+                    self._restart()
+                self._condition.notify_all()
+
+    def __enter__(self):
+        """上下文管理器入口"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """上下文管理器出口"""
+        self.close()
+
+
+def _proc_tree_rss_bytes(root_pid: int) -> int:
+    """
+    不依赖 psutil，通过 /proc 统计进程树的常驻内存（仅 Linux）
+
+    :param root_pid: 根进程 ID
+    :return: 常驻内存（字节）
+    """
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # 进程名可能包含空格，从最后一个 ')' 之后开始解析
+                fields = f.read().rsplit(")", 1)[1].split()
+            children.setdefault(int(fields[1]), []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        try:
+            with open(f"/proc/{pid}/statm", "r") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            pass
+        stack.extend(children.get(pid, []))
+    return total
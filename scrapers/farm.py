@@ -0,0 +1,263 @@
+"""
+多进程爬虫农场
+启动 N 个常驻爬虫进程，每个进程拥有独立的 Chrome 调试端口和用户数据目录，
+由主进程（supervisor）将 KOL 列表分片派发给各个进程
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+import zlib
+
+from utils.logger import setup_logger
+from utils.metrics import REGISTRY
+
+logger = setup_logger(
+    logger_name="scraper_farm",
+    log_file="scraper_farm.log",
+    log_level=20,  # logging.INFO
+)
+
+
+class ScraperFarm:
+    """多进程爬虫农场（supervisor），负责进程管理和 KOL 分片"""
+
+    def __init__(self, config: dict):
+        """
+        初始化爬虫农场
+
+        :param config: 完整配置字典（会原样传给每个工作进程）
+        """
+        self.config = config
+        farm_config = config.get("farm", {})
+        self.worker_count = max(1, int(farm_config.get("workers") or os.cpu_count() or 1))
+        self.base_port = farm_config.get("base_port", 9300)
+        self.profile_root = farm_config.get("profile_root", "/tmp/chrome-farm")
+        self.round_timeout = farm_config.get("round_timeout", 600)
+
+        self._context = multiprocessing.get_context("spawn")
+        self._result_queue = self._context.Queue()
+        self._workers = {}  # worker_id -> (Process, task_queue)
+        self._round_id = 0
+
+    def worker_settings(self, worker_id: int) -> dict:
+        """
+        获取工作进程的浏览器隔离参数
+
+        :param worker_id: 工作进程编号
+        :return: 包含调试端口和用户数据目录的字典
+        """
+        return {
+            "debug_port": self.base_port + worker_id,
+            "user_data_dir": os.path.join(self.profile_root, f"worker-{worker_id}"),
+        }
+
+    def _start_worker(self, worker_id: int):
+        """启动（或重启）单个工作进程"""
+        task_queue = self._context.Queue()
+        process = self._context.Process(
+            target=_farm_worker_main,
+            args=(worker_id, self.config, self.worker_settings(worker_id), task_queue, self._result_queue),
+            name=f"scraper-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        self._workers[worker_id] = (process, task_queue)
+        logger.info(
+            f"✓ 工作进程 {worker_id} 已启动 (PID: {process.pid}, "
+            f"端口: {self.worker_settings(worker_id)['debug_port']})"
+        )
+
+    def start(self):
+        """启动所有工作进程（已存活的进程不会重复启动）"""
+        for worker_id in range(self.worker_count):
+            worker = self._workers.get(worker_id)
+            if worker is None or not worker[0].is_alive():
+                if worker is not None:
+                    logger.warning(f"! 工作进程 {worker_id} 已退出，正在重启")
+                self._start_worker(worker_id)
+
+    def close(self):
+        """通知所有工作进程退出并等待结束"""
+        for worker_id, (process, task_queue) in self._workers.items():
+            if process.is_alive():
+                task_queue.put(None)
+
+        for worker_id, (process, task_queue) in self._workers.items():
+            process.join(timeout=30)
+            if process.is_alive():
+                logger.warning(f"! 工作进程 {worker_id} 未能正常退出，强制终止")
+                process.terminate()
+        self._workers.clear()
+        logger.info("✓ 爬虫农场已关闭")
+
+    def shard(self, kol_usernames: list[str]) -> list[list[str]]:
+        """
+        将 KOL 列表按稳定哈希分片，同一个 KOL 总是分配到同一个工作进程
+        （可复用该进程浏览器中的 Cookie 和缓存）
+
+        :param kol_usernames: KOL 用户名列表
+        :return: 每个工作进程对应的 KOL 列表
+        """
+        shards = [[] for _ in range(self.worker_count)]
+        for kol_username in dict.fromkeys(kol_usernames):
+            worker_id = zlib.crc32(kol_username.encode("utf-8")) % self.worker_count
+            shards[worker_id].append(kol_username)
+        return shards
+
+    def run(self, kol_usernames: list[str]) -> list[dict]:
+        """
+        将 KOL 列表分片派发给工作进程并收集结果
+
+        :param kol_usernames: KOL 用户名列表
+        :return: 每个 KOL 的爬取结果列表（格式同 KOLScraperPool.run）
+        """
+        self.start()
+        self._round_id += 1
+        round_id = self._round_id
+
+        shards = self.shard(kol_usernames)
+        pending = {}
+        for worker_id, shard in enumerate(shards):
+            if shard:
+                self._workers[worker_id][1].put((round_id, shard))
+                pending[worker_id] = shard
+
+        logger.info(
+            f"第 {round_id} 轮: {len(kol_usernames)} 个 KOL 分派给 {len(pending)} 个工作进程 "
+            f"({', '.join(f'#{w}: {len(s)}' for w, s in pending.items())})"
+        )
+
+        start_time = time.perf_counter()
+        deadline = time.monotonic() + self.round_timeout
+        results = {}
+
+        while pending and time.monotonic() < deadline:
+            try:
+                result_round, worker_id, worker_results, worker_metrics = self._result_queue.get(timeout=1)
+            except queue.Empty:
+                # 检查是否有工作进程意外退出
+                for worker_id in list(pending):
+                    if not self._workers[worker_id][0].is_alive():
+                        logger.error(f"× 工作进程 {worker_id} 意外退出")
+                        results.update(_failed_results(pending.pop(worker_id), "工作进程意外退出"))
+                continue
+
+            # 工作进程的指标增量无论是否属于本轮都计入主进程的指标服务
+            REGISTRY.merge(worker_metrics)
+            if result_round != round_id:
+                # 上一轮超时后才返回的结果，丢弃
+                continue
+            for result in worker_results:
+                results[result["kol_username"]] = result
+            pending.pop(worker_id, None)
+
+        for worker_id, shard in pending.items():
+            logger.error(f"× 工作进程 {worker_id} 在 {self.round_timeout}s 内未返回结果")
+            results.update(_failed_results(shard, "工作进程超时"))
+
+        ordered_results = [results[k] for k in dict.fromkeys(kol_usernames) if k in results]
+        logger.info(f"第 {round_id} 轮完成，耗时 {time.perf_counter() - start_time:.2f}s")
+        return ordered_results
+
+    def __enter__(self):
+        """上下文管理器入口"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """上下文管理器出口"""
+        self.close()
+
+
+def _failed_results(kol_usernames: list[str], error: str) -> dict:
+    """
+    为未返回结果的 KOL 构造失败结果
+
+    :param kol_usernames: KOL 用户名列表
+    :param error: 错误信息
+    :return: kol_username -> 结果字典
+    """
+    return {
+        kol_username: {
+            "kol_username": kol_username,
+            "success": False,
+            "new_articles": [],
+            "processed": 0,
+            "elapsed": 0.0,
+            "cards_per_sec": 0.0,
+            "error": error,
+        }
+        for kol_username in kol_usernames
+    }
+
+
+def _farm_worker_main(
+    worker_id: int,
+    config: dict,
+    settings: dict,
+    task_queue,
+    result_queue,
+):
+    """
+    工作进程入口：持有独立的常驻浏览器，循环处理 supervisor 派发的 KOL 分片
+
+    :param worker_id: 工作进程编号
+    :param config: 完整配置字典
+    :param settings: 浏览器隔离参数（debug_port、user_data_dir）
+    :param task_queue: 任务队列，收到 None 时退出
+    :param result_queue: 结果队列
+    """
+    # 在子进程中导入，避免 spawn 时在主进程加载浏览器依赖
+    from scrapers.browser_session import BrowserSession
+    from scrapers.kol_pool import KOLScraperPool
+    from scrapers.resource_blocker import create_resource_blocker_from_config
+    from utils.feishu_notifier import get_shared_feishu_notifier
+    from utils.pipeline import create_pipeline_from_config
+
+    scheduler_config = config.get("scheduler_config", {})
+    browser_config = config.get("browser", {})
+    headless = scheduler_config.get("headless", True)
+
+    feishu_notifier = get_shared_feishu_notifier(config)
+    # 通知发件箱由主进程统一投递，工作进程只负责写入
+    pipeline = create_pipeline_from_config(config, feishu_notifier, deliver_notifications=False)
+    session = BrowserSession(
+        headless=headless,
+        max_jobs=browser_config.get("max_jobs", 50),
+        max_memory_mb=browser_config.get("max_memory_mb", 1200),
+        debug_port=settings["debug_port"],
+        user_data_dir=settings["user_data_dir"],
+        resource_blocker=create_resource_blocker_from_config(config),
+    )
+    pool = KOLScraperPool(
+        headless=headless,
+        max_concurrency=scheduler_config.get("max_concurrency", 3),
+        scraper_kwargs=KOLScraperPool.scraper_kwargs_from_config(
+            config, feishu_notifier, pipeline
+        ),
+        browser_session=session,
+    )
+
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+
+            round_id, kol_usernames = task
+            try:
+                results = pool.run(kol_usernames)
+            except Exception as e:
+                logger.error(f"× 工作进程 {worker_id} 执行失败: {str(e)}")
+                results = list(_failed_results(kol_usernames, str(e)).values())
+            result_queue.put((round_id, worker_id, results, REGISTRY.drain()))
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        pool.close()
+        if pipeline is not None:
+            pipeline.close()
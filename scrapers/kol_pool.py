@@ -0,0 +1,234 @@
+"""
+多 KOL 并发爬取池
+在同一个 ChromiumPage 中开启多个标签页，并发爬取多个 KOL 的主页
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from scrapers.binance_square import BinanceSquareScraper
+from scrapers.browser_session import BrowserSession
+from scrapers.session_store import create_session_store_from_config
+from utils.logger import setup_logger
+from utils.metrics import record_scrape
+
+logger = setup_logger(
+    logger_name="kol_pool",
+    log_file="kol_pool.log",
+    log_level=20,  # logging.INFO
+)
+
+
+class KOLScraperPool:
+    """多 KOL 并发爬取池，所有 KOL 共享同一个浏览器，每个任务独占一个标签页"""
+
+    def __init__(
+        self,
+        headless: bool = True,
+        max_concurrency: int = 3,
+        scraper_kwargs: dict = None,
+        browser_session: BrowserSession = None,
+    ):
+        """
+        初始化并发爬取池
+
+        :param headless: 是否使用无头模式
+        :param max_concurrency: 同时打开的标签页（并发爬取的 KOL）上限
+        :param scraper_kwargs: 传给 BinanceSquareScraper 的其它参数（db_path、feishu_notifier 等）
+        :param browser_session: 外部常驻的浏览器会话（传入时不由本实例关闭）
+        """
+        self.headless = headless
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.scraper_kwargs = scraper_kwargs or {}
+        self._executor = None  # 常驻工作线程池（线程内的数据库长连接得以复用）
+        self._owns_session = browser_session is None
+        self.browser_session = browser_session or BrowserSession(
+            headless=headless, max_jobs=0, max_memory_mb=0
+        )
+
+    @staticmethod
+    def scraper_kwargs_from_config(config: dict, feishu_notifier=None, pipeline=None) -> dict:
+        """
+        根据配置文件构造 BinanceSquareScraper 的公共参数
+
+        :param config: 完整配置字典
+        :param feishu_notifier: 飞书通知器实例（使用写入流水线时由流水线负责通知）
+        :param pipeline: 异步写入流水线
+        :return: scraper_kwargs 字典
+        """
+        advanced_config = config.get("advanced", {})
+        api_config = {
+            "timeout": advanced_config.get("timeout", 30),
+            "max_retries": advanced_config.get("max_retries", 3),
+            "request_delay": advanced_config.get("request_delay", 0),
+            **config.get("api_config", {}),
+        }
+        drission_config = config.get("drission_config", {})
+        database_config = config.get("database", {})
+        return {
+            "save_to_db": True,
+            "db_path": database_config.get("db_path", "database/binance_square.db"),
+            "feishu_notifier": None if pipeline else feishu_notifier,
+            "pipeline": pipeline,
+            "scrape_method": config.get("scrape_method", "drission"),
+            "api_config": api_config,
+            "extract_mode": drission_config.get("extract_mode", "dom"),
+            "listen_targets": drission_config.get("listen_targets"),
+            "scroll_times": drission_config.get("scroll_times", 3),
+            "max_articles": drission_config.get("max_articles"),
+            "scroll_delay": drission_config.get("scroll_delay", 1.5),
+            "max_consecutive_duplicates": drission_config.get("max_consecutive_duplicates", 2),
+            "use_watermark": drission_config.get("use_watermark", True),
+            "hash_index_mode": database_config.get("hash_index_mode", "set"),
+            "db_performance_profile": database_config.get("performance_profile", False),
+            "db_fts_tokenizer": database_config.get("fts_tokenizer", "trigram"),
+            "session_store": create_session_store_from_config(config),
+        }
+
+    def start(self):
+        """启动工作线程池和共享浏览器（纯接口模式下不启动浏览器）"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="kol-worker",
+            )
+        if self.scraper_kwargs.get("scrape_method") != "api":
+            self.browser_session.start()
+
+    def close(self):
+        """关闭工作线程池和共享浏览器（外部传入的常驻会话保持运行）"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._owns_session:
+            self.browser_session.close()
+
+    def _scrape_one(self, kol_username: str) -> dict:
+        """
+        在独立标签页中爬取单个 KOL
+
+        :param kol_username: KOL 用户名
+        :return: 单个 KOL 的爬取结果
+        """
+        result = {
+            "kol_username": kol_username,
+            "success": False,
+            "new_articles": [],
+            "processed": 0,
+            "elapsed": 0.0,
+            "cards_per_sec": 0.0,
+            "error": "",
+        }
+        start_time = time.perf_counter()
+
+        try:
+            if self.scraper_kwargs.get("scrape_method") == "api":
+                # 纯接口模式不需要标签页
+                scraper = BinanceSquareScraper(
+                    kol_username=kol_username,
+                    headless=self.headless,
+                    **self.scraper_kwargs,
+                )
+                result["new_articles"] = scraper.scrape()
+            else:
+                with self.browser_session.acquire_tab() as tab:
+                    scraper = BinanceSquareScraper(
+                        kol_username=kol_username,
+                        headless=self.headless,
+                        page=tab,
+                        **self.scraper_kwargs,
+                    )
+                    with scraper:
+                        result["new_articles"] = scraper.scrape()
+            result["processed"] = scraper.last_run_stats.get("processed", 0)
+            result["success"] = True
+
+        except Exception as e:
+            result["error"] = str(e)
+            logger.error(f"× KOL {kol_username} 爬取失败: {str(e)}")
+
+        result["elapsed"] = time.perf_counter() - start_time
+        record_scrape(result["success"], result["elapsed"])
+        if result["elapsed"] > 0:
+            result["cards_per_sec"] = result["processed"] / result["elapsed"]
+        return result
+
+    def run(self, kol_usernames: list[str]) -> list[dict]:
+        """
+        并发爬取多个 KOL
+
+        :param kol_usernames: KOL 用户名列表
+        :return: 每个 KOL 的爬取结果列表（按输入顺序）
+        """
+        # 去重并保持顺序
+        kol_usernames = list(dict.fromkeys(kol_usernames))
+        if not kol_usernames:
+            return []
+
+        self.start()
+
+        logger.info(f"\n{'=' * 60}")
+        logger.info(
+            f"开始并发爬取 {len(kol_usernames)} 个 KOL（并发上限: {self.max_concurrency}）"
+        )
+        logger.info(f"{'=' * 60}")
+
+        start_time = time.perf_counter()
+        results = {}
+
+        futures = {
+            self._executor.submit(self._scrape_one, kol_username): kol_username
+            for kol_username in kol_usernames
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results[result["kol_username"]] = result
+            logger.info(
+                f"{'✓' if result['success'] else '×'} {result['kol_username']}: "
+                f"新文章 {len(result['new_articles'])} 篇, "
+                f"处理 {result['processed']} 张卡片, "
+                f"耗时 {result['elapsed']:.2f}s "
+                f"({result['cards_per_sec']:.2f} 卡片/s)"
+            )
+
+        # 等待写入流水线把本轮文章全部入库（通知继续在后台发送）
+        pipeline = self.scraper_kwargs.get("pipeline")
+        if pipeline is not None:
+            pipeline.flush(wait_notifications=False)
+
+        total_elapsed = time.perf_counter() - start_time
+        ordered_results = [results[kol_username] for kol_username in kol_usernames]
+        self.log_summary(ordered_results, total_elapsed)
+        return ordered_results
+
+    @staticmethod
+    def log_summary(results: list[dict], total_elapsed: float):
+        """
+        输出本轮并发爬取的汇总统计
+
+        :param results: 每个 KOL 的爬取结果
+        :param total_elapsed: 本轮总耗时（秒）
+        """
+        success_count = sum(1 for r in results if r["success"])
+        new_count = sum(len(r["new_articles"]) for r in results)
+        processed_count = sum(r["processed"] for r in results)
+        kols_per_min = len(results) / total_elapsed * 60 if total_elapsed > 0 else 0.0
+
+        logger.info(f"\n{'=' * 60}")
+        logger.info(
+            f"并发爬取完成 - 成功 {success_count}/{len(results)} 个 KOL, "
+            f"新文章 {new_count} 篇, 处理卡片 {processed_count} 张"
+        )
+        logger.info(
+            f"总耗时 {total_elapsed:.2f}s, 吞吐量 {kols_per_min:.1f} KOL/min"
+        )
+        logger.info(f"{'=' * 60}\n")
+
+    def __enter__(self):
+        """上下文管理器入口"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """上下文管理器出口"""
+        self.close()
@@ -0,0 +1,237 @@
+"""
+页面就绪等待模块
+注入脚本通过 MutationObserver 监听信息流 DOM 变化、通过 PerformanceObserver 监听资源请求，
+信息流卡片出现且 DOM 与网络短暂静默后立即返回，取代固定的 sleep 和超时等待；
+同时在等待期间自动关闭跳转提示弹窗和 Cookie 横幅，并识别 Cloudflare 验证页。
+每次等待的实际耗时都会被记录，超时时间根据历史耗时自适应调整
+"""
+
+import json
+import threading
+import time
+from collections import deque
+
+from utils.logger import setup_logger
+from utils.metrics import PHASE_SECONDS
+
+logger = setup_logger(
+    logger_name="readiness",
+    log_file="binance_square_scraper.log",
+    log_level=20,  # logging.INFO
+)
+
+# 等待信息流就绪（返回 Promise，DrissionPage 的 run_js 会等待其完成）
+# 参数为 JSON: min_children（卡片数达到该值）或 unseen（存在未处理卡片）、quiet_ms、timeout_ms、
+# challenge_timeout_ms（检测到验证页时的总等待时间）、dismiss（是否关闭弹窗）
+_WAIT_FEED_JS = """
+const opts = JSON.parse(arguments[0]);
+return new Promise((resolve) => {
+    const started = performance.now();
+    let lastActivity = started;
+    let conditionMetAt = null;
+    let challengeSeen = false;
+    let dismissed = 0;
+    let finished = false;
+
+    const feed = () => document.querySelector('[class*="FeedList"]');
+    const cardCount = () => {
+        const list = feed();
+        if (!list) return 0;
+        return opts.unseen
+            ? list.querySelectorAll(':scope > :not([data-bss-seen])').length
+            : list.children.length;
+    };
+    const isChallenge = () =>
+        /just a moment|checking your browser|attention required/i.test(document.title)
+        || document.querySelector('#challenge-form, #challenge-running, [id^="cf-chl"], .cf-browser-verification') !== null;
+    const clickOnce = (button) => {
+        if (button && !button.hasAttribute('data-bss-dismissed')) {
+            button.setAttribute('data-bss-dismissed', '1');
+            button.click();
+            dismissed += 1;
+        }
+    };
+    const dismiss = () => {
+        if (!opts.dismiss) return;
+        // 跳转提示弹窗
+        clickOnce(document.querySelector('[class="bn-modal-confirm"] button'));
+        // Cookie 横幅
+        for (const button of document.querySelectorAll('button')) {
+            if (button.textContent.trim() === '接受所有 Cookie') {
+                clickOnce(button);
+                break;
+            }
+        }
+    };
+
+    const finish = (state) => {
+        if (finished) return;
+        finished = true;
+        observer.disconnect();
+        if (resourceObserver) resourceObserver.disconnect();
+        clearInterval(timer);
+        resolve(JSON.stringify({
+            state: state,
+            elapsed_ms: performance.now() - started,
+            cards: cardCount(),
+            challenge: challengeSeen,
+            dismissed: dismissed,
+        }));
+    };
+
+    const check = () => {
+        if (finished) return;
+        const now = performance.now();
+        const target = opts.unseen ? 1 : opts.min_children;
+        if (cardCount() >= target) {
+            if (conditionMetAt === null) conditionMetAt = now;
+            // 卡片已出现，等 DOM 和网络静默（首屏渲染完整）；持续有动画时最多再等 1 秒
+            if (now - lastActivity >= opts.quiet_ms || now - conditionMetAt >= 1000) {
+                dismiss();
+                finish('ready');
+                return;
+            }
+        } else if (isChallenge()) {
+            challengeSeen = true;
+        }
+        const limit = challengeSeen ? Math.max(opts.timeout_ms, opts.challenge_timeout_ms) : opts.timeout_ms;
+        if (now - started >= limit) finish(challengeSeen ? 'challenge' : 'timeout');
+    };
+
+    const observer = new MutationObserver(() => {
+        lastActivity = performance.now();
+        dismiss();
+        check();
+    });
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+
+    let resourceObserver = null;
+    if (window.PerformanceObserver) {
+        resourceObserver = new PerformanceObserver(() => { lastActivity = performance.now(); });
+        try {
+            resourceObserver.observe({type: 'resource'});
+        } catch (e) {
+            resourceObserver = null;
+        }
+    }
+
+    const timer = setInterval(check, 50);
+    dismiss();
+    check();
+});
+"""
+
+
+class AdaptiveTimeouts:
+    """按等待类型记录实际耗时，根据近期耗时的高分位数推算超时时间"""
+
+    def __init__(self, window: int = 50, min_samples: int = 5, factor: float = 3.0):
+        """
+        初始化自适应超时
+
+        :param window: 每种等待保留的最近样本数
+        :param min_samples: 样本数达到该值后才启用自适应（之前使用默认超时）
+        :param factor: 超时时间 = 近期耗时的 P95 × factor
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self.factor = factor
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        """
+        记录一次成功等待的耗时
+
+        :param name: 等待类型
+        :param seconds: 耗时（秒）
+        """
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self.window)).append(seconds)
+
+    def timeout(self, name: str, default: float, minimum: float, maximum: float) -> float:
+        """
+        获取当前的超时时间
+
+        :param name: 等待类型
+        :param default: 样本不足时使用的超时时间
+        :param minimum: 下限
+        :param maximum: 上限
+        :return: 超时时间（秒）
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+        if len(samples) < self.min_samples:
+            value = default
+        else:
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            value = p95 * self.factor
+        return min(max(value, minimum), maximum)
+
+
+# 进程内共享（同一进程中各 KOL 的页面加载耗时相近）
+ADAPTIVE_TIMEOUTS = AdaptiveTimeouts()
+
+
+def wait_for_feed(
+    page,
+    name: str,
+    timeout: float,
+    min_children: int = 1,
+    unseen: bool = False,
+    quiet: float = 0.2,
+    dismiss: bool = False,
+    challenge_timeout: float = 0,
+) -> dict:
+    """
+    等待信息流就绪，条件满足后立即返回
+
+    :param page: DrissionPage 的页面或标签页对象
+    :param name: 等待类型（用于指标和自适应超时，如 feed_ready、scroll_load）
+    :param timeout: 超时时间（秒）
+    :param min_children: 信息流中至少有多少张卡片
+    :param unseen: 改为等待出现尚未处理过的卡片（与 js 提取模式的 data-bss-seen 标记配合）
+    :param quiet: 条件满足后还需 DOM 和网络静默的时间（秒）
+    :param dismiss: 是否在等待期间关闭跳转提示弹窗和 Cookie 横幅
+    :param challenge_timeout: 检测到 Cloudflare 验证页时的总等待时间（秒）
+    :return: 结果字典（state: ready/timeout/challenge，elapsed、cards、challenge、dismissed、reloads）
+    """
+    started = time.perf_counter()
+    deadline = started + max(timeout, challenge_timeout)
+    options = {
+        "min_children": min_children,
+        "unseen": unseen,
+        "quiet_ms": quiet * 1000,
+        "timeout_ms": timeout * 1000,
+        "challenge_timeout_ms": challenge_timeout * 1000,
+        "dismiss": dismiss,
+    }
+    result = {"state": "timeout", "cards": 0, "challenge": False, "dismissed": 0}
+    reloads = 0  # 等待期间页面跳转的次数
+
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        options["timeout_ms"] = max(0.0, timeout - (time.perf_counter() - started)) * 1000
+        options["challenge_timeout_ms"] = remaining * 1000
+        try:
+            result = json.loads(
+                page.run_js(_WAIT_FEED_JS, json.dumps(options), timeout=remaining + 2) or "null"
+            ) or result
+            break
+        except Exception as e:
+            # 验证通过后页面会跳转，脚本所在的上下文随之销毁，在新页面上继续等待
+            logger.debug(f"等待页面就绪时上下文变化，重试: {str(e)}")
+            reloads += 1
+            time.sleep(0.1)
+
+    elapsed = time.perf_counter() - started
+    result["elapsed"] = elapsed
+    result["reloads"] = reloads
+    result.pop("elapsed_ms", None)
+    PHASE_SECONDS.observe(elapsed, phase=f"wait_{name}")
+    if result["state"] == "ready" and not result["challenge"] and not reloads:
+        # 验证页或页面跳转的等待时间不代表正常加载耗时，不计入自适应样本
+        ADAPTIVE_TIMEOUTS.record(name, elapsed)
+    return result
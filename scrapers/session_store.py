@@ -0,0 +1,261 @@
+"""
+浏览器会话状态持久化
+将站点的 Cookie 和 localStorage 保存到挂载卷上的 JSON 文件，新标签页打开主页前恢复，
+使已接受 Cookie、已关闭跳转提示、已通过 Cloudflare 验证的状态在容器重建后仍然有效；
+会话过期或恢复后仍出现弹窗/验证时，在本次成功加载后重新保存（预热）
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import weakref
+from urllib.parse import urlparse
+
+from utils.logger import setup_logger
+
+logger = setup_logger(
+    logger_name="session_store",
+    log_file="browser_session.log",
+    log_level=20,  # logging.INFO
+)
+
+# Cloudflare 验证通过后下发的 Cookie，过期后需要重新验证
+_CHALLENGE_COOKIES = ("cf_clearance",)
+
+# Chrome 用户数据目录的单实例锁文件（容器异常退出后会残留，导致无法使用同一目录启动）
+_PROFILE_LOCK_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie")
+
+# 在新文档中恢复 localStorage（只写入当前不存在的键，不覆盖页面自己写入的新值）
+_RESTORE_LOCAL_STORAGE_JS = """
+(() => {
+    const saved = %s;
+    if (location.origin !== saved.origin) return;
+    try {
+        for (const [key, value] of Object.entries(saved.items)) {
+            if (localStorage.getItem(key) === null) localStorage.setItem(key, value);
+        }
+    } catch (e) {}
+})();
+"""
+
+_DUMP_LOCAL_STORAGE_JS = """
+const items = {};
+for (let i = 0; i < localStorage.length; i++) {
+    const key = localStorage.key(i);
+    items[key] = localStorage.getItem(key);
+}
+return JSON.stringify({origin: location.origin, items: items});
+"""
+
+
+def clear_stale_profile_locks(user_data_dir: str) -> bool:
+    """
+    清理用户数据目录中残留的单实例锁（持有锁的 Chrome 进程已不存在时）
+
+    :param user_data_dir: Chrome 用户数据目录
+    :return: 是否清理了残留的锁
+    """
+    lock_path = os.path.join(user_data_dir, "SingletonLock")
+    try:
+        # 锁文件是指向 "主机名-PID" 的符号链接
+        target = os.readlink(lock_path)
+    except OSError:
+        return False
+
+    hostname, _, pid = target.rpartition("-")
+    if hostname == socket.gethostname() and pid.isdigit():
+        try:
+            os.kill(int(pid), 0)
+            return False  # 进程仍在运行，锁有效
+        except ProcessLookupError:
+            pass
+        except PermissionError:
+            return False
+
+    for name in _PROFILE_LOCK_FILES:
+        try:
+            os.remove(os.path.join(user_data_dir, name))
+        except OSError:
+            pass
+    logger.info(f"✓ 已清理用户数据目录中残留的锁: {user_data_dir} ({target})")
+    return True
+
+
+class SessionStore:
+    """站点会话状态（Cookie + localStorage）的持久化存储"""
+
+    def __init__(
+        self,
+        path: str = "browser_state/session.json",
+        base_url: str = "https://www.binance.com",
+        max_age_hours: float = 72,
+    ):
+        """
+        初始化会话存储
+
+        :param path: 会话文件路径（应位于挂载卷上）
+        :param base_url: 站点根地址（只保存该站点域名下的 Cookie 和该源的 localStorage）
+        :param max_age_hours: 会话保存后超过多少小时视为过期，需要重新预热
+        """
+        self.path = path
+        self.base_url = base_url.rstrip("/")
+        self.max_age_hours = max_age_hours
+        hostname = urlparse(self.base_url).hostname or ""
+        # www.binance.com -> binance.com，同时匹配 .binance.com 等子域 Cookie
+        self.cookie_domain = ".".join(hostname.split(".")[-2:]) if hostname.count(".") >= 2 else hostname
+        self._state = None
+        self._loaded = False
+        self._stale = False  # 恢复后仍出现弹窗或验证时标记
+        self._restored_pages = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def load(self) -> dict | None:
+        """
+        读取会话文件（只读取一次，之后使用内存中的副本）
+
+        :return: 会话状态字典，不存在或损坏时返回 None
+        """
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._state = json.load(f)
+                except FileNotFoundError:
+                    self._state = None
+                except (OSError, ValueError) as e:
+                    logger.warning(f"! 会话文件无法读取，将重新预热: {str(e)}")
+                    self._state = None
+            return self._state
+
+    def is_stale(self) -> bool:
+        """
+        判断会话是否需要重新预热（不存在、超过有效期、验证 Cookie 已过期或恢复后仍出现弹窗）
+
+        :return: 是否过期
+        """
+        state = self.load()
+        if self._stale or not state:
+            return True
+        now = time.time()
+        if now - state.get("saved_at", 0) > self.max_age_hours * 3600:
+            return True
+        for cookie in state.get("cookies", []):
+            if cookie.get("name") in _CHALLENGE_COOKIES and 0 < cookie.get("expires", -1) < now:
+                return True
+        return False
+
+    def mark_stale(self):
+        """标记会话已失效（恢复后页面仍出现 Cookie 横幅、跳转提示或验证）"""
+        self._stale = True
+
+    def restore(self, page) -> bool:
+        """
+        在打开页面前将保存的会话恢复到标签页（同一标签页只恢复一次）
+
+        :param page: DrissionPage 的页面或标签页对象
+        :return: 是否恢复了会话
+        """
+        state = self.load()
+        if not state or page in self._restored_pages:
+            return False
+        if time.time() - state.get("saved_at", 0) > self.max_age_hours * 3600:
+            return False
+
+        try:
+            now = time.time()
+            cookies = [
+                cookie for cookie in state.get("cookies", [])
+                # 会话 Cookie（expires = -1）照常恢复，已过期的丢弃
+                if cookie.get("expires", -1) <= 0 or cookie["expires"] > now
+            ]
+            if cookies:
+                page.run_cdp("Network.setCookies", cookies=cookies)
+
+            local_storage = state.get("local_storage")
+            if local_storage and local_storage.get("items"):
+                page.run_cdp(
+                    "Page.addScriptToEvaluateOnNewDocument",
+                    source=_RESTORE_LOCAL_STORAGE_JS % json.dumps(local_storage, ensure_ascii=False),
+                )
+        except Exception as e:
+            logger.warning(f"! 恢复会话失败: {str(e)}")
+            return False
+
+        self._restored_pages.add(page)
+        return True
+
+    def save(self, page) -> bool:
+        """
+        保存当前标签页的会话（需在站点页面上调用，localStorage 按当前源读取）
+
+        :param page: DrissionPage 的页面或标签页对象
+        :return: 是否保存成功
+        """
+        try:
+            cookies = [
+                cookie for cookie in page.run_cdp("Network.getAllCookies").get("cookies", [])
+                if cookie.get("domain", "").lstrip(".").endswith(self.cookie_domain)
+            ]
+            local_storage = json.loads(page.run_js(_DUMP_LOCAL_STORAGE_JS) or "null")
+        except Exception as e:
+            logger.warning(f"! 读取会话失败: {str(e)}")
+            return False
+
+        state = {
+            "saved_at": time.time(),
+            "base_url": self.base_url,
+            "cookies": [_settable_cookie(cookie) for cookie in cookies],
+            "local_storage": local_storage,
+        }
+
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(state, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.error(f"× 保存会话失败: {str(e)}")
+                return False
+            self._state = state
+            self._loaded = True
+            self._stale = False
+
+        logger.info(
+            f"✓ 会话已保存: {len(state['cookies'])} 个 Cookie, "
+            f"{len((local_storage or {}).get('items', {}))} 个 localStorage 项 -> {self.path}"
+        )
+        return True
+
+
+def _settable_cookie(cookie: dict) -> dict:
+    """只保留 Network.setCookies 接受的字段"""
+    keys = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority")
+    settable = {key: cookie[key] for key in keys if key in cookie}
+    if cookie.get("session"):
+        settable.pop("expires", None)
+    return settable
+
+
+# 便捷函数
+def create_session_store_from_config(config: dict) -> SessionStore | None:
+    """
+    从配置字典创建会话存储
+
+    :param config: 配置字典
+    :return: SessionStore 实例或 None（未启用时）
+    """
+    store_config = config.get("browser", {}).get("session_store", {})
+    if not store_config.get("enabled", False):
+        return None
+
+    return SessionStore(
+        path=store_config.get("path", "browser_state/session.json"),
+        max_age_hours=store_config.get("max_age_hours", 72),
+    )
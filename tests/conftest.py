@@ -0,0 +1,40 @@
+"""
+测试公共配置
+"""
+
+import os
+import sys
+
+import pytest
+
+# 以仓库根目录为导入路径（与 run_scheduler.py 等入口脚本一致）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.database import DatabaseManager  # noqa: E402
+
+
+def make_article(author: str = "TestKOL", index: int = 0, **overrides) -> dict:
+    """
+    构造一篇测试文章
+
+    :param author: 作者
+    :param index: 序号（用于生成不同的内容）
+    :return: 文章字典
+    """
+    article = {
+        "author": author,
+        "card_title": f"标题 {index}",
+        "card_description": f"比特币行情分析第 {index} 篇 BTC ETF 资金流入",
+        "create-time": "5分钟",
+        "imgs": [],
+    }
+    article.update(overrides)
+    return article
+
+
+@pytest.fixture
+def db(tmp_path):
+    """已初始化表结构的临时数据库"""
+    with DatabaseManager(str(tmp_path / "test.db")) as manager:
+        manager.init_table()
+        yield manager
@@ -0,0 +1,26 @@
+"""
+自适应轮询规划器测试
+"""
+
+from utils.adaptive_polling import AdaptivePollingPlanner
+
+
+def test_small_budget_still_polls():
+    # 每个周期只有 0.25 次预算：每 4 个周期爬取一个 KOL
+    planner = AdaptivePollingPlanner(["a", "b"], budget_per_minute=0.25, tick_seconds=60)
+
+    selected = [planner.select_due(now=1000 + 60 * tick) for tick in range(9)]
+
+    assert sum(len(kols) for kols in selected) == 3
+    assert selected[0]
+
+
+def test_failed_job_waits_min_interval():
+    planner = AdaptivePollingPlanner(["a"], budget_per_minute=6, min_interval_minutes=2)
+    assert planner.select_due(now=1000) == ["a"]
+
+    # 爬取任务在产生结果前失败（如浏览器启动失败）
+    planner.record_failure(["a"], now=1000)
+
+    assert planner.select_due(now=1060) == []
+    assert planner.select_due(now=1120) == ["a"]
@@ -0,0 +1,145 @@
+"""
+DatabaseManager 测试
+"""
+
+import hashlib
+
+import pytest
+
+from conftest import make_article
+from utils.connection_manager import ConnectionManager
+from utils.database import DatabaseManager
+from utils.pipeline import create_pipeline_from_config
+
+
+def test_insert_articles_batch_counts_duplicates(db):
+    articles = [make_article(index=i) for i in range(5)]
+    # 批次内重复 + 与已入库文章重复
+    db.insert_article(articles[0])
+    batch = articles + [articles[1], articles[2]]
+
+    inserted, skipped = db.insert_articles_batch(batch)
+
+    assert (inserted, skipped) == (4, 3)
+    assert db.get_article_count() == 5
+
+
+def test_enqueue_notifications_counts_new_rows_only(db):
+    articles = [make_article(index=i) for i in range(3)]
+    assert db.enqueue_notifications(articles) == 3
+    assert db.enqueue_notifications(articles + [make_article(index=3)]) == 1
+
+
+def test_insert_articles_batch_with_search_index(db):
+    assert db._has_search_index()
+    articles = [make_article(index=i) for i in range(20)]
+
+    inserted, skipped = db.insert_articles_batch(articles + articles[:5])
+
+    assert (inserted, skipped) == (20, 5)
+    db.cursor.execute("SELECT COUNT(*) AS count FROM articles_fts")
+    assert db.cursor.fetchone()["count"] == 20
+
+
+def test_search_articles(db):
+    db.insert_articles_batch([
+        make_article(index=1, card_description="以太坊升级带动 Layer2 生态"),
+        make_article(index=2, card_description="比特币 ETF 连续三日净流入"),
+    ])
+
+    results = db.search_articles("ETF 净流入")
+    assert [r["card_description"] for r in results] == ["比特币 ETF 连续三日净流入"]
+    assert db.count_search_results("ETF 净流入") == 1
+    # trigram 分词器下少于 3 个字符的关键词退化为 LIKE 扫描
+    assert len(db.search_articles("比特")) == 1
+
+
+def test_search_uses_tokenizer_of_existing_index(tmp_path):
+    path = str(tmp_path / "search.db")
+    with DatabaseManager(path, fts_tokenizer="trigram") as manager:
+        manager.init_table()
+        manager.insert_article(make_article(card_description="比特币 ETF 连续三日净流入"))
+
+    # 配置改为 unicode61 后，已有索引仍是 trigram，短关键词应继续走 LIKE
+    with DatabaseManager(path, fts_tokenizer="unicode61") as manager:
+        manager.init_table()
+        assert manager._index_tokenizer == "trigram"
+        assert len(manager.search_articles("比特")) == 1
+
+        manager.rebuild_search_index("unicode61")
+        assert manager._index_tokenizer == "unicode61"
+
+
+def test_pipeline_config_selects_tokenizer(tmp_path):
+    config = {
+        "pipeline": {"enabled": True},
+        "database": {"db_path": str(tmp_path / "config.db"), "fts_tokenizer": "unicode61"},
+    }
+    pipeline = create_pipeline_from_config(config)
+
+    try:
+        db = ConnectionManager.get(
+            pipeline.db_path, performance_profile=False, fts_tokenizer=pipeline.fts_tokenizer
+        ).database()
+        assert db._index_tokenizer == "unicode61"
+    finally:
+        ConnectionManager.close_all_instances()
+
+
+def test_insert_articles_returning_new_raises_and_rolls_back(db):
+    # 图片列表无法序列化，整批回滚并把错误交给调用方
+    batch = [make_article(index=0), make_article(index=1, imgs={"not", "json"})]
+
+    with pytest.raises(TypeError):
+        db.insert_articles_returning_new(batch)
+
+    assert db.get_article_count() == 0
+
+
+def test_crawl_watermark_is_upserted_per_kol(db):
+    assert db.get_crawl_watermark("TestKOL") is None
+
+    db.update_crawl_watermark("TestKOL", "作者", "hash-1", "前缀一", published_at=100.0)
+    db.update_crawl_watermark("OtherKOL", "其他", "hash-x", "其他前缀")
+    db.update_crawl_watermark("TestKOL", "作者", "hash-2", "前缀二", published_at=200.0)
+
+    watermark = db.get_crawl_watermark("TestKOL")
+    assert (watermark["content_hash"], watermark["description_prefix"], watermark["published_at"]) == (
+        "hash-2", "前缀二", 200.0,
+    )
+    assert db.get_crawl_watermark("OtherKOL")["published_at"] is None
+
+
+def test_init_table_migrates_legacy_content_hashes(db):
+    def legacy_hash(article):
+        return hashlib.sha256(f"{article['author']}{article['card_description']}".encode("utf-8")).hexdigest()
+
+    multiline = make_article(index=0, card_description="比特币突破 10 万美元\n\nETF 资金持续流入")
+    # 同一篇文章被旧版本以原文和规范化后的文本各存了一份
+    flattened = make_article(index=0, card_description="比特币突破 10 万美元 ETF 资金持续流入")
+    plain = make_article(index=1)
+    for article in (multiline, flattened, plain):
+        row = list(db._article_row(article))
+        row[0] = legacy_hash(article)
+        db.conn.execute(db.INSERT_ARTICLE_SQL.format(conflict=""), row)
+        db.conn.execute(
+            "INSERT INTO notification_outbox (content_hash, author, payload) VALUES (?, ?, '{}')",
+            (row[0], article["author"]),
+        )
+    db.update_crawl_watermark("TestKOL", "TestKOL", legacy_hash(multiline), "比特币")
+    db.conn.execute("PRAGMA user_version = 0")
+    db.conn.commit()
+
+    db.init_table()
+
+    new_hash = DatabaseManager.generate_content_hash(multiline)
+    db.cursor.execute("SELECT content_hash, card_description FROM articles ORDER BY id")
+    rows = [dict(row) for row in db.cursor.fetchall()]
+    assert [row["content_hash"] for row in rows] == [new_hash, DatabaseManager.generate_content_hash(plain)]
+    # 保留原文（段落换行不丢失）
+    assert rows[0]["card_description"] == multiline["card_description"]
+    db.cursor.execute("SELECT content_hash FROM notification_outbox ORDER BY id")
+    assert [row["content_hash"] for row in db.cursor.fetchall()] == [row["content_hash"] for row in rows]
+    assert db.get_crawl_watermark("TestKOL")["content_hash"] == new_hash
+    # 迁移后重新爬到同一篇文章不会再次入库
+    assert db.insert_articles_batch([multiline, flattened]) == (0, 2)
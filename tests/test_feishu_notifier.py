@@ -0,0 +1,75 @@
+"""
+飞书通知器测试（请求发往本地 HTTP 服务）
+"""
+
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.feishu_notifier import FeishuNotifier
+
+
+@pytest.fixture
+def message_api():
+    """依次返回预设响应的假消息接口：[(状态码, Content-Type, 响应体), ...]"""
+    responses = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            status, content_type, body = responses.pop(0)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", responses
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _api_notifier(url: str) -> FeishuNotifier:
+    notifier = FeishuNotifier(receive_id="oc_test", enabled=True)
+    notifier.message_url = f"{url}/messages"
+    notifier.token_url = f"{url}/token"
+    notifier.access_token = "t-cached"
+    notifier.token_expires_at = time.monotonic() + 3600
+    return notifier
+
+
+def test_api_http_error_with_html_body_reports_status(message_api, caplog):
+    url, responses = message_api
+    responses.append((502, "text/html", b"<html>Bad Gateway</html>"))
+    notifier = _api_notifier(url)
+
+    with caplog.at_level(logging.ERROR, logger="feishu_notifier"):
+        assert notifier._send_message_via_api(json.dumps({"text": "hi"})) is False
+
+    assert "502" in caplog.text
+    notifier.close()
+
+
+def test_api_refreshes_token_on_json_error_response(message_api):
+    url, responses = message_api
+    responses.extend([
+        (400, "application/json", json.dumps({"code": 99991663, "msg": "token invalid"}).encode()),
+        (200, "application/json", json.dumps({"code": 0, "tenant_access_token": "t-new", "expire": 7200}).encode()),
+        (200, "application/json", json.dumps({"code": 0}).encode()),
+    ])
+    notifier = _api_notifier(url)
+    notifier.app_id, notifier.app_secret = "cli_test", "secret"
+
+    assert notifier._send_message_via_api(json.dumps({"text": "hi"})) is True
+    assert notifier.access_token == "t-new"
+    notifier.close()
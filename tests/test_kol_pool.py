@@ -0,0 +1,24 @@
+"""
+并发爬取池测试
+"""
+
+import pytest
+
+from utils.metrics import LAST_SUCCESS_TIMESTAMP
+
+pytest.importorskip("DrissionPage")
+
+from scrapers.kol_pool import KOLScraperPool  # noqa: E402
+
+
+def test_failed_scrape_is_not_reported_as_success():
+    # 未配置接口地址：接口模式无法爬取，不能当作"没有新文章"的成功爬取
+    pool = KOLScraperPool(scraper_kwargs={"scrape_method": "api", "save_to_db": False})
+    last_success = LAST_SUCCESS_TIMESTAMP.get()
+
+    with pool:
+        result = pool._scrape_one("TestKOL")
+
+    assert result["success"] is False
+    assert result["error"]
+    assert LAST_SUCCESS_TIMESTAMP.get() == last_success
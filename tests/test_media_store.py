@@ -0,0 +1,53 @@
+"""
+图片下载测试（图片请求发往本地替身服务器）
+"""
+
+import pytest
+
+from benchmarks.server import StandInServer
+from conftest import make_article
+from utils.connection_manager import ConnectionManager
+from utils.database import DatabaseManager
+from utils.media_store import MediaDownloader
+
+
+@pytest.fixture
+def server():
+    with StandInServer(items=[]) as stand_in:
+        yield stand_in
+
+
+def test_each_url_downloaded_once(tmp_path, server):
+    db_path = str(tmp_path / "media.db")
+    shared_url = f"{server.base_url}/img/shared.png"
+    other_url = f"{server.base_url}/img/other.png"
+    articles = [
+        make_article(index=i, imgs=[shared_url, other_url] if i % 2 else [shared_url])
+        for i in range(40)
+    ]
+
+    try:
+        db = ConnectionManager.get(db_path, performance_profile=False).database()
+        with MediaDownloader(
+            db_path=db_path, performance_profile=False, store_dir=str(tmp_path / "media"), workers=8
+        ) as downloader:
+            # 与写入流水线相同：下载器先启动，新文章入库后再提交
+            inserted = db.insert_articles_returning_new(articles, enqueue_media=True)
+            assert len(inserted) == len(articles)
+            for article in articles:
+                downloader.submit(DatabaseManager.generate_content_hash(article), article)
+            downloader.join()
+
+            # 每个 URL 只请求一次，其余引用直接复用已下载的记录
+            assert server.stats["images"] == 2
+            assert downloader.stats["downloaded"] + downloader.stats["deduplicated"] == 60
+            assert downloader.stats["failed"] == 0
+            assert downloader._url_locks == {}
+
+        media = db.get_article_media(DatabaseManager.generate_content_hash(articles[1]))
+        assert [item["url"] for item in media] == [shared_url, other_url]
+        # 两张图片内容相同，只保存一份文件
+        assert media[0]["sha256"] == media[1]["sha256"]
+        assert len(list((tmp_path / "media").rglob("*.png"))) == 1
+    finally:
+        ConnectionManager.close_all_instances()
@@ -0,0 +1,76 @@
+"""
+通知发件箱测试
+"""
+
+from conftest import make_article
+from utils.outbox import OutboxDeliveryWorker
+
+
+class FakeNotifier:
+    """记录摘要消息的假通知器"""
+
+    def __init__(self, succeed: bool = True):
+        self.succeed = succeed
+        self.digests = []
+
+    def notify_articles_digest(self, articles: list[dict]) -> bool:
+        self.digests.append(articles)
+        return self.succeed
+
+
+def _outbox_rows(db) -> list[dict]:
+    db.cursor.execute("SELECT id, status, attempts, claimed_at FROM notification_outbox ORDER BY id")
+    return [dict(row) for row in db.cursor.fetchall()]
+
+
+def test_claim_is_exclusive_until_lease_expires(db):
+    db.enqueue_notifications([make_article(index=i) for i in range(3)])
+
+    first = db.claim_due_notifications(limit=10, lease_seconds=300)
+    assert len(first) == 3
+    assert db.claim_due_notifications(limit=10, lease_seconds=300) == []
+    # 租约过期（领取进程已退出）后可被重新领取
+    assert len(db.claim_due_notifications(limit=10, lease_seconds=-1)) == 3
+
+
+def test_deliver_once_sends_digest(db):
+    db.enqueue_notifications([make_article(index=i) for i in range(3)])
+    notifier = FakeNotifier()
+    worker = OutboxDeliveryWorker(feishu_notifier=notifier, batch_size=10)
+
+    assert worker.deliver_once(db) == 3
+    assert len(notifier.digests) == 1 and len(notifier.digests[0]) == 3
+    assert {row["status"] for row in _outbox_rows(db)} == {"sent"}
+
+
+def test_failed_delivery_backs_off_then_gives_up(db):
+    db.enqueue_notifications([make_article()])
+    worker = OutboxDeliveryWorker(feishu_notifier=FakeNotifier(succeed=False), max_attempts=2)
+
+    worker.deliver_once(db)
+    row = _outbox_rows(db)[0]
+    assert (row["status"], row["attempts"]) == ("pending", 1)
+    # 退避期间不会被领取
+    assert worker.deliver_once(db) == 0
+
+    db.conn.execute("UPDATE notification_outbox SET next_attempt_at = 0")
+    worker.deliver_once(db)
+    row = _outbox_rows(db)[0]
+    assert (row["status"], row["attempts"]) == ("failed", 2)
+
+
+def test_stop_releases_claim_without_counting_attempt(db):
+    db.enqueue_notifications([make_article(index=i) for i in range(2)])
+    notifier = FakeNotifier()
+    worker = OutboxDeliveryWorker(feishu_notifier=notifier, burst=1, rate_per_second=0.001)
+    worker.rate_limiter.acquire()  # 耗尽令牌，下一次发送需要等待
+    worker._stop_event.set()
+
+    for _ in range(3):
+        assert worker.deliver_once(db) == 2
+
+    assert notifier.digests == []
+    assert [(row["status"], row["attempts"], row["claimed_at"]) for row in _outbox_rows(db)] == [
+        ("pending", 0, None),
+        ("pending", 0, None),
+    ]
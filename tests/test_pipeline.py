@@ -0,0 +1,129 @@
+"""
+写入流水线与爬取水位测试
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from conftest import make_article
+from utils.connection_manager import ConnectionManager
+from utils.database import DatabaseManager
+from utils.pipeline import ArticlePipeline
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """流水线和爬虫共用的临时数据库（测试结束后关闭共享连接）"""
+    path = str(tmp_path / "pipeline.db")
+    ConnectionManager.get(path, performance_profile=False).database().init_table()
+    yield path
+    ConnectionManager.close_all_instances()
+
+
+def _fail_inserts(monkeypatch):
+    """让批量写入抛出数据库错误（模拟磁盘已满、数据库被锁等情况）"""
+
+    def insert_articles_returning_new(self, articles, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(DatabaseManager, "insert_articles_returning_new", insert_articles_returning_new)
+
+
+def test_pipeline_resolves_futures_after_commit(db_path):
+    articles = [make_article(index=i) for i in range(5)]
+
+    with ArticlePipeline(db_path=db_path, performance_profile=False, batch_wait=0.01) as pipeline:
+        futures = [pipeline.submit(article) for article in articles + [articles[0]]]
+        pipeline.flush()
+
+        assert [future.result(timeout=5) for future in futures] == [True] * 5 + [False]
+        assert pipeline.stats["persisted"] == 5
+        assert pipeline.stats["skipped"] == 1
+        assert pipeline.stats["failed"] == 0
+
+    db = ConnectionManager.get(db_path, performance_profile=False).database()
+    assert db.get_article_count() == 5
+
+
+def test_pipeline_surfaces_failed_batches(db_path, monkeypatch):
+    _fail_inserts(monkeypatch)
+
+    with ArticlePipeline(db_path=db_path, performance_profile=False, batch_wait=0.01) as pipeline:
+        futures = [pipeline.submit(make_article(index=i)) for i in range(3)]
+        pipeline.flush()
+
+        for future in futures:
+            with pytest.raises(sqlite3.OperationalError):
+                future.result(timeout=5)
+        assert pipeline.stats["failed"] == 3
+        assert pipeline.stats["persisted"] == 0
+
+
+@pytest.fixture
+def make_scraper(db_path):
+    """创建使用写入流水线的爬虫（不启动浏览器，直接向 _process_articles 传入文章）"""
+    pytest.importorskip("DrissionPage")
+    from scrapers.binance_square import BinanceSquareScraper
+
+    scrapers = []
+
+    def factory(pipeline):
+        scraper = BinanceSquareScraper(
+            kol_username="TestKOL", db_path=db_path, pipeline=pipeline, page=object()
+        )
+        scraper._open_db()
+        scrapers.append(scraper)
+        return scraper
+
+    yield factory
+    for scraper in scrapers:
+        scraper._close_db()
+
+
+def test_watermark_advances_after_pipeline_persists(db_path, make_scraper):
+    articles = [make_article(index=i) for i in range(3)]
+
+    with ArticlePipeline(db_path=db_path, performance_profile=False, batch_wait=0.01) as pipeline:
+        scraper = make_scraper(pipeline)
+        assert scraper._process_articles(iter(articles)) == articles
+
+        watermark = scraper.db_manager.get_crawl_watermark("TestKOL")
+        assert watermark["content_hash"] == DatabaseManager.generate_content_hash(articles[0])
+        # 水位推进时文章已全部入库
+        assert scraper.db_manager.get_article_count() == 3
+
+
+def test_watermark_kept_when_pipeline_fails(db_path, make_scraper, monkeypatch):
+    _fail_inserts(monkeypatch)
+
+    with ArticlePipeline(db_path=db_path, performance_profile=False, batch_wait=0.01) as pipeline:
+        scraper = make_scraper(pipeline)
+        scraper._process_articles(iter([make_article(index=i) for i in range(3)]))
+
+        assert scraper.db_manager.get_crawl_watermark("TestKOL") is None
+
+
+def test_pipeline_fails_fast_when_database_unavailable(tmp_path, monkeypatch):
+    # 数据库路径是一个目录，入库线程无法打开数据库；连接前先等待第一篇文章提交
+    submitted = threading.Event()
+    connect = ConnectionManager.get
+
+    def get_after_submit(*args, **kwargs):
+        submitted.wait(timeout=5)
+        return connect(*args, **kwargs)
+
+    monkeypatch.setattr(ConnectionManager, "get", get_after_submit)
+
+    with ArticlePipeline(db_path=str(tmp_path), performance_profile=False, batch_wait=0.01) as pipeline:
+        future = pipeline.submit(make_article())
+        submitted.set()
+        # 入库线程仍在消费队列，flush 不会挂起
+        pipeline.flush()
+
+        with pytest.raises(sqlite3.OperationalError):
+            future.result(timeout=5)
+        assert not pipeline.running
+        with pytest.raises(RuntimeError):
+            pipeline.submit(make_article(index=1))
@@ -0,0 +1,62 @@
+"""
+卡片文本规范化测试：三种提取方式得到的同一篇文章应生成相同的内容哈希
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from scrapers.binance_api import map_feed_item
+from scrapers.binance_square import BinanceSquareScraper
+from utils.database import DatabaseManager
+from utils.text_normalizer import NORMALIZE_TEXT_JS, normalize_text
+
+SAMPLES = [
+    "  比特币突破 10 万美元\n\n ETF 资金持续流入  ",
+    "BTC 　回调​ 到支撑位...展开",
+    "以太坊升级 Layer2 生态… 查看更多",
+    "Long English post with trailing marker ... See more",
+    "emoji 🚀🚀 行情\r\n\t继续",
+    "",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_normalize_text_is_idempotent(text):
+    normalized = normalize_text(text)
+    assert normalized == normalize_text(normalized)
+    assert "\n" not in normalized and "  " not in normalized
+    assert not normalized.endswith(("展开", "查看更多", "See more"))
+
+
+def test_same_post_hashes_equal_across_extract_modes():
+    api_item = {"authorName": "TestKOL", "content": "比特币突破 10 万美元\nETF 资金持续流入", "date": 1760000000}
+    dom_text = "比特币突破 10 万美元\n\nETF 资金持续流入 ...展开"
+
+    network_article = map_feed_item(api_item)
+    js_article = BinanceSquareScraper._card_to_article(
+        {"author": "TestKOL", "card_description": dom_text, "card_title": "", "create_time": "", "imgs": []}
+    )
+    # 未经规范化的原始文本（如旧版本 dom 模式的结果）同样得到相同的哈希
+    raw_article = {"author": "TestKOL", "card_description": dom_text}
+
+    hashes = {
+        DatabaseManager.generate_content_hash(article)
+        for article in (network_article, js_article, raw_article)
+    }
+    assert len(hashes) == 1
+    # 入库的仍是原文（保留段落换行），规范化只用于比对
+    assert network_article["card_description"] == api_item["content"]
+    assert js_article["card_description"] == dom_text
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="需要 Node.js")
+def test_javascript_rules_match_python():
+    script = NORMALIZE_TEXT_JS + f"""
+    const samples = {json.dumps(SAMPLES, ensure_ascii=False)};
+    process.stdout.write(JSON.stringify(samples.map(normalizeText)));
+    """
+    output = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True).stdout
+    assert json.loads(output) == [normalize_text(text) for text in SAMPLES]
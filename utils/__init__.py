@@ -4,5 +4,6 @@ Utils package for Binance Square Scraper
 
 from .logger import setup_logger, get_logger
 from .database import DatabaseManager
+from .connection_manager import ConnectionManager
 
-__all__ = ['setup_logger', 'get_logger', 'DatabaseManager']
+__all__ = ['setup_logger', 'get_logger', 'DatabaseManager', 'ConnectionManager']
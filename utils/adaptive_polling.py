@@ -0,0 +1,233 @@
+"""
+自适应轮询模块
+根据 articles 表中每个 KOL 近期的发文频率估算发文速率，为每个 KOL 计算独立的轮询间隔：
+发文频繁的账号更频繁地爬取以降低新文章的发现延迟，长期不发文的账号降低爬取频率；
+所有 KOL 共享每分钟的全局爬取预算，预算不足时优先爬取预计积压新文章最多的 KOL
+"""
+
+import time
+
+from utils.logger import setup_logger
+from utils.metrics import REGISTRY
+
+logger = setup_logger(
+    logger_name="adaptive_polling",
+    log_file="scheduler.log",
+    log_level=20,  # logging.INFO
+)
+
+POLL_INTERVAL_SECONDS = REGISTRY.gauge(
+    "binance_scraper_poll_interval_seconds",
+    "Current adaptive polling interval per KOL",
+)
+POSTS_PER_HOUR = REGISTRY.gauge(
+    "binance_scraper_kol_posts_per_hour",
+    "Estimated posting rate per KOL used by the adaptive scheduler",
+)
+
+
+class AdaptivePollingPlanner:
+    """按发文速率为每个 KOL 安排轮询时间，并在全局预算内挑选每个调度周期要爬取的 KOL"""
+
+    def __init__(
+        self,
+        kol_usernames: list[str],
+        budget_per_minute: float = 6,
+        tick_seconds: float = 60,
+        min_interval_minutes: float = 2,
+        max_interval_minutes: float = 60,
+        target_posts_per_poll: float = 0.5,
+        rate_window_hours: float = 72,
+        burst_window_hours: float = 6,
+    ):
+        """
+        初始化自适应轮询规划器
+
+        :param kol_usernames: KOL 用户名列表
+        :param budget_per_minute: 全局爬取预算（所有 KOL 合计每分钟最多爬取的次数）
+        :param tick_seconds: 调度周期（秒），每个周期挑选一批到期的 KOL
+        :param min_interval_minutes: 单个 KOL 的最短轮询间隔（分钟）
+        :param max_interval_minutes: 单个 KOL 的最长轮询间隔（分钟），不发文的账号也至少按该间隔爬取
+        :param target_posts_per_poll: 期望每次爬取平均发现的新文章数，间隔 = 该值 / 发文速率
+        :param rate_window_hours: 估算长期发文速率的时间窗口（小时）
+        :param burst_window_hours: 估算近期发文速率的时间窗口（小时），取两者较大值以便及时跟上突发
+        """
+        self.kol_usernames = list(dict.fromkeys(kol_usernames))
+        self.budget_per_minute = budget_per_minute
+        self.tick_seconds = tick_seconds
+        self.min_interval = min_interval_minutes * 60
+        self.max_interval = max(max_interval_minutes, min_interval_minutes) * 60
+        self.target_posts_per_poll = target_posts_per_poll
+        self.rate_window = rate_window_hours * 3600
+        self.burst_window = min(burst_window_hours, rate_window_hours) * 3600
+
+        self._tokens = 0.0  # 累积的爬取预算（未用完的部分可结转，上限为两个周期的预算且至少为 1 次）
+        self._last_refill = None
+        # 每个 KOL 的状态：author、rate（篇/秒）、interval、last_polled、failed（上次爬取是否失败）、next_due
+        self.states = {
+            kol: {
+                "author": None,
+                "rate": 0.0,
+                "interval": self.min_interval,
+                "last_polled": None,
+                "failed": False,
+                "next_due": 0.0,
+            }
+            for kol in self.kol_usernames
+        }
+
+    def estimate_rate(self, db, author: str | None, now: float | None = None) -> float:
+        """
+        根据数据库中的发布时间估算作者的发文速率
+
+        :param db: DatabaseManager 实例
+        :param author: 作者（页面显示的昵称），未知时返回 0
+        :param now: 当前时间戳
+        :return: 发文速率（篇/秒）
+        """
+        if not author:
+            return 0.0
+        now = now or time.time()
+        long_count = db.count_articles_by_time_range(now - self.rate_window, author=author)
+        burst_count = db.count_articles_by_time_range(now - self.burst_window, author=author)
+        return max(long_count / self.rate_window, burst_count / self.burst_window)
+
+    def interval_for_rate(self, rate: float) -> float:
+        """
+        根据发文速率计算轮询间隔
+
+        :param rate: 发文速率（篇/秒）
+        :return: 轮询间隔（秒）
+        """
+        if rate <= 0:
+            return self.max_interval
+        return min(max(self.target_posts_per_poll / rate, self.min_interval), self.max_interval)
+
+    def refresh(self, db, kol_usernames: list[str] | None = None, now: float | None = None):
+        """
+        重新估算 KOL 的发文速率和轮询间隔（作者昵称从爬取水位中读取）
+
+        :param db: DatabaseManager 实例
+        :param kol_usernames: 需要更新的 KOL，为 None 时更新全部
+        :param now: 当前时间戳
+        """
+        now = now or time.time()
+        for kol in kol_usernames or self.kol_usernames:
+            state = self.states[kol]
+            if not state["author"]:
+                watermark = db.get_crawl_watermark(kol)
+                state["author"] = watermark.get("author") if watermark else None
+            state["rate"] = self.estimate_rate(db, state["author"], now)
+            state["interval"] = self.interval_for_rate(state["rate"])
+            self._schedule(state)
+            POLL_INTERVAL_SECONDS.set(state["interval"], kol=kol)
+            POSTS_PER_HOUR.set(round(state["rate"] * 3600, 3), kol=kol)
+
+    def _schedule(self, state: dict):
+        """根据上次爬取时间和结果计算下次爬取时间（失败时按最短间隔重试，不等待完整间隔）"""
+        if state["last_polled"] is not None:
+            delay = self.min_interval if state["failed"] else state["interval"]
+            state["next_due"] = state["last_polled"] + delay
+
+    def _priority(self, state: dict, now: float) -> float:
+        """预计积压的新文章数（发文速率 × 距上次爬取的时间），从未爬取过的 KOL 最优先"""
+        if state["last_polled"] is None:
+            return float("inf")
+        # 不发文的账号按最长间隔对应的速率计算，避免长期排在队尾
+        rate = max(state["rate"], self.target_posts_per_poll / self.max_interval)
+        return rate * (now - state["last_polled"])
+
+    def select_due(self, now: float | None = None) -> list[str]:
+        """
+        挑选本周期需要爬取的 KOL（已到期且在预算内，按积压程度排序）
+
+        :param now: 当前时间戳
+        :return: KOL 用户名列表
+        """
+        now = now or time.time()
+        per_tick = self.budget_per_minute * self.tick_seconds / 60
+        # 预算很小（每个周期不足一次爬取）时也要能攒够一次，否则永远不会爬取
+        max_tokens = max(2 * per_tick, 1)
+        if self._last_refill is None:
+            # 首个周期按完整预算计算（至少一次），启动后立即爬取
+            self._tokens = max(per_tick, 1)
+        else:
+            self._tokens = min(
+                self._tokens + self.budget_per_minute * (now - self._last_refill) / 60,
+                max_tokens,
+            )
+        self._last_refill = now
+
+        due = [kol for kol, state in self.states.items() if state["next_due"] <= now]
+        due.sort(key=lambda kol: self._priority(self.states[kol], now), reverse=True)
+        selected = due[:int(self._tokens)]
+        self._tokens -= len(selected)
+        if len(selected) < len(due):
+            logger.info(f"! 爬取预算不足，本周期推迟 {len(due) - len(selected)} 个到期的 KOL")
+        return selected
+
+    def record_results(self, results: list[dict], now: float | None = None):
+        """
+        记录一次爬取的结果（更新上次爬取时间，并从新文章中补全作者昵称）
+
+        :param results: KOLScraperPool.run 返回的结果列表
+        :param now: 当前时间戳
+        """
+        now = now or time.time()
+        for result in results:
+            state = self.states.get(result["kol_username"])
+            if state is None:
+                continue
+            state["last_polled"] = now
+            state["failed"] = not result["success"]
+            if result["new_articles"] and not state["author"]:
+                state["author"] = result["new_articles"][0].get("author")
+            self._schedule(state)
+
+    def record_failure(self, kol_usernames: list[str], now: float | None = None):
+        """
+        记录未产生结果的爬取（如浏览器启动失败），这些 KOL 按最短间隔重试
+
+        :param kol_usernames: 本周期选中的 KOL
+        :param now: 当前时间戳
+        """
+        self.record_results(
+            [{"kol_username": kol, "success": False, "new_articles": []} for kol in kol_usernames],
+            now,
+        )
+
+    def summary(self) -> list[str]:
+        """
+        当前各 KOL 的发文速率和轮询间隔（用于日志）
+
+        :return: 每个 KOL 一行的说明
+        """
+        return [
+            f"{kol}: {state['rate'] * 3600:.2f} 篇/小时, 间隔 {state['interval'] / 60:.1f} 分钟"
+            for kol, state in self.states.items()
+        ]
+
+
+# 便捷函数
+def create_polling_planner_from_config(config: dict, kol_usernames: list[str]) -> AdaptivePollingPlanner | None:
+    """
+    从配置字典创建自适应轮询规划器
+
+    :param config: 配置字典
+    :param kol_usernames: KOL 用户名列表
+    :return: AdaptivePollingPlanner 实例或 None（未启用时）
+    """
+    adaptive_config = config.get("scheduler_config", {}).get("adaptive", {})
+    if not adaptive_config.get("enabled", False):
+        return None
+
+    return AdaptivePollingPlanner(
+        kol_usernames=kol_usernames,
+        budget_per_minute=adaptive_config.get("budget_per_minute", 6),
+        tick_seconds=adaptive_config.get("tick_seconds", 60),
+        min_interval_minutes=adaptive_config.get("min_interval_minutes", 2),
+        max_interval_minutes=adaptive_config.get("max_interval_minutes", 60),
+        target_posts_per_poll=adaptive_config.get("target_posts_per_poll", 0.5),
+        rate_window_hours=adaptive_config.get("rate_window_hours", 72),
+        burst_window_hours=adaptive_config.get("burst_window_hours", 6),
+    )
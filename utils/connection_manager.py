@@ -0,0 +1,115 @@
+"""
+SQLite 长连接管理
+每个数据库文件一个管理器：每个线程持有一条复用的长连接（连接内缓存预编译语句），
+写操作共享一把进程内写锁（单写多读），建表语句每个进程只执行一次
+"""
+
+import os
+import threading
+
+from utils.database import DatabaseManager
+from utils.logger import setup_logger
+
+logger = setup_logger(
+    logger_name="connection_manager",
+    log_file="database.log",
+    log_level=20,  # logging.INFO
+)
+
+
+class ConnectionManager:
+    """按线程复用 DatabaseManager 长连接的管理器"""
+
+    _instances = {}  # (进程 ID, 数据库绝对路径) -> ConnectionManager
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path: str, performance_profile: bool = True, fts_tokenizer: str = "trigram"):
+        """
+        初始化连接管理器（请使用 ConnectionManager.get 获取共享实例）
+
+        :param db_path: 数据库文件路径
+        :param performance_profile: 是否启用性能模式（WAL 模式下读写互不阻塞）
+        :param fts_tokenizer: 新建全文索引时使用的分词器（trigram/unicode61）
+        """
+        self.db_path = db_path
+        self.performance_profile = performance_profile
+        self.fts_tokenizer = fts_tokenizer
+        self.write_lock = threading.RLock()  # 所有线程共享的写锁
+        self._local = threading.local()
+        self._schema_ready = False
+        self._managers = []  # 所有线程创建的连接，用于统一关闭
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(
+        cls, db_path: str, performance_profile: bool = True, fts_tokenizer: str = "trigram"
+    ) -> "ConnectionManager":
+        """
+        获取数据库文件对应的共享连接管理器（每个进程、每个数据库文件一个实例）
+
+        :param db_path: 数据库文件路径
+        :param performance_profile: 是否启用性能模式（仅首次创建时生效）
+        :param fts_tokenizer: 新建全文索引时使用的分词器（仅首次创建时生效，已有索引需调用 rebuild_search_index 切换）
+        :return: ConnectionManager 实例
+        """
+        key = (os.getpid(), os.path.abspath(db_path))
+        with cls._instances_lock:
+            manager = cls._instances.get(key)
+            if manager is None:
+                manager = cls(
+                    db_path, performance_profile=performance_profile, fts_tokenizer=fts_tokenizer
+                )
+                cls._instances[key] = manager
+            return manager
+
+    def database(self) -> DatabaseManager:
+        """
+        获取当前线程的 DatabaseManager（首次调用时建立长连接，之后复用）
+
+        :return: 已连接并完成建表的 DatabaseManager
+        """
+        db = getattr(self._local, "db", None)
+        if db is not None and db.conn is not None:
+            return db
+
+        db = DatabaseManager(
+            self.db_path,
+            performance_profile=self.performance_profile,
+            write_lock=self.write_lock,
+            shared=True,
+            fts_tokenizer=self.fts_tokenizer,
+        )
+        db.connect()
+
+        # 建表语句每个进程只执行一次
+        with self.write_lock:
+            if not self._schema_ready:
+                db.init_table()
+                self._schema_ready = True
+
+        self._local.db = db
+        with self._lock:
+            self._managers.append(db)
+        logger.info(f"✓ 线程 {threading.current_thread().name} 已建立数据库长连接")
+        return db
+
+    def close_all(self):
+        """关闭所有线程的长连接"""
+        with self._lock:
+            managers, self._managers = self._managers, []
+        for db in managers:
+            try:
+                db.close(force=True)
+            except Exception as e:
+                logger.warning(f"! 关闭数据库连接失败: {str(e)}")
+        self._local = threading.local()
+
+    @classmethod
+    def close_all_instances(cls):
+        """关闭当前进程中所有连接管理器的连接"""
+        with cls._instances_lock:
+            managers = [
+                manager for (pid, _), manager in cls._instances.items() if pid == os.getpid()
+            ]
+        for manager in managers:
+            manager.close_all()
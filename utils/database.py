@@ -5,11 +5,16 @@
 
 import hashlib
 import json
+import re
 import sqlite3
+import threading
+import time
 from datetime import datetime
 from typing import Any, Optional
 
 from utils.logger import setup_logger
+from utils.text_normalizer import normalize_text
+from utils.time_parser import parse_display_time, parse_scraped_at
 
 logger = setup_logger(
     logger_name="database",
@@ -21,31 +26,98 @@ logger = setup_logger(
 class DatabaseManager:
     """数据库管理类，封装所有数据库操作"""
 
-    def __init__(self, db_path: str = "binance_square.db"):
+    # 性能模式下使用的 PRAGMA（WAL 日志 + 降低同步级别 + 内存映射 + 更大的页缓存）
+    PERFORMANCE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,  # 256MB
+        "cache_size": -65536,  # 负数表示 KB，即 64MB
+        "temp_store": "MEMORY",
+    }
+
+    # 插入文章的 SQL（批量插入时使用 OR IGNORE 跳过重复）
+    INSERT_ARTICLE_SQL = """
+        INSERT {conflict}INTO articles
+        (content_hash, author, card_title, card_description, create_time, imgs, published_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+
+    # 全文索引可选的分词器：trigram 按三字切分，适合中文等无空格分词的文本；
+    # unicode61 按空格和标点切分，索引更小，适合英文
+    FTS_TOKENIZERS = {
+        "trigram": "trigram",
+        "unicode61": "unicode61 remove_diacritics 2",
+    }
+
+    # 内容哈希算法版本（记录在 PRAGMA user_version 中）：
+    # 1 - 哈希前规范化内容文本（见 utils.text_normalizer），旧数据库需重新计算已有文章的哈希
+    CONTENT_HASH_VERSION = 1
+
+    def __init__(
+        self,
+        db_path: str = "binance_square.db",
+        performance_profile: bool = False,
+        write_lock=None,
+        shared: bool = False,
+        fts_tokenizer: str = "trigram",
+    ):
         """
         初始化数据库管理器
 
         :param db_path: 数据库文件路径
+        :param performance_profile: 是否启用性能模式（WAL、synchronous=NORMAL、mmap 等）
+        :param write_lock: 写操作使用的锁（多个连接共享同一把锁时写入串行化）
+        :param shared: 是否为 ConnectionManager 管理的长连接（close() 不会真正关闭）
+        :param fts_tokenizer: 新建全文索引时使用的分词器（trigram/unicode61）
         """
         self.db_path = db_path
+        self.performance_profile = performance_profile
+        self.write_lock = write_lock or threading.RLock()
+        self.shared = shared
+        self.fts_tokenizer = fts_tokenizer
+        self._fts_available = None
+        self._index_tokenizer = None  # 现有全文索引实际使用的分词器（可能与 fts_tokenizer 配置不同）
         self.conn: Optional[sqlite3.Connection] = None
         self.cursor: Optional[sqlite3.Cursor] = None
 
     def connect(self):
         """连接到数据库"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            # 共享长连接由 ConnectionManager 保证只在所属线程中使用，关闭时可能跨线程
+            self.conn = sqlite3.connect(
+                self.db_path,
+                timeout=30,
+                cached_statements=256,
+                check_same_thread=not self.shared,
+            )
             self.conn.row_factory = sqlite3.Row  # 使查询结果可以通过列名访问
             self.cursor = self.conn.cursor()
+            if self.performance_profile:
+                self._apply_performance_pragmas()
             logger.info(f"✓ 成功连接到数据库: {self.db_path}")
         except Exception as e:
             logger.error(f"× 连接数据库失败: {str(e)}")
             raise
 
-    def close(self):
-        """关闭数据库连接"""
+    def _apply_performance_pragmas(self):
+        """应用性能模式的 PRAGMA 设置"""
+        for name, value in self.PERFORMANCE_PRAGMAS.items():
+            self.cursor.execute(f"PRAGMA {name} = {value}")
+        logger.info(f"✓ 已启用数据库性能模式: {self.PERFORMANCE_PRAGMAS}")
+
+    def close(self, force: bool = False):
+        """
+        关闭数据库连接
+
+        :param force: 是否强制关闭共享长连接
+        """
+        if self.shared and not force:
+            # 共享长连接由 ConnectionManager 统一关闭
+            return
         if self.conn:
             self.conn.close()
+            self.conn = None
+            self.cursor = None
             logger.info("✓ 数据库连接已关闭")
 
     def init_table(self):
@@ -62,10 +134,14 @@ class DatabaseManager:
                     create_time TEXT,
                     imgs TEXT,
                     scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    published_at REAL
                 )
             """)
 
+            # 旧版本数据库没有 published_at 列，补列并回填
+            self._migrate_published_at()
+
             # 创建索引以提高查询性能
             self.cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_content_hash
@@ -82,13 +158,471 @@ class DatabaseManager:
                 ON articles(create_time)
             """)
 
+            # 按作者 + 发布时间排序和范围查询
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_author_published_at
+                ON articles(author, published_at)
+            """)
+
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_published_at
+                ON articles(published_at)
+            """)
+
+            # 创建通知发件箱表（与文章在同一事务中写入，保证通知不丢失）
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS notification_outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    content_hash TEXT UNIQUE NOT NULL,
+                    author TEXT,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    claimed_at REAL,
+                    last_error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    sent_at TIMESTAMP
+                )
+            """)
+
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_outbox_status_next_attempt
+                ON notification_outbox(status, next_attempt_at)
+            """)
+
+            # 创建爬取水位表（每个 KOL 最近一次爬到的最新文章，用于增量爬取时提前停止）
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS crawl_watermarks (
+                    kol_username TEXT PRIMARY KEY,
+                    author TEXT,
+                    content_hash TEXT NOT NULL,
+                    description_prefix TEXT,
+                    published_at REAL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # 创建导出标记表（记录每个导出任务已导出到的文章 ID，用于增量导出）
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS export_markers (
+                    name TEXT PRIMARY KEY,
+                    last_id INTEGER NOT NULL DEFAULT 0,
+                    file_path TEXT,
+                    row_count INTEGER NOT NULL DEFAULT 0,
+                    exported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # 创建媒体文件表（按内容 SHA-256 寻址，跨文章、跨 KOL 去重）
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS media (
+                    sha256 TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_type TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # 创建文章与图片的关联表（status: pending/done/failed）
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS article_media (
+                    content_hash TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    url TEXT NOT NULL,
+                    sha256 TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (content_hash, position)
+                )
+            """)
+
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_article_media_url
+                ON article_media(url)
+            """)
+
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_article_media_status
+                ON article_media(status)
+            """)
+
             self.conn.commit()
+            self._init_search_index()
+            self._migrate_content_hash()
             logger.info("✓ 数据库表初始化成功")
 
         except Exception as e:
             logger.error(f"× 初始化数据库表失败: {str(e)}")
             raise
 
+    def _migrate_published_at(self):
+        """为旧版本数据库添加 published_at 列，并根据 create_time 和 scraped_at 回填"""
+        self.cursor.execute("PRAGMA table_info(articles)")
+        columns = {row["name"] for row in self.cursor.fetchall()}
+        if "published_at" in columns:
+            return
+
+        self.cursor.execute("ALTER TABLE articles ADD COLUMN published_at REAL")
+        self.conn.commit()
+        logger.info("✓ 已添加 published_at 列，开始回填发布时间")
+        self.backfill_published_at()
+
+    def _migrate_content_hash(self):
+        """
+        按当前哈希算法重新计算旧版本数据库中文章的内容哈希
+        同一篇文章在不同提取方式下入库的多条记录哈希相同时合并为一条（保留最早入库的原文），
+        发件箱、图片关联和爬取水位中的哈希一并更新，避免升级后重复入库和重复通知
+        """
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= self.CONTENT_HASH_VERSION:
+            return
+
+        changes = []
+        for row in self.conn.execute(
+            "SELECT id, content_hash, author, card_description FROM articles ORDER BY id"
+        ):
+            content_hash = self.generate_content_hash(dict(row))
+            if content_hash != row["content_hash"]:
+                changes.append((row["id"], row["content_hash"], content_hash))
+
+        merged = 0
+        with self.write_lock:
+            with self.conn:
+                for article_id, old_hash, new_hash in changes:
+                    existing = self.conn.execute(
+                        "SELECT id FROM articles WHERE content_hash = ?", (new_hash,)
+                    ).fetchone()
+                    if existing and existing["id"] < article_id:
+                        self.conn.execute("DELETE FROM articles WHERE id = ?", (article_id,))
+                    else:
+                        if existing:
+                            self.conn.execute("DELETE FROM articles WHERE id = ?", (existing["id"],))
+                        self.conn.execute(
+                            "UPDATE articles SET content_hash = ? WHERE id = ?",
+                            (new_hash, article_id),
+                        )
+                    merged += bool(existing)
+                    # 合并后的文章已有的发件箱和图片记录优先保留
+                    for table in ("notification_outbox", "article_media"):
+                        self.conn.execute(
+                            f"UPDATE OR IGNORE {table} SET content_hash = ? WHERE content_hash = ?",
+                            (new_hash, old_hash),
+                        )
+                        self.conn.execute(f"DELETE FROM {table} WHERE content_hash = ?", (old_hash,))
+                    self.conn.execute(
+                        "UPDATE crawl_watermarks SET content_hash = ? WHERE content_hash = ?",
+                        (new_hash, old_hash),
+                    )
+                self.conn.execute(f"PRAGMA user_version = {self.CONTENT_HASH_VERSION}")
+
+        if changes:
+            logger.info(
+                f"✓ 已重新计算 {len(changes)} 篇文章的内容哈希，合并重复文章 {merged} 篇"
+            )
+
+    def backfill_published_at(self, batch_size: int = 1000) -> int:
+        """
+        为 published_at 为空的文章回填发布时间
+        （以 scraped_at 为基准解析 create_time，无法解析时使用 scraped_at）
+
+        :param batch_size: 每个事务更新的文章数
+        :return: 回填的文章数量
+        """
+        total = 0
+        last_id = 0
+        while True:
+            rows = self.conn.execute(
+                """
+                SELECT id, create_time, scraped_at FROM articles
+                WHERE id > ? AND published_at IS NULL
+                ORDER BY id
+                LIMIT ?
+                """,
+                (last_id, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+
+            updates = []
+            for row in rows:
+                scraped_at = parse_scraped_at(row["scraped_at"])
+                published_at = parse_display_time(row["create_time"], scraped_at)
+                updates.append((published_at or scraped_at.timestamp(), row["id"]))
+
+            with self.write_lock:
+                with self.conn:
+                    self.conn.executemany(
+                        "UPDATE articles SET published_at = ? WHERE id = ?", updates
+                    )
+            total += len(updates)
+            last_id = rows[-1]["id"]
+
+        if total:
+            logger.info(f"✓ 已回填 {total} 篇文章的发布时间")
+        return total
+
+    def _init_search_index(self, tokenizer: Optional[str] = None):
+        """
+        创建文章全文索引（FTS5 外部内容表，由触发器与 articles 表保持同步）
+        索引新建时会为已有文章补建索引；SQLite 未编译 FTS5 时搜索退化为 LIKE 扫描
+
+        :param tokenizer: 分词器名称（默认使用 self.fts_tokenizer）
+        """
+        tokenizer = tokenizer or self.fts_tokenizer
+        if tokenizer not in self.FTS_TOKENIZERS:
+            raise ValueError(f"不支持的分词器: {tokenizer}，可选: {', '.join(self.FTS_TOKENIZERS)}")
+
+        exists = self._load_search_index_info()
+        if exists and self._index_tokenizer != tokenizer:
+            logger.warning(
+                f"! 现有全文索引使用 {self._index_tokenizer} 分词器（配置为 {tokenizer}），"
+                f"如需切换请调用 rebuild_search_index()"
+            )
+
+        try:
+            with self.conn:
+                self.conn.execute(f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                        card_title,
+                        card_description,
+                        content='articles',
+                        content_rowid='id',
+                        tokenize='{self.FTS_TOKENIZERS[tokenizer]}'
+                    )
+                """)
+
+                self.conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+                        INSERT INTO articles_fts (rowid, card_title, card_description)
+                        VALUES (new.id, new.card_title, new.card_description);
+                    END
+                """)
+
+                self.conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+                        INSERT INTO articles_fts (articles_fts, rowid, card_title, card_description)
+                        VALUES ('delete', old.id, old.card_title, old.card_description);
+                    END
+                """)
+
+                self.conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS articles_fts_au
+                    AFTER UPDATE OF card_title, card_description ON articles BEGIN
+                        INSERT INTO articles_fts (articles_fts, rowid, card_title, card_description)
+                        VALUES ('delete', old.id, old.card_title, old.card_description);
+                        INSERT INTO articles_fts (rowid, card_title, card_description)
+                        VALUES (new.id, new.card_title, new.card_description);
+                    END
+                """)
+
+                if not exists:
+                    # 为建索引前已入库的文章补建索引
+                    self.conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+                    logger.info(f"✓ 已创建全文索引 (分词器: {tokenizer})")
+
+            self._load_search_index_info()
+
+        except sqlite3.OperationalError as e:
+            self._fts_available = False
+            logger.warning(f"! 全文索引不可用（SQLite 可能未启用 FTS5），搜索将使用 LIKE 扫描: {str(e)}")
+
+    def rebuild_search_index(self, tokenizer: Optional[str] = None):
+        """
+        重建全文索引（可同时切换分词器）
+
+        :param tokenizer: 新的分词器名称（trigram/unicode61），为 None 时沿用当前设置
+        """
+        if tokenizer:
+            self.fts_tokenizer = tokenizer
+        with self.write_lock:
+            with self.conn:
+                self.conn.execute("DROP TABLE IF EXISTS articles_fts")
+                for trigger in ("articles_fts_ai", "articles_fts_ad", "articles_fts_au"):
+                    self.conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            self._init_search_index()
+
+    def _load_search_index_info(self) -> bool:
+        """
+        从 sqlite_master 读取全文索引是否存在及其建表时使用的分词器
+
+        :return: 全文索引是否存在
+        """
+        self.cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+        )
+        row = self.cursor.fetchone()
+        self._fts_available = row is not None
+        self._index_tokenizer = None
+        if row is not None:
+            match = re.search(r"tokenize\s*=\s*['\"]?(\w+)", row["sql"] or "")
+            # FTS5 未指定分词器时默认使用 unicode61
+            self._index_tokenizer = match.group(1) if match else "unicode61"
+        return self._fts_available
+
+    def _has_search_index(self) -> bool:
+        """全文索引是否可用（由其他连接建表时首次使用前检查一次）"""
+        if self._fts_available is None:
+            self._load_search_index_info()
+        return self._fts_available
+
+    def _use_like_search(self, terms: list[str]) -> bool:
+        """
+        是否需要退化为 LIKE 扫描（全文索引不可用，或 trigram 分词器下存在少于 3 个字符的关键词）
+
+        :param terms: 关键词列表
+        :return: 是否使用 LIKE 扫描
+        """
+        if not self._has_search_index():
+            return True
+        return self._index_tokenizer == "trigram" and any(len(term) < 3 for term in terms)
+
+    @staticmethod
+    def _like_conditions(terms: list[str], author: Optional[str]) -> tuple[str, list]:
+        """
+        构造 LIKE 扫描的 WHERE 条件
+
+        :param terms: 关键词列表
+        :param author: 只搜索指定作者的文章
+        :return: (WHERE 条件, 参数列表)
+        """
+        conditions = []
+        params = []
+        for term in terms:
+            pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            conditions.append(
+                "(card_title LIKE ? ESCAPE '\\' OR card_description LIKE ? ESCAPE '\\')"
+            )
+            params.extend([pattern, pattern])
+        if author is not None:
+            conditions.append("author = ?")
+            params.append(author)
+        return " AND ".join(conditions), params
+
+    @staticmethod
+    def _build_match_query(query: str) -> str:
+        """
+        将用户输入转换为 FTS5 查询：按空白拆分为多个短语，全部命中才返回（AND）
+
+        :param query: 用户输入的关键词
+        :return: FTS5 MATCH 表达式
+        """
+        terms = query.split()
+        return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+    def search_articles(
+        self,
+        query: str,
+        author: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        raw_query: bool = False,
+    ) -> list[dict]:
+        """
+        全文搜索文章，按相关度（BM25，标题权重更高）排序
+
+        :param query: 关键词（多个关键词用空格分隔，需全部命中）
+        :param author: 只搜索指定作者的文章
+        :param limit: 每页数量
+        :param offset: 偏移量（分页）
+        :param raw_query: 是否将 query 作为 FTS5 查询语法直接使用（支持 OR、NOT、前缀等）
+        :return: 文章列表（额外包含 rank 和高亮片段 snippet）
+        """
+        terms = query.split()
+        if not terms:
+            return []
+        if not raw_query and self._use_like_search(terms):
+            return self._search_articles_like(terms, author, limit, offset)
+
+        match_query = query if raw_query else self._build_match_query(query)
+        sql = """
+            SELECT a.*,
+                   bm25(articles_fts, 2.0, 1.0) AS rank,
+                   snippet(articles_fts, 1, '[', ']', '...', 16) AS snippet
+            FROM articles_fts
+            JOIN articles a ON a.id = articles_fts.rowid
+            WHERE articles_fts MATCH ?
+        """
+        params = [match_query]
+        if author is not None:
+            sql += " AND a.author = ?"
+            params.append(author)
+        sql += " ORDER BY rank LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        try:
+            self.cursor.execute(sql, params)
+            return [dict(row) for row in self.cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"× 全文搜索失败: {str(e)}")
+            return []
+
+    def _search_articles_like(
+        self, terms: list[str], author: Optional[str], limit: int, offset: int
+    ) -> list[dict]:
+        """
+        使用 LIKE 扫描搜索文章（全文索引不可用或关键词过短时使用），按时间倒序
+
+        :param terms: 关键词列表
+        :param author: 只搜索指定作者的文章
+        :param limit: 每页数量
+        :param offset: 偏移量
+        :return: 文章列表
+        """
+        where, params = self._like_conditions(terms, author)
+        params.extend([limit, offset])
+
+        try:
+            self.cursor.execute(
+                f"""
+                SELECT *, NULL AS rank, NULL AS snippet FROM articles
+                WHERE {where}
+                ORDER BY id DESC
+                LIMIT ? OFFSET ?
+                """,
+                params,
+            )
+            return [dict(row) for row in self.cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"× 搜索文章失败: {str(e)}")
+            return []
+
+    def count_search_results(self, query: str, author: Optional[str] = None) -> int:
+        """
+        统计全文搜索的命中数量（用于分页）
+
+        :param query: 关键词（多个关键词用空格分隔）
+        :param author: 只统计指定作者的文章
+        :return: 命中数量
+        """
+        terms = query.split()
+        if not terms:
+            return 0
+        if self._use_like_search(terms):
+            where, params = self._like_conditions(terms, author)
+            self.cursor.execute(f"SELECT COUNT(*) AS count FROM articles WHERE {where}", params)
+            return self.cursor.fetchone()["count"]
+
+        sql = """
+            SELECT COUNT(*) AS count FROM articles_fts
+            JOIN articles a ON a.id = articles_fts.rowid
+            WHERE articles_fts MATCH ?
+        """
+        params = [self._build_match_query(query)]
+        if author is not None:
+            sql += " AND a.author = ?"
+            params.append(author)
+
+        try:
+            self.cursor.execute(sql, params)
+            return self.cursor.fetchone()["count"]
+        except Exception as e:
+            logger.error(f"× 统计搜索结果失败: {str(e)}")
+            return 0
+
     @staticmethod
     def generate_content_hash(article: dict) -> str:
         """
@@ -98,13 +632,32 @@ class DatabaseManager:
         :param article: 文章字典
         :return: SHA256 哈希值
         """
-        # 组合多个字段来生成唯一标识
+        # 组合多个字段来生成唯一标识（内容先规范化，不同提取方式得到的同一篇文章哈希一致）
         unique_string = (
             f"{article.get('author', '')}"
-            f"{article.get('card_description', '')}"
+            f"{normalize_text(article.get('card_description', ''))}"
         )
         return hashlib.sha256(unique_string.encode("utf-8")).hexdigest()
 
+    def _article_row(self, article: dict) -> tuple:
+        """
+        将文章字典转换为插入用的参数元组
+
+        :param article: 文章字典
+        :return: (content_hash, author, card_title, card_description, create_time, imgs, published_at)
+        """
+        return (
+            self.generate_content_hash(article),
+            article.get("author", ""),
+            article.get("card_title", ""),
+            article.get("card_description", ""),
+            article.get("create-time", ""),
+            # 将图片列表转换为 JSON 字符串
+            json.dumps(article.get("imgs", []), ensure_ascii=False),
+            # 以当前时间为基准解析页面显示的发布时间，无法解析时使用当前时间
+            parse_display_time(article.get("create-time", "")) or time.time(),
+        )
+
     def insert_article(self, article: dict) -> bool:
         """
         插入单篇文章到数据库
@@ -113,30 +666,13 @@ class DatabaseManager:
         :return: 是否插入成功
         """
         try:
-            # 生成内容哈希
-            content_hash = self.generate_content_hash(article)
-
-            # 将图片列表转换为 JSON 字符串
-            imgs_json = json.dumps(article.get("imgs", []), ensure_ascii=False)
+            row = self._article_row(article)
+            content_hash = row[0]
 
             # 插入数据
-            self.cursor.execute(
-                """
-                INSERT INTO articles
-                (content_hash, author, card_title, card_description, create_time, imgs)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    content_hash,
-                    article.get("author", ""),
-                    article.get("card_title", ""),
-                    article.get("card_description", ""),
-                    article.get("create-time", ""),
-                    imgs_json,
-                ),
-            )
-
-            self.conn.commit()
+            with self.write_lock:
+                self.cursor.execute(self.INSERT_ARTICLE_SQL.format(conflict=""), row)
+                self.conn.commit()
             logger.info(f"✓ 成功插入文章: {content_hash[:16]}...")
             return True
 
@@ -155,21 +691,26 @@ class DatabaseManager:
         :param articles: 文章列表
         :return: (成功插入数量, 跳过数量)
         """
-        inserted_count = 0
-        skipped_count = 0
-
         logger.info(f"\n{'='*60}")
         logger.info(f"开始批量插入 {len(articles)} 篇文章")
         logger.info(f"{'='*60}")
 
-        for idx, article in enumerate(articles, 1):
-            if self.insert_article(article):
-                inserted_count += 1
-            else:
-                skipped_count += 1
+        rows = [self._article_row(article) for article in articles]
 
-            if idx % 10 == 0:
-                logger.info(f"进度: {idx}/{len(articles)}")
+        try:
+            with self.write_lock:
+                # 整批在一个事务中提交，只产生一次 fsync
+                with self.conn:
+                    cursor = self.conn.executemany(
+                        self.INSERT_ARTICLE_SQL.format(conflict="OR IGNORE "), rows
+                    )
+                # rowcount 只统计本语句插入的行：被 OR IGNORE 跳过的行和触发器写入的行均不计入
+                inserted_count = cursor.rowcount
+        except Exception as e:
+            logger.error(f"× 批量插入文章失败，已回滚: {str(e)}")
+            return 0, 0
+
+        skipped_count = len(rows) - inserted_count
 
         logger.info(f"\n{'='*60}")
         logger.info(f"批量插入完成")
@@ -179,6 +720,360 @@ class DatabaseManager:
 
         return inserted_count, skipped_count
 
+    def insert_articles_returning_new(
+        self,
+        articles: list[dict],
+        enqueue_notifications: bool = False,
+        enqueue_media: bool = False,
+    ) -> list[dict]:
+        """
+        在一个事务中批量插入文章，并返回真正插入成功（非重复）的文章
+
+        :param articles: 文章列表
+        :param enqueue_notifications: 是否在同一事务中为新文章写入通知发件箱
+        :param enqueue_media: 是否在同一事务中为新文章的图片写入待下载记录
+        :return: 插入成功的文章列表（写入失败时整批回滚并抛出异常，由调用方处理）
+        """
+        inserted = []
+        sql = self.INSERT_ARTICLE_SQL.format(conflict="OR IGNORE ")
+
+        try:
+            with self.write_lock:
+                with self.conn:
+                    for article in articles:
+                        row = self._article_row(article)
+                        self.cursor.execute(sql, row)
+                        if self.cursor.rowcount > 0:
+                            inserted.append(article)
+                            if enqueue_notifications:
+                                self._enqueue_notification(article, row[0])
+                            if enqueue_media:
+                                self._enqueue_media(article, row[0])
+        except Exception as e:
+            logger.error(f"× 批量插入文章失败，已回滚: {str(e)}")
+            raise
+
+        logger.info(
+            f"✓ 批量写入 {len(articles)} 篇文章: 新增 {len(inserted)} 篇, "
+            f"跳过重复 {len(articles) - len(inserted)} 篇"
+        )
+        return inserted
+
+    def _enqueue_notification(self, article: dict, content_hash: str):
+        """
+        写入一条待发送的通知（不提交事务，由调用方负责）
+
+        :param article: 文章字典
+        :param content_hash: 文章内容哈希
+        """
+        self.cursor.execute(
+            """
+            INSERT OR IGNORE INTO notification_outbox (content_hash, author, payload)
+            VALUES (?, ?, ?)
+            """,
+            (content_hash, article.get("author", ""), json.dumps(article, ensure_ascii=False)),
+        )
+
+    def enqueue_notifications(self, articles: list[dict]) -> int:
+        """
+        批量写入待发送的通知
+
+        :param articles: 文章列表
+        :return: 新写入的通知数量
+        """
+        try:
+            with self.write_lock:
+                enqueued = 0
+                with self.conn:
+                    for article in articles:
+                        self._enqueue_notification(article, self.generate_content_hash(article))
+                        enqueued += max(self.cursor.rowcount, 0)
+                return enqueued
+        except Exception as e:
+            logger.error(f"× 写入通知发件箱失败: {str(e)}")
+            return 0
+
+    def claim_due_notifications(self, limit: int = 10, lease_seconds: float = 300) -> list[dict]:
+        """
+        领取到期的待发送通知（标记为 sending，多个进程同时领取时不会重复）
+        超过租约时间仍处于 sending 状态的通知视为发送进程已退出，可被重新领取
+
+        :param limit: 最多领取数量
+        :param lease_seconds: 领取租约时间（秒）
+        :return: 通知列表（包含 id、attempts 和解析后的 article）
+        """
+        now = time.time()
+        try:
+            with self.write_lock:
+                with self.conn:
+                    rows = self.conn.execute(
+                        """
+                        UPDATE notification_outbox
+                        SET status = 'sending', claimed_at = ?
+                        WHERE id IN (
+                            SELECT id FROM notification_outbox
+                            WHERE (status = 'pending' AND next_attempt_at <= ?)
+                               OR (status = 'sending' AND claimed_at < ?)
+                            ORDER BY id
+                            LIMIT ?
+                        )
+                        RETURNING id, attempts, payload
+                        """,
+                        (now, now, now - lease_seconds, limit),
+                    ).fetchall()
+        except Exception as e:
+            logger.error(f"× 领取待发送通知失败: {str(e)}")
+            return []
+
+        return sorted(
+            (
+                {"id": row["id"], "attempts": row["attempts"], "article": json.loads(row["payload"])}
+                for row in rows
+            ),
+            key=lambda item: item["id"],
+        )
+
+    def mark_notifications_sent(self, ids: list[int]):
+        """
+        将通知标记为已发送
+
+        :param ids: 通知 ID 列表
+        """
+        with self.write_lock:
+            with self.conn:
+                self.conn.executemany(
+                    """
+                    UPDATE notification_outbox
+                    SET status = 'sent', sent_at = CURRENT_TIMESTAMP, last_error = NULL
+                    WHERE id = ?
+                    """,
+                    [(notification_id,) for notification_id in ids],
+                )
+
+    def release_notifications(self, ids: list[int]):
+        """
+        释放已领取但未尝试发送的通知（恢复为待发送，不计入发送次数）
+
+        :param ids: 通知 ID 列表
+        """
+        with self.write_lock:
+            with self.conn:
+                self.conn.executemany(
+                    """
+                    UPDATE notification_outbox
+                    SET status = 'pending', claimed_at = NULL
+                    WHERE id = ? AND status = 'sending'
+                    """,
+                    [(notification_id,) for notification_id in ids],
+                )
+
+    def mark_notifications_failed(
+        self, ids: list[int], error: str, next_attempt_at: float, give_up: bool = False
+    ):
+        """
+        记录通知发送失败，等待下次重试（或放弃）
+
+        :param ids: 通知 ID 列表
+        :param error: 错误信息
+        :param next_attempt_at: 下次重试的时间戳
+        :param give_up: 是否放弃重试（标记为 failed）
+        """
+        with self.write_lock:
+            with self.conn:
+                self.conn.executemany(
+                    """
+                    UPDATE notification_outbox
+                    SET status = ?, attempts = attempts + 1, next_attempt_at = ?,
+                        last_error = ?, claimed_at = NULL
+                    WHERE id = ?
+                    """,
+                    [
+                        ("failed" if give_up else "pending", next_attempt_at, error, notification_id)
+                        for notification_id in ids
+                    ],
+                )
+
+    def _enqueue_media(self, article: dict, content_hash: str):
+        """
+        为文章的图片写入待下载记录（不提交事务，由调用方负责）
+
+        :param article: 文章字典
+        :param content_hash: 文章内容哈希
+        """
+        self.cursor.executemany(
+            """
+            INSERT OR IGNORE INTO article_media (content_hash, position, url)
+            VALUES (?, ?, ?)
+            """,
+            [
+                (content_hash, position, url)
+                for position, url in enumerate(article.get("imgs", []))
+                if url
+            ],
+        )
+
+    def get_pending_media(self, limit: int = 1000, max_attempts: int = 3) -> list[dict]:
+        """
+        获取尚未下载完成的图片记录
+
+        :param limit: 最多返回数量
+        :param max_attempts: 失败次数达到该值的记录不再返回
+        :return: 记录列表（content_hash、position、url）
+        """
+        self.cursor.execute(
+            """
+            SELECT content_hash, position, url FROM article_media
+            WHERE status != 'done' AND attempts < ?
+            LIMIT ?
+            """,
+            (max_attempts, limit),
+        )
+        return [dict(row) for row in self.cursor.fetchall()]
+
+    def get_media_sha256_by_url(self, url: str) -> Optional[str]:
+        """
+        查询已下载过的图片 URL 对应的媒体哈希（同一 URL 无需重复下载）
+
+        :param url: 图片 URL
+        :return: 媒体 SHA-256 或 None
+        """
+        self.cursor.execute(
+            """
+            SELECT sha256 FROM article_media
+            WHERE url = ? AND status = 'done'
+            LIMIT 1
+            """,
+            (url,),
+        )
+        row = self.cursor.fetchone()
+        return row["sha256"] if row else None
+
+    def link_article_media(
+        self,
+        content_hash: str,
+        position: int,
+        sha256: str,
+        path: str = None,
+        size: int = 0,
+        content_type: str = None,
+    ):
+        """
+        记录图片下载完成，并关联到媒体文件
+
+        :param content_hash: 文章内容哈希
+        :param position: 图片在文章中的序号
+        :param sha256: 媒体内容 SHA-256
+        :param path: 媒体文件路径（为 None 时表示媒体记录已存在）
+        :param size: 文件大小（字节）
+        :param content_type: 文件 MIME 类型
+        """
+        with self.write_lock:
+            with self.conn:
+                if path is not None:
+                    self.conn.execute(
+                        """
+                        INSERT OR IGNORE INTO media (sha256, path, size, content_type)
+                        VALUES (?, ?, ?, ?)
+                        """,
+                        (sha256, path, size, content_type),
+                    )
+                self.conn.execute(
+                    """
+                    UPDATE article_media
+                    SET sha256 = ?, status = 'done', last_error = NULL,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE content_hash = ? AND position = ?
+                    """,
+                    (sha256, content_hash, position),
+                )
+
+    def mark_article_media_failed(self, content_hash: str, position: int, error: str):
+        """
+        记录图片下载失败
+
+        :param content_hash: 文章内容哈希
+        :param position: 图片在文章中的序号
+        :param error: 错误信息
+        """
+        with self.write_lock:
+            with self.conn:
+                self.conn.execute(
+                    """
+                    UPDATE article_media
+                    SET status = 'failed', attempts = attempts + 1, last_error = ?,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE content_hash = ? AND position = ?
+                    """,
+                    (error, content_hash, position),
+                )
+
+    def get_article_media(self, content_hash: str) -> list[dict]:
+        """
+        获取文章已下载的图片
+
+        :param content_hash: 文章内容哈希
+        :return: 图片列表（position、url、sha256、path、size、content_type）
+        """
+        self.cursor.execute(
+            """
+            SELECT am.position, am.url, m.sha256, m.path, m.size, m.content_type
+            FROM article_media am
+            JOIN media m ON m.sha256 = am.sha256
+            WHERE am.content_hash = ? AND am.status = 'done'
+            ORDER BY am.position
+            """,
+            (content_hash,),
+        )
+        return [dict(row) for row in self.cursor.fetchall()]
+
+    def get_crawl_watermark(self, kol_username: str) -> Optional[dict]:
+        """
+        获取 KOL 的爬取水位
+
+        :param kol_username: KOL 用户名
+        :return: 水位字典（author、content_hash、description_prefix、published_at）或 None
+        """
+        self.cursor.execute(
+            "SELECT * FROM crawl_watermarks WHERE kol_username = ?",
+            (kol_username,),
+        )
+        row = self.cursor.fetchone()
+        return dict(row) if row else None
+
+    def update_crawl_watermark(
+        self,
+        kol_username: str,
+        author: str,
+        content_hash: str,
+        description_prefix: str,
+        published_at: Optional[float] = None,
+    ):
+        """
+        更新 KOL 的爬取水位
+
+        :param kol_username: KOL 用户名
+        :param author: 文章作者（页面显示的昵称）
+        :param content_hash: 最新文章的内容哈希
+        :param description_prefix: 最新文章内容的前缀（用于在完整解析前快速比对）
+        :param published_at: 最新文章的发布时间
+        """
+        with self.write_lock:
+            with self.conn:
+                self.conn.execute(
+                    """
+                    INSERT INTO crawl_watermarks
+                    (kol_username, author, content_hash, description_prefix, published_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(kol_username) DO UPDATE SET
+                        author = excluded.author,
+                        content_hash = excluded.content_hash,
+                        description_prefix = excluded.description_prefix,
+                        published_at = excluded.published_at,
+                        updated_at = CURRENT_TIMESTAMP
+                    """,
+                    (kol_username, author, content_hash, description_prefix, published_at),
+                )
+
     def get_article_by_hash(self, content_hash: str) -> Optional[dict]:
         """
         根据内容哈希获取文章
@@ -203,6 +1098,19 @@ class DatabaseManager:
             logger.error(f"× 查询文章失败: {str(e)}")
             return None
 
+    def iter_content_hashes_by_author(self, author: str):
+        """
+        逐行读取指定作者所有文章的内容哈希（只读索引列，不构造完整行）
+
+        :param author: 作者名称
+        :return: 内容哈希生成器
+        """
+        cursor = self.conn.execute(
+            "SELECT content_hash FROM articles WHERE author = ?", (author,)
+        )
+        for row in cursor:
+            yield row[0]
+
     def get_articles_by_author(self, author: str) -> list[dict]:
         """
         根据作者获取所有文章
@@ -214,7 +1122,7 @@ class DatabaseManager:
             self.cursor.execute(
                 """
                 SELECT * FROM articles WHERE author = ?
-                ORDER BY create_time DESC
+                ORDER BY published_at DESC
                 """,
                 (author,),
             )
@@ -226,6 +1134,98 @@ class DatabaseManager:
             logger.error(f"× 查询文章失败: {str(e)}")
             return []
 
+    @staticmethod
+    def _to_timestamp(value) -> float:
+        """将 datetime 或时间戳统一转换为 Unix 时间戳"""
+        if isinstance(value, datetime):
+            return value.timestamp()
+        return float(value)
+
+    def get_articles_by_time_range(
+        self,
+        start,
+        end=None,
+        author: Optional[str] = None,
+        limit: int = 1000,
+    ) -> list[dict]:
+        """
+        查询发布时间在 [start, end) 范围内的文章，按发布时间倒序
+
+        :param start: 起始时间（datetime 或 Unix 时间戳）
+        :param end: 结束时间（datetime 或 Unix 时间戳），为 None 时不限制
+        :param author: 只查询指定作者的文章
+        :param limit: 返回数量限制
+        :return: 文章列表
+        """
+        conditions = ["published_at >= ?"]
+        params = [self._to_timestamp(start)]
+        if end is not None:
+            conditions.append("published_at < ?")
+            params.append(self._to_timestamp(end))
+        if author is not None:
+            conditions.append("author = ?")
+            params.append(author)
+        params.append(limit)
+
+        try:
+            self.cursor.execute(
+                f"""
+                SELECT * FROM articles
+                WHERE {' AND '.join(conditions)}
+                ORDER BY published_at DESC
+                LIMIT ?
+                """,
+                params,
+            )
+            return [dict(row) for row in self.cursor.fetchall()]
+
+        except Exception as e:
+            logger.error(f"× 按时间范围查询文章失败: {str(e)}")
+            return []
+
+    def count_articles_by_time_range(self, start, end=None, author: Optional[str] = None) -> int:
+        """
+        统计发布时间在 [start, end) 范围内的文章数量
+
+        :param start: 起始时间（datetime 或 Unix 时间戳）
+        :param end: 结束时间（datetime 或 Unix 时间戳），为 None 时不限制
+        :param author: 只统计指定作者的文章
+        :return: 文章数量
+        """
+        conditions = ["published_at >= ?"]
+        params = [self._to_timestamp(start)]
+        if end is not None:
+            conditions.append("published_at < ?")
+            params.append(self._to_timestamp(end))
+        if author is not None:
+            conditions.append("author = ?")
+            params.append(author)
+
+        try:
+            self.cursor.execute(
+                f"SELECT COUNT(*) AS count FROM articles WHERE {' AND '.join(conditions)}",
+                params,
+            )
+            return self.cursor.fetchone()["count"]
+
+        except Exception as e:
+            logger.error(f"× 按时间范围统计文章失败: {str(e)}")
+            return 0
+
+    def get_latest_published_at(self, author: str) -> Optional[float]:
+        """
+        获取作者最新一篇文章的发布时间
+
+        :param author: 作者
+        :return: Unix 时间戳，没有文章时返回 None
+        """
+        self.cursor.execute(
+            "SELECT MAX(published_at) AS latest FROM articles WHERE author = ?",
+            (author,),
+        )
+        row = self.cursor.fetchone()
+        return row["latest"] if row else None
+
     def get_all_articles(self, limit: int = 100) -> list[dict]:
         """
         获取所有文章
@@ -250,6 +1250,200 @@ class DatabaseManager:
             logger.error(f"× 查询文章失败: {str(e)}")
             return []
 
+    def get_max_article_id(self) -> int:
+        """
+        获取当前最大的文章 ID
+
+        :return: 最大 ID（没有文章时为 0）
+        """
+        self.cursor.execute("SELECT COALESCE(MAX(id), 0) AS max_id FROM articles")
+        return self.cursor.fetchone()["max_id"]
+
+    def iter_articles(
+        self,
+        after_id: int = 0,
+        until_id: Optional[int] = None,
+        chunk_size: int = 1000,
+        author: Optional[str] = None,
+    ):
+        """
+        按 ID 顺序分块读取文章（每次只在内存中保留一块，适合大批量导出）
+        指定作者时按 (author, id) 键集分页，由 idx_author 索引直接定位
+
+        :param after_id: 只读取 ID 大于该值的文章
+        :param until_id: 只读取 ID 不大于该值的文章（为 None 时不限制）
+        :param chunk_size: 每次查询读取的行数
+        :param author: 只读取指定作者的文章
+        :return: 文章字典生成器
+        """
+        last_id = after_id
+        while True:
+            sql = "SELECT * FROM articles WHERE id > ?"
+            params = [last_id]
+            if author is not None:
+                sql += " AND author = ?"
+                params.append(author)
+            if until_id is not None:
+                sql += " AND id <= ?"
+                params.append(until_id)
+            sql += " ORDER BY id LIMIT ?"
+            params.append(chunk_size)
+
+            # 使用独立游标，调用方在迭代过程中仍可使用 self.cursor
+            rows = self.conn.execute(sql, params).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row)
+            last_id = rows[-1]["id"]
+
+    def iter_articles_by_author(self, author: str, newest_first: bool = True, chunk_size: int = 500):
+        """
+        分块读取指定作者的所有文章（键集分页，内存占用与文章数量无关）
+
+        :param author: 作者名称
+        :param newest_first: 是否按入库顺序倒序（最新的在前）
+        :param chunk_size: 每次查询读取的行数
+        :return: 文章字典生成器
+        """
+        if not newest_first:
+            yield from self.iter_articles(chunk_size=chunk_size, author=author)
+            return
+
+        cursor_id = None
+        while True:
+            rows, cursor_id = self.get_articles_page(
+                author=author, before_id=cursor_id, limit=chunk_size
+            )
+            yield from rows
+            if cursor_id is None:
+                return
+
+    def get_articles_page(
+        self,
+        author: Optional[str] = None,
+        before_id: Optional[int] = None,
+        limit: int = 50,
+    ) -> tuple[list[dict], Optional[int]]:
+        """
+        按入库顺序倒序获取一页文章（键集分页：翻页代价与页码无关，不使用 OFFSET）
+
+        :param author: 只获取指定作者的文章
+        :param before_id: 上一页返回的游标（为 None 时获取第一页）
+        :param limit: 每页数量
+        :return: (文章列表, 下一页游标)，没有下一页时游标为 None
+        """
+        conditions = []
+        params = []
+        if author is not None:
+            conditions.append("author = ?")
+            params.append(author)
+        if before_id is not None:
+            conditions.append("id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+
+        rows = self.conn.execute(
+            f"SELECT * FROM articles {where} ORDER BY id DESC LIMIT ?", params
+        ).fetchall()
+        articles = [dict(row) for row in rows]
+        next_cursor = articles[-1]["id"] if len(articles) == limit else None
+        return articles, next_cursor
+
+    def count_articles_by_author(self, author: str) -> int:
+        """
+        统计指定作者的文章数量（只扫描 idx_author 索引）
+
+        :param author: 作者名称
+        :return: 文章数量
+        """
+        self.cursor.execute(
+            "SELECT COUNT(*) AS count FROM articles WHERE author = ?", (author,)
+        )
+        return self.cursor.fetchone()["count"]
+
+    def get_article_counts_by_author(self) -> dict[str, int]:
+        """
+        统计每个作者的文章数量
+
+        :return: 作者 -> 文章数量
+        """
+        self.cursor.execute(
+            "SELECT author, COUNT(*) AS count FROM articles GROUP BY author ORDER BY count DESC"
+        )
+        return {row["author"]: row["count"] for row in self.cursor.fetchall()}
+
+    def get_article_counts_by_day(
+        self, author: Optional[str] = None, start=None, end=None
+    ) -> list[tuple[str, int]]:
+        """
+        按发布日期（本地时区）统计文章数量
+
+        :param author: 只统计指定作者的文章
+        :param start: 起始时间（datetime 或 Unix 时间戳），为 None 时不限制
+        :param end: 结束时间（datetime 或 Unix 时间戳，不含），为 None 时不限制
+        :return: [(日期 YYYY-MM-DD, 文章数量), ...]，按日期升序
+        """
+        conditions = ["published_at IS NOT NULL"]
+        params = []
+        if author is not None:
+            conditions.append("author = ?")
+            params.append(author)
+        if start is not None:
+            conditions.append("published_at >= ?")
+            params.append(self._to_timestamp(start))
+        if end is not None:
+            conditions.append("published_at < ?")
+            params.append(self._to_timestamp(end))
+
+        self.cursor.execute(
+            f"""
+            SELECT date(published_at, 'unixepoch', 'localtime') AS day, COUNT(*) AS count
+            FROM articles
+            WHERE {' AND '.join(conditions)}
+            GROUP BY day
+            ORDER BY day
+            """,
+            params,
+        )
+        return [(row["day"], row["count"]) for row in self.cursor.fetchall()]
+
+    def get_export_marker(self, name: str) -> Optional[dict]:
+        """
+        获取导出标记
+
+        :param name: 导出任务名称
+        :return: 标记字典（last_id、file_path、row_count、exported_at）或 None
+        """
+        self.cursor.execute("SELECT * FROM export_markers WHERE name = ?", (name,))
+        row = self.cursor.fetchone()
+        return dict(row) if row else None
+
+    def update_export_marker(self, name: str, last_id: int, file_path: str, row_count: int):
+        """
+        更新导出标记
+
+        :param name: 导出任务名称
+        :param last_id: 已导出的最大文章 ID
+        :param file_path: 导出文件路径
+        :param row_count: 本次导出的行数
+        """
+        with self.write_lock:
+            with self.conn:
+                self.conn.execute(
+                    """
+                    INSERT INTO export_markers (name, last_id, file_path, row_count)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(name) DO UPDATE SET
+                        last_id = excluded.last_id,
+                        file_path = excluded.file_path,
+                        row_count = excluded.row_count,
+                        exported_at = CURRENT_TIMESTAMP
+                    """,
+                    (name, last_id, file_path, row_count),
+                )
+
     def get_article_count(self) -> int:
         """
         获取文章总数
@@ -273,15 +1467,16 @@ class DatabaseManager:
         :return: 是否删除成功
         """
         try:
-            self.cursor.execute(
-                """
-                DELETE FROM articles WHERE content_hash = ?
-                """,
-                (content_hash,),
-            )
+            with self.write_lock:
+                self.cursor.execute(
+                    """
+                    DELETE FROM articles WHERE content_hash = ?
+                    """,
+                    (content_hash,),
+                )
 
-            self.conn.commit()
-            deleted_count = self.cursor.rowcount
+                self.conn.commit()
+                deleted_count = self.cursor.rowcount
 
             if deleted_count > 0:
                 logger.info(f"✓ 成功删除文章: {content_hash[:16]}...")
@@ -311,17 +1506,18 @@ class DatabaseManager:
             # 添加更新时间
             set_clause += ", updated_at = CURRENT_TIMESTAMP"
 
-            self.cursor.execute(
-                f"""
-                UPDATE articles
-                SET {set_clause}
-                WHERE content_hash = ?
-                """,
-                values,
-            )
+            with self.write_lock:
+                self.cursor.execute(
+                    f"""
+                    UPDATE articles
+                    SET {set_clause}
+                    WHERE content_hash = ?
+                    """,
+                    values,
+                )
 
-            self.conn.commit()
-            updated_count = self.cursor.rowcount
+                self.conn.commit()
+                updated_count = self.cursor.rowcount
 
             if updated_count > 0:
                 logger.info(f"✓ 成功更新文章: {content_hash[:16]}...")
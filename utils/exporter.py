@@ -0,0 +1,248 @@
+"""
+文章导出模块
+按 ID 分块从 SQLite 流式读取文章并写入 JSON / JSONL / CSV / Parquet 文件（内存占用与数据量无关），
+通过导出标记支持只导出上次导出之后新增的文章
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+
+from utils.database import DatabaseManager
+from utils.logger import setup_logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+logger = setup_logger(
+    logger_name="exporter",
+    log_file="exporter.log",
+    log_level=20,  # logging.INFO
+)
+
+# 导出的列（imgs 在 JSON/JSONL 中还原为列表，在 CSV/Parquet 中保留 JSON 字符串）
+EXPORT_COLUMNS = (
+    "id",
+    "content_hash",
+    "author",
+    "card_title",
+    "card_description",
+    "create_time",
+    "published_at",
+    "imgs",
+    "scraped_at",
+    "updated_at",
+)
+
+FILE_EXTENSIONS = {"json": "json", "jsonl": "jsonl", "csv": "csv", "parquet": "parquet"}
+
+
+class ArticleExporter:
+    """文章流式导出器"""
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        output_dir: str = "data",
+        file_format: str = "jsonl",
+        chunk_size: int = 5000,
+    ):
+        """
+        初始化导出器
+
+        :param db_manager: 已连接的数据库管理器
+        :param output_dir: 导出目录
+        :param file_format: 文件格式（json/jsonl/csv/parquet）
+        :param chunk_size: 每次从数据库读取、写入文件的行数
+        """
+        if file_format not in FILE_EXTENSIONS:
+            raise ValueError(f"不支持的导出格式: {file_format}，可选: {', '.join(FILE_EXTENSIONS)}")
+        if file_format == "parquet" and not PYARROW_AVAILABLE:
+            raise ImportError("导出 Parquet 需要安装 pyarrow: pip install pyarrow")
+
+        self.db_manager = db_manager
+        self.output_dir = output_dir
+        self.file_format = file_format
+        self.chunk_size = max(1, chunk_size)
+
+    def _iter_rows(self, after_id: int, until_id: int):
+        """按导出列顺序产出文章行"""
+        for article in self.db_manager.iter_articles(after_id, until_id, self.chunk_size):
+            yield {column: article.get(column) for column in EXPORT_COLUMNS}
+
+    def _write_json(self, path: str, rows, lines: bool) -> int:
+        """写入 JSON 数组（流式拼接）或 JSONL"""
+        count = 0
+        with open(path, "w", encoding="utf-8") as f:
+            if not lines:
+                f.write("[\n")
+            for row in rows:
+                row["imgs"] = json.loads(row["imgs"] or "[]")
+                if not lines and count:
+                    f.write(",\n")
+                f.write(json.dumps(row, ensure_ascii=False))
+                if lines:
+                    f.write("\n")
+                count += 1
+            if not lines:
+                f.write("\n]\n")
+        return count
+
+    def _write_csv(self, path: str, rows) -> int:
+        """写入 CSV（带 BOM，Excel 可直接打开）"""
+        count = 0
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def _write_parquet(self, path: str, rows) -> int:
+        """写入 Parquet（每块数据一个 row group）"""
+        schema = pa.schema([
+            ("id", pa.int64()),
+            ("content_hash", pa.string()),
+            ("author", pa.string()),
+            ("card_title", pa.string()),
+            ("card_description", pa.string()),
+            ("create_time", pa.string()),
+            ("published_at", pa.float64()),
+            ("imgs", pa.string()),
+            ("scraped_at", pa.string()),
+            ("updated_at", pa.string()),
+        ])
+
+        count = 0
+        chunk = []
+        with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= self.chunk_size:
+                    writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+                    count += len(chunk)
+                    chunk = []
+            if chunk:
+                writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+                count += len(chunk)
+        return count
+
+    def export(self, incremental: bool = True, marker_name: str = None) -> dict:
+        """
+        导出文章
+
+        :param incremental: 是否只导出上次导出之后新增的文章
+        :param marker_name: 导出标记名称（默认按格式区分，如 articles_jsonl）
+        :return: 导出结果（path、rows、after_id、last_id），没有新文章时 path 为 None
+        """
+        marker_name = marker_name or f"articles_{self.file_format}"
+        marker = self.db_manager.get_export_marker(marker_name) if incremental else None
+        after_id = marker["last_id"] if marker else 0
+        # 以导出开始时的最大 ID 为上限，导出过程中新写入的文章留给下一次
+        until_id = self.db_manager.get_max_article_id()
+
+        result = {"path": None, "rows": 0, "after_id": after_id, "last_id": after_id}
+        if until_id <= after_id:
+            logger.info(f"没有需要导出的新文章 (标记: {marker_name}, last_id: {after_id})")
+            return result
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = "incremental" if after_id else "full"
+        path = os.path.join(
+            self.output_dir,
+            f"articles_{suffix}_{timestamp}.{FILE_EXTENSIONS[self.file_format]}",
+        )
+        tmp_path = path + ".part"
+
+        rows = self._iter_rows(after_id, until_id)
+        try:
+            if self.file_format == "csv":
+                count = self._write_csv(tmp_path, rows)
+            elif self.file_format == "parquet":
+                count = self._write_parquet(tmp_path, rows)
+            else:
+                count = self._write_json(tmp_path, rows, lines=self.file_format == "jsonl")
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        # 文件完整写入后再推进标记，导出失败时下次会重新导出
+        self.db_manager.update_export_marker(marker_name, until_id, path, count)
+        logger.info(f"✓ 已导出 {count} 篇文章到 {path} (ID {after_id + 1} ~ {until_id})")
+
+        result.update(path=path, rows=count, last_id=until_id)
+        return result
+
+
+# 便捷函数
+def create_exporter_from_config(config: dict, db_manager: DatabaseManager) -> ArticleExporter | None:
+    """
+    从配置字典创建导出器
+
+    :param config: 配置字典
+    :param db_manager: 已连接的数据库管理器
+    :return: ArticleExporter 实例或 None（未启用 scheduled_export 时）
+    """
+    output_config = config.get("output", {})
+    # 默认关闭：每个调度周期都会生成一个新文件，需确认输出目录已持久化并定期清理
+    if not output_config.get("scheduled_export", False):
+        return None
+
+    return ArticleExporter(
+        db_manager,
+        output_dir=output_config.get("output_dir", "data"),
+        file_format=output_config.get("file_format", "jsonl"),
+        chunk_size=output_config.get("chunk_size", 5000),
+    )
+
+
+def main():
+    """命令行入口：python -m utils.exporter [--format jsonl] [--full]"""
+    parser = argparse.ArgumentParser(description="导出数据库中的文章")
+    parser.add_argument("--config", default="config.json", help="配置文件路径")
+    parser.add_argument("--format", choices=list(FILE_EXTENSIONS), help="导出格式（默认使用配置文件）")
+    parser.add_argument("--output-dir", help="导出目录（默认使用配置文件）")
+    parser.add_argument("--full", action="store_true", help="全量导出（不使用、也不更新增量标记）")
+    args = parser.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    output_config = config.get("output", {})
+    database_config = config.get("database", {})
+    db_path = database_config.get("db_path", "database/binance_square.db")
+
+    with DatabaseManager(db_path, fts_tokenizer=database_config.get("fts_tokenizer", "trigram")) as db:
+        exporter = ArticleExporter(
+            db,
+            output_dir=args.output_dir or output_config.get("output_dir", "data"),
+            file_format=args.format or output_config.get("file_format", "jsonl"),
+            chunk_size=output_config.get("chunk_size", 5000),
+        )
+        if args.full:
+            # 全量导出使用独立的标记，不影响定时增量导出的进度
+            result = exporter.export(incremental=False, marker_name=f"full_{exporter.file_format}")
+        else:
+            result = exporter.export()
+
+    print(f"导出完成: {result['rows']} 篇文章 -> {result['path']}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        logger.error(f"× 导出失败: {str(e)}", exc_info=True)
+        sys.exit(1)
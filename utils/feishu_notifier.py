@@ -4,10 +4,14 @@
 """
 
 import json
+import threading
+import time
 from multiprocessing import context
 import requests
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Optional
 from utils.logger import setup_logger
+from utils.metrics import FEISHU_MESSAGES_TOTAL, observe_phase
 
 logger = setup_logger(
     logger_name="feishu_notifier",
@@ -19,6 +23,9 @@ logger = setup_logger(
 class FeishuNotifier:
     """飞书消息通知器"""
 
+    TOKEN_REFRESH_MARGIN = 300  # access_token 过期前多少秒主动刷新
+    TOKEN_INVALID_CODES = (99991661, 99991663)  # access_token 缺失/失效的错误码
+
     def __init__(
         self,
         app_id: str = None,
@@ -27,6 +34,7 @@ class FeishuNotifier:
         receive_id_type: str = "chat_id",
         webhook_url: str = None,
         enabled: bool = True,
+        pool_size: int = 4,
     ):
         """
         初始化飞书通知器
@@ -41,6 +49,7 @@ class FeishuNotifier:
         :param receive_id_type: 接收者 ID 类型（chat_id/user_id/email/open_id）
         :param webhook_url: 飞书群机器人 Webhook URL
         :param enabled: 是否启用通知
+        :param pool_size: HTTP 长连接池大小（同一通知器的请求复用 TCP/TLS 连接）
         """
         self.app_id = app_id
         self.app_secret = app_secret
@@ -49,6 +58,14 @@ class FeishuNotifier:
         self.webhook_url = webhook_url
         self.enabled = enabled
         self.access_token = None
+        self.token_expires_at = 0.0  # access_token 过期时间（time.monotonic）
+        self._token_lock = threading.Lock()
+
+        # 复用连接的 HTTP 会话
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
         # API 端点
         self.token_url = "https://open.feishu.cn/open-apis/auth/v3/tenant_access_token/internal"
@@ -56,7 +73,7 @@ class FeishuNotifier:
 
         # 如果使用 app_id 方式，获取 access_token
         if self.enabled and self.app_id and self.app_secret:
-            self._get_access_token()
+            self._ensure_access_token()
 
     def _get_access_token(self) -> bool:
         """
@@ -66,13 +83,15 @@ class FeishuNotifier:
         """
         try:
             payload = {"app_id": self.app_id, "app_secret": self.app_secret}
-            response = requests.post(self.token_url, json=payload, timeout=10)
+            response = self.session.post(self.token_url, json=payload, timeout=10)
             response.raise_for_status()
 
             data = response.json()
             if data.get("code") == 0:
                 self.access_token = data.get("tenant_access_token")
-                logger.info("✓ 飞书 access_token 获取成功")
+                # expire 为剩余有效秒数（通常为 7200）
+                self.token_expires_at = time.monotonic() + data.get("expire", 7200)
+                logger.info(f"✓ 飞书 access_token 获取成功（{data.get('expire', 7200)} 秒后过期）")
                 return True
             else:
                 logger.error(f"× 飞书 access_token 获取失败: {data.get('msg')}")
@@ -82,6 +101,22 @@ class FeishuNotifier:
             logger.error(f"× 飞书 access_token 获取异常: {str(e)}")
             return False
 
+    def _ensure_access_token(self, force_refresh: bool = False) -> bool:
+        """
+        获取可用的 access_token（缓存有效时直接复用，临近过期时自动刷新）
+
+        :param force_refresh: 是否强制刷新（接口返回 token 失效时使用）
+        :return: 是否有可用的 access_token
+        """
+        with self._token_lock:
+            if (
+                not force_refresh
+                and self.access_token
+                and time.monotonic() < self.token_expires_at - self.TOKEN_REFRESH_MARGIN
+            ):
+                return True
+            return self._get_access_token()
+
     def _send_message_via_api(
         self, content: str, msg_type: str = "text"
     ) -> bool:
@@ -92,16 +127,11 @@ class FeishuNotifier:
         :param msg_type: 消息类型（text/post/interactive）
         :return: 是否发送成功
         """
-        if not self.access_token:
+        if not self._ensure_access_token():
             logger.error("× access_token 未获取，无法发送消息")
             return False
 
         try:
-            headers = {
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json; charset=utf-8",
-            }
-
             payload = {
                 "receive_id": self.receive_id,
                 "msg_type": msg_type,
@@ -111,16 +141,33 @@ class FeishuNotifier:
             # 添加 receive_id_type 参数
             params = {"receive_id_type": self.receive_id_type}
 
-            response = requests.post(
-                self.message_url,
-                headers=headers,
-                params=params,
-                json=payload,
-                timeout=10,
-            )
-            response.raise_for_status()
+            for attempt in range(2):
+                headers = {
+                    "Authorization": f"Bearer {self.access_token}",
+                    "Content-Type": "application/json; charset=utf-8",
+                }
+                response = self.session.post(
+                    self.message_url,
+                    headers=headers,
+                    params=params,
+                    json=payload,
+                    timeout=10,
+                )
+                # 先检查 HTTP 状态：非 JSON 的错误响应（如网关返回的 5xx 页面）直接按状态码报错；
+                # 飞书 token 失效等业务错误可能伴随 4xx 状态但仍返回 JSON，需要解析后判断是否刷新重试
+                if not response.ok and "json" not in response.headers.get("Content-Type", ""):
+                    response.raise_for_status()
+                data = response.json()
+
+                # access_token 提前失效时刷新后重试一次
+                if data.get("code") in self.TOKEN_INVALID_CODES and attempt == 0:
+                    logger.warning("! 飞书 access_token 已失效，正在刷新")
+                    if not self._ensure_access_token(force_refresh=True):
+                        return False
+                    continue
+                break
 
-            data = response.json()
+            response.raise_for_status()
             if data.get("code") == 0:
                 logger.info("✓ 飞书消息发送成功")
                 return True
@@ -144,7 +191,7 @@ class FeishuNotifier:
             return False
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.webhook_url,
                 json=content,
                 timeout=10,
@@ -166,6 +213,19 @@ class FeishuNotifier:
             logger.error(f"× 飞书 Webhook 消息发送异常: {str(e)}")
             return False
 
+    @staticmethod
+    def _timed_send(send, *args, **kwargs) -> bool:
+        """
+        调用发送方法并记录耗时和结果指标
+
+        :param send: _send_message_via_webhook 或 _send_message_via_api
+        :return: 是否发送成功
+        """
+        with observe_phase("feishu_send"):
+            success = send(*args, **kwargs)
+        FEISHU_MESSAGES_TOTAL.inc(status="success" if success else "failed")
+        return success
+
     def send_text_message(self, text: str) -> bool:
         """
         发送文本消息
@@ -180,11 +240,11 @@ class FeishuNotifier:
         # 优先使用 Webhook
         if self.webhook_url:
             content = {"msg_type": "text", "content": {"text": text}}
-            return self._send_message_via_webhook(content)
+            return self._timed_send(self._send_message_via_webhook, content)
         # 使用 API
         elif self.app_id and self.app_secret:
             content = json.dumps({"text": text}, ensure_ascii=False)
-            return self._send_message_via_api(content, msg_type="text")
+            return self._timed_send(self._send_message_via_api, content, msg_type="text")
         else:
             logger.error("× 未配置飞书通知方式（webhook_url 或 app_id+app_secret）")
             return False
@@ -212,11 +272,11 @@ class FeishuNotifier:
         # 优先使用 Webhook
         if self.webhook_url:
             payload = {"msg_type": "post", "content": {"post": post_content}}
-            return self._send_message_via_webhook(payload)
+            return self._timed_send(self._send_message_via_webhook, payload)
         # 使用 API
         elif self.app_id and self.app_secret:
             content_str = json.dumps({"post": post_content}, ensure_ascii=False)
-            return self._send_message_via_api(content_str, msg_type="post")
+            return self._timed_send(self._send_message_via_api, content_str, msg_type="post")
         else:
             logger.error("× 未配置飞书通知方式（webhook_url 或 app_id+app_secret）")
             return False
@@ -262,6 +322,62 @@ class FeishuNotifier:
             ]
         ])
 
+    def notify_articles_digest(self, articles: list, max_description_length: int = 300) -> bool:
+        """
+        将多篇新文章合并为一条富文本摘要消息发送
+
+        :param articles: 文章列表
+        :param max_description_length: 每篇文章内容的最大长度（超出部分截断）
+        :return: 是否发送成功（没有可发送的内容时也返回 True）
+        """
+        articles = [a for a in articles if a and a.get("card_description", "").strip()]
+        if not articles:
+            logger.info("摘要中没有包含内容的文章，跳过发送")
+            return True
+
+        if len(articles) == 1:
+            return self.notify_new_article(articles[0])
+
+        authors = list(dict.fromkeys(a.get("author", "").strip() for a in articles))
+        title = f"币安广场新文章 - {', '.join(authors)} ({len(articles)} 篇)"
+
+        content = []
+        for idx, article in enumerate(articles, start=1):
+            card_title = article.get("card_title", "").strip()
+            card_description = article.get("card_description", "").strip()
+            if len(card_description) > max_description_length:
+                card_description = card_description[:max_description_length] + "..."
+
+            content.append([
+                {"tag": "text", "text": f"{idx}. {card_title or '(无标题)'}\n"},
+            ])
+            content.append([
+                {
+                    "tag": "text",
+                    "text": f"作者: {article.get('author', '').strip()} | "
+                            f"发布时间: {article.get('create-time', '').strip()}\n",
+                },
+            ])
+            content.append([
+                {"tag": "text", "text": f"内容: {card_description}\n"},
+            ])
+            imgs = article.get("imgs", [])
+            if imgs:
+                content.append([
+                    {"tag": "a", "href": f"{img_url}", "text": f"图片{i + 1}\n"}
+                    for i, img_url in enumerate(imgs)
+                ])
+
+        return self.send_rich_text_message(title, content)
+
+    def close(self):
+        """关闭 HTTP 会话"""
+        self.session.close()
+
+
+_shared_notifiers = {}  # 飞书配置 -> 进程内共享的 FeishuNotifier
+_shared_notifiers_lock = threading.Lock()
+
 
 # 便捷函数
 def create_feishu_notifier_from_config(config: Dict) -> Optional[FeishuNotifier]:
@@ -285,3 +401,25 @@ def create_feishu_notifier_from_config(config: Dict) -> Optional[FeishuNotifier]
         webhook_url=feishu_config.get("webhook_url"),
         enabled=feishu_config.get("enabled", False),
     )
+
+
+def get_shared_feishu_notifier(config: Dict) -> Optional[FeishuNotifier]:
+    """
+    获取进程内共享的飞书通知器（相同配置只创建一次，
+    跨调度周期复用 HTTP 长连接和 access_token 缓存）
+
+    :param config: 配置字典
+    :return: FeishuNotifier 实例或 None
+    """
+    feishu_config = config.get("feishu", {})
+    if not feishu_config.get("enabled", False):
+        logger.info("飞书通知未启用")
+        return None
+
+    key = json.dumps(feishu_config, sort_keys=True)
+    with _shared_notifiers_lock:
+        notifier = _shared_notifiers.get(key)
+        if notifier is None:
+            notifier = create_feishu_notifier_from_config(config)
+            _shared_notifiers[key] = notifier
+        return notifier
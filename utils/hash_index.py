@@ -0,0 +1,128 @@
+"""
+已知文章哈希索引
+按作者预加载数据库中已有的 content_hash，爬取热路径上的去重判断不再查询 SQLite
+"""
+
+import math
+from typing import Optional
+
+from utils.database import DatabaseManager
+from utils.logger import setup_logger
+
+logger = setup_logger(
+    logger_name="hash_index",
+    log_file="hash_index.log",
+    log_level=20,  # logging.INFO
+)
+
+
+class BloomFilter:
+    """
+    布隆过滤器，用于在内存中紧凑地保存大量哈希
+
+    content_hash 本身就是 SHA-256 十六进制串，直接切分为多个独立的哈希值使用，
+    无需再次计算哈希
+    """
+
+    def __init__(self, expected_items: int = 100000, false_positive_rate: float = 0.001):
+        """
+        初始化布隆过滤器
+
+        :param expected_items: 预计元素数量
+        :param false_positive_rate: 期望误判率
+        """
+        expected_items = max(1, expected_items)
+        self.size = max(
+            8, int(-expected_items * math.log(false_positive_rate) / (math.log(2) ** 2))
+        )
+        # SHA-256 共 64 个十六进制字符，每个哈希取 8 个字符，最多 8 个哈希函数
+        self.hash_count = min(8, max(1, round(self.size / expected_items * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, content_hash: str):
+        """计算哈希对应的位下标"""
+        for i in range(self.hash_count):
+            yield int(content_hash[i * 8:(i + 1) * 8], 16) % self.size
+
+    def add(self, content_hash: str):
+        """加入一个哈希"""
+        for position in self._positions(content_hash):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, content_hash: str) -> bool:
+        """判断哈希是否可能存在（可能误判为存在，不会误判为不存在）"""
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(content_hash)
+        )
+
+
+class KnownHashIndex:
+    """按作者懒加载的已知文章哈希索引"""
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        use_bloom: bool = False,
+        expected_items: int = 100000,
+        false_positive_rate: float = 0.001,
+    ):
+        """
+        初始化哈希索引
+
+        :param db_manager: 已连接的数据库管理器
+        :param use_bloom: 是否使用布隆过滤器（命中时再回查 SQLite 确认），否则使用集合
+        :param expected_items: 布隆过滤器预计元素数量
+        :param false_positive_rate: 布隆过滤器期望误判率
+        """
+        self.db_manager = db_manager
+        self.use_bloom = use_bloom
+        self.expected_items = expected_items
+        self.false_positive_rate = false_positive_rate
+        self._indexes = {}  # author -> set 或 BloomFilter
+
+    def _get_author_index(self, author: str):
+        """获取作者的索引，首次访问时从数据库加载"""
+        index = self._indexes.get(author)
+        if index is None:
+            if self.use_bloom:
+                index = BloomFilter(self.expected_items, self.false_positive_rate)
+            else:
+                index = set()
+
+            count = 0
+            for content_hash in self.db_manager.iter_content_hashes_by_author(author):
+                index.add(content_hash)
+                count += 1
+
+            self._indexes[author] = index
+            logger.info(f"✓ 已加载作者 {author} 的 {count} 个文章哈希")
+        return index
+
+    def contains(self, article: dict, content_hash: Optional[str] = None) -> bool:
+        """
+        判断文章是否已存在
+
+        :param article: 文章字典
+        :param content_hash: 已计算好的内容哈希（可选）
+        :return: 是否存在
+        """
+        content_hash = content_hash or DatabaseManager.generate_content_hash(article)
+        index = self._get_author_index(article.get("author", ""))
+
+        if content_hash not in index:
+            return False
+        if self.use_bloom:
+            # 布隆过滤器可能误判，回查数据库确认
+            return self.db_manager.get_article_by_hash(content_hash) is not None
+        return True
+
+    def add(self, article: dict, content_hash: Optional[str] = None):
+        """
+        将新插入的文章加入索引
+
+        :param article: 文章字典
+        :param content_hash: 已计算好的内容哈希（可选）
+        """
+        content_hash = content_hash or DatabaseManager.generate_content_hash(article)
+        self._get_author_index(article.get("author", "")).add(content_hash)
@@ -0,0 +1,325 @@
+"""
+文章图片下载与内容寻址存储
+新文章入库后，其图片 URL 交给有界线程池并发下载，文件按内容 SHA-256 命名存放
+（相同图片只保存一份，跨文章、跨 KOL 去重），并在 article_media 表中与文章关联
+"""
+
+import hashlib
+import mimetypes
+import os
+import queue
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.connection_manager import ConnectionManager
+from utils.logger import setup_logger
+
+logger = setup_logger(
+    logger_name="media_store",
+    log_file="media_store.log",
+    log_level=20,  # logging.INFO
+)
+
+_STOP = object()  # 下载线程退出信号
+
+
+class MediaStore:
+    """内容寻址的文件存储：<root>/<sha256 前 2 位>/<sha256><扩展名>"""
+
+    def __init__(self, root: str = "data/media"):
+        """
+        初始化媒体存储
+
+        :param root: 存储根目录
+        """
+        self.root = root
+
+    def path_for(self, sha256: str, content_type: str = None) -> str:
+        """
+        计算内容哈希对应的文件路径
+
+        :param sha256: 内容 SHA-256
+        :param content_type: MIME 类型（用于确定扩展名）
+        :return: 文件路径
+        """
+        ext = ""
+        if content_type:
+            ext = mimetypes.guess_extension(content_type.split(";")[0].strip()) or ""
+        return os.path.join(self.root, sha256[:2], f"{sha256}{ext}")
+
+    def put(self, data: bytes, content_type: str = None) -> tuple[str, str, bool]:
+        """
+        保存文件内容（内容已存在时不重复写入）
+
+        :param data: 文件内容
+        :param content_type: MIME 类型
+        :return: (sha256, 文件路径, 是否新写入)
+        """
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.path_for(sha256, content_type)
+        if os.path.exists(path):
+            return sha256, path, False
+
+        # 先写临时文件再原子替换，并发写入同一内容也不会产生残缺文件
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return sha256, path, True
+
+
+class MediaDownloader:
+    """图片下载线程池：提交不阻塞爬虫，队列满时记录保留在数据库中，下次启动时补下载"""
+
+    def __init__(
+        self,
+        db_path: str = "database/binance_square.db",
+        performance_profile: bool = True,
+        fts_tokenizer: str = "trigram",
+        store_dir: str = "data/media",
+        workers: int = 4,
+        queue_size: int = 1000,
+        timeout: float = 20,
+        max_bytes: int = 20 * 1024 * 1024,
+        max_attempts: int = 3,
+    ):
+        """
+        初始化图片下载器
+
+        :param db_path: 数据库文件路径
+        :param performance_profile: 是否启用数据库性能模式
+        :param fts_tokenizer: 新建全文索引时使用的分词器（trigram/unicode61）
+        :param store_dir: 媒体存储根目录
+        :param workers: 并发下载线程数
+        :param queue_size: 下载队列容量
+        :param timeout: 单个请求超时时间（秒）
+        :param max_bytes: 单个文件大小上限（字节）
+        :param max_attempts: 单张图片最大下载次数
+        """
+        self.db_path = db_path
+        self.performance_profile = performance_profile
+        self.fts_tokenizer = fts_tokenizer
+        self.store = MediaStore(store_dir)
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_attempts = max_attempts
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._url_locks = {}  # 同一 URL 同时只下载一次：url -> [锁, 持有或等待该锁的线程数]
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.stats = {"downloaded": 0, "deduplicated": 0, "failed": 0, "deferred": 0}
+
+    @property
+    def running(self) -> bool:
+        """下载线程是否在运行"""
+        return bool(self._threads)
+
+    def start(self):
+        """启动下载线程，并补下载上次未完成的图片"""
+        with self._lock:
+            if self._threads:
+                return
+            self._threads = [
+                threading.Thread(target=self._worker, name=f"media-download-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+        logger.info(f"✓ 图片下载线程池已启动: {self.workers} 个线程")
+        self.resume_pending()
+
+    def resume_pending(self):
+        """将数据库中未完成的图片记录重新加入下载队列"""
+        db = ConnectionManager.get(
+            self.db_path,
+            performance_profile=self.performance_profile,
+            fts_tokenizer=self.fts_tokenizer,
+        ).database()
+        pending = db.get_pending_media(
+            limit=self._queue.maxsize or 1000, max_attempts=self.max_attempts
+        )
+        for item in pending:
+            self._enqueue(item)
+        if pending:
+            logger.info(f"✓ 已恢复 {len(pending)} 张未完成下载的图片")
+
+    def _enqueue(self, item: dict):
+        """加入下载队列（队列满时不阻塞，记录保留在数据库中等待下次补下载）"""
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._count("deferred")
+
+    def submit(self, content_hash: str, article: dict):
+        """
+        提交新文章的图片（非阻塞）
+
+        :param content_hash: 文章内容哈希
+        :param article: 文章字典
+        """
+        if not self.running:
+            self.start()
+        for position, url in enumerate(article.get("imgs", [])):
+            if url:
+                self._enqueue({"content_hash": content_hash, "position": position, "url": url})
+
+    def join(self):
+        """等待队列中的图片全部下载完成"""
+        self._queue.join()
+
+    def close(self):
+        """等待已提交的图片下载完成后停止下载线程"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        if not threads:
+            return
+
+        self._queue.join()
+        for _ in threads:
+            self._queue.put(_STOP)
+        for thread in threads:
+            thread.join()
+        self.session.close()
+        logger.info(f"✓ 图片下载线程池已关闭 - 统计: {self.stats}")
+
+    def _count(self, key: str):
+        """更新统计（多个下载线程同时更新）"""
+        with self._lock:
+            self.stats[key] += 1
+
+    @contextmanager
+    def _url_lock(self, url: str):
+        """
+        持有 URL 对应的锁（引用计数，最后一个使用者释放后才移除，等待中的线程与新到达的线程使用同一把锁）
+
+        :param url: 图片 URL
+        """
+        with self._lock:
+            entry = self._url_locks.setdefault(url, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._url_locks[url]
+
+    def _fetch(self, url: str) -> tuple[bytes, str]:
+        """
+        下载单个文件（流式读取，超过大小上限时中止）
+
+        :param url: 图片 URL
+        :return: (文件内容, MIME 类型)
+        """
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise ValueError(f"文件超过大小上限 {self.max_bytes} 字节")
+                chunks.append(chunk)
+            return b"".join(chunks), response.headers.get("Content-Type")
+
+    def download(self, db, item: dict):
+        """
+        下载一张图片并与文章关联
+
+        :param db: 当前线程的 DatabaseManager
+        :param item: 待下载记录（content_hash、position、url）
+        """
+        url = item["url"]
+        with self._url_lock(url):
+            try:
+                # 相同 URL 已下载过（其它文章或其它 KOL 引用了同一张图片）
+                sha256 = db.get_media_sha256_by_url(url)
+                if sha256:
+                    db.link_article_media(item["content_hash"], item["position"], sha256)
+                    self._count("deduplicated")
+                    return
+
+                data, content_type = self._fetch(url)
+                sha256, path, created = self.store.put(data, content_type)
+                db.link_article_media(
+                    item["content_hash"], item["position"], sha256,
+                    path=path, size=len(data), content_type=content_type,
+                )
+                self._count("downloaded" if created else "deduplicated")
+
+            except Exception as e:
+                self._count("failed")
+                logger.warning(f"! 图片下载失败 {url}: {str(e)}")
+                db.mark_article_media_failed(item["content_hash"], item["position"], str(e))
+
+    def _worker(self):
+        """下载线程主循环"""
+        db = ConnectionManager.get(
+            self.db_path,
+            performance_profile=self.performance_profile,
+            fts_tokenizer=self.fts_tokenizer,
+        ).database()
+
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self.download(db, item)
+            except Exception as e:
+                logger.error(f"× 下载线程处理失败: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def __enter__(self):
+        """上下文管理器入口"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """上下文管理器出口"""
+        self.close()
+
+
+# 便捷函数
+def create_media_downloader_from_config(config: dict) -> MediaDownloader | None:
+    """
+    从配置字典创建图片下载器
+
+    :param config: 配置字典
+    :return: MediaDownloader 实例或 None（未启用时）
+    """
+    media_config = config.get("media", {})
+    if not media_config.get("enabled", False):
+        return None
+
+    database_config = config.get("database", {})
+    return MediaDownloader(
+        db_path=database_config.get("db_path", "database/binance_square.db"),
+        performance_profile=database_config.get("performance_profile", False),
+        fts_tokenizer=database_config.get("fts_tokenizer", "trigram"),
+        store_dir=media_config.get("store_dir", "data/media"),
+        workers=media_config.get("workers", 4),
+        queue_size=media_config.get("queue_size", 1000),
+        timeout=media_config.get("timeout", 20),
+        max_bytes=media_config.get("max_bytes", 20 * 1024 * 1024),
+        max_attempts=media_config.get("max_attempts", 3),
+    )
@@ -0,0 +1,505 @@
+"""
+运行指标模块
+记录爬取各阶段耗时（直方图）和计数器，通过本地 HTTP 端点以 Prometheus 文本格式暴露，
+并根据最近一次成功爬取的时间提供健康检查（/healthz）
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.logger import setup_logger
+
+logger = setup_logger(
+    logger_name="metrics",
+    log_file="scheduler.log",
+    log_level=20,  # logging.INFO
+)
+
+# 耗时直方图的默认分桶（秒），覆盖单卡解析的毫秒级到整页爬取的分钟级
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _label_key(labels: dict) -> tuple:
+    """将标签字典转换为可哈希的有序元组"""
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    """格式化 Prometheus 标签，如 {phase="navigate"}"""
+    pairs = key + extra
+    if not pairs:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    """格式化指标值（整数不带小数点）"""
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """只增计数器"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str):
+        """
+        初始化计数器
+
+        :param name: 指标名
+        :param documentation: 指标说明（输出为 # HELP）
+        """
+        self.name = name
+        self.documentation = documentation
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        """
+        增加计数
+
+        :param amount: 增加量
+        :param labels: 标签
+        """
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        """输出 Prometheus 文本格式的数据行"""
+        with self._lock:
+            return [f"{self.name}{_format_labels(key)} {_format_value(value)}"
+                    for key, value in sorted(self._values.items())]
+
+    def merge(self, values: dict):
+        """合并其它进程的数据（累加）"""
+        with self._lock:
+            for key, value in values.items():
+                self._values[key] = self._values.get(key, 0) + value
+
+    def drain(self) -> dict:
+        """取出当前数据并清零"""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+
+class Gauge(Counter):
+    """可设置的数值（合并其它进程的数据时取最大值，适用于时间戳类指标）"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        """
+        设置数值
+
+        :param value: 数值
+        :param labels: 标签
+        """
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def get(self, **labels) -> float | None:
+        """读取数值，不存在时返回 None"""
+        with self._lock:
+            return self._values.get(_label_key(labels))
+
+    def merge(self, values: dict):
+        """合并其它进程的数据（取最大值）"""
+        with self._lock:
+            for key, value in values.items():
+                self._values[key] = max(self._values.get(key, value), value)
+
+
+class Histogram:
+    """分桶直方图"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: tuple = DEFAULT_BUCKETS):
+        """
+        初始化直方图
+
+        :param name: 指标名
+        :param documentation: 指标说明（输出为 # HELP）
+        :param buckets: 分桶上界（秒）
+        """
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # 标签 -> [各分桶计数..., 总和, 次数]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        """
+        记录一次观测值
+
+        :param value: 观测值（秒）
+        :param labels: 标签
+        """
+        key = _label_key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        计时上下文管理器，退出时记录耗时（异常退出同样记录）
+
+        :param labels: 标签
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> list[str]:
+        """输出 Prometheus 文本格式的数据行（分桶计数为累计值）"""
+        lines = []
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, state):
+                    cumulative += count
+                    lines.append(
+                        f"{self.name}_bucket{_format_labels(key, (('le', _format_value(bound)),))} {cumulative}"
+                    )
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {state[-1]}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(state[-2])}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {state[-1]}")
+        return lines
+
+    def merge(self, values: dict):
+        """合并其它进程的数据（各分桶、总和和次数分别累加）"""
+        with self._lock:
+            for key, other in values.items():
+                state = self._values.get(key)
+                if state is None:
+                    self._values[key] = list(other)
+                else:
+                    self._values[key] = [a + b for a, b in zip(state, other)]
+
+    def drain(self) -> dict:
+        """取出当前数据并清零"""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        """初始化指标注册表"""
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        """注册指标，同名指标已存在时返回已注册的实例"""
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        """注册（或获取已注册的）计数器"""
+        return self._register(Counter(name, documentation))
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        """注册（或获取已注册的）数值指标"""
+        return self._register(Gauge(name, documentation))
+
+    def histogram(self, name: str, documentation: str, buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        """注册（或获取已注册的）直方图"""
+        return self._register(Histogram(name, documentation, buckets))
+
+    def render(self) -> str:
+        """
+        以 Prometheus 文本格式输出所有指标
+
+        :return: 文本内容
+        """
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def drain(self) -> dict:
+        """
+        取出自上次取出以来的指标增量并清零（多进程模式下工作进程随结果回传给主进程）
+
+        :return: 指标名 -> 快照（可直接传给 merge，可被 pickle）
+        """
+        snapshot = {}
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            values = metric.drain()
+            if values:
+                snapshot[metric.name] = values
+        return snapshot
+
+    def merge(self, snapshot: dict):
+        """
+        合并其它进程回传的指标快照
+
+        :param snapshot: drain() 的返回值
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+        for name, values in (snapshot or {}).items():
+            metric = metrics.get(name)
+            if metric is not None:
+                metric.merge(values)
+
+
+# 进程内的全局注册表和爬取流程使用的指标
+REGISTRY = MetricsRegistry()
+
+PHASE_SECONDS = REGISTRY.histogram(
+    "binance_scraper_phase_seconds",
+    "Duration of scraper phases (browser_launch, navigate, parse_card, extract_batch, db_lookup, db_insert, feishu_send, scrape_kol)",
+)
+CARDS_TOTAL = REGISTRY.counter(
+    "binance_scraper_cards_total",
+    "Feed cards processed by result (new, duplicate, skipped)",
+)
+SCRAPES_TOTAL = REGISTRY.counter(
+    "binance_scraper_scrapes_total",
+    "Per-KOL scrape runs by status",
+)
+FEISHU_MESSAGES_TOTAL = REGISTRY.counter(
+    "binance_scraper_feishu_messages_total",
+    "Feishu messages sent by status",
+)
+LAST_SUCCESS_TIMESTAMP = REGISTRY.gauge(
+    "binance_scraper_last_success_timestamp_seconds",
+    "Unix time of the last successful KOL scrape",
+)
+
+_PROCESS_STARTED_AT = time.time()
+
+
+def observe_phase(phase: str):
+    """
+    记录阶段耗时的快捷方式: with observe_phase("navigate"): ...
+
+    :param phase: 阶段名称
+    """
+    return PHASE_SECONDS.time(phase=phase)
+
+
+def record_scrape(success: bool, elapsed: float):
+    """
+    记录单个 KOL 的爬取结果
+
+    :param success: 是否成功
+    :param elapsed: 耗时（秒）
+    """
+    PHASE_SECONDS.observe(elapsed, phase="scrape_kol")
+    SCRAPES_TOTAL.inc(status="success" if success else "failed")
+    if success:
+        LAST_SUCCESS_TIMESTAMP.set(time.time())
+
+
+def health_status(max_age: float) -> tuple[bool, dict]:
+    """
+    根据最近一次成功爬取的时间判断是否健康
+    进程启动后 max_age 秒内尚未完成首次爬取时同样视为健康
+
+    :param max_age: 最近一次成功爬取距今的最长允许秒数
+    :return: (是否健康, 详情)
+    """
+    now = time.time()
+    last_success = LAST_SUCCESS_TIMESTAMP.get()
+    started = _PROCESS_STARTED_AT
+    healthy = now - (last_success or started) <= max_age
+    return healthy, {
+        "status": "ok" if healthy else "stale",
+        "last_success": last_success,
+        "seconds_since_last_success": round(now - last_success, 1) if last_success else None,
+        "uptime_seconds": round(now - started, 1),
+        "max_age": max_age,
+    }
+
+
+class MetricsServer:
+    """在后台线程中提供 /metrics 和 /healthz 的 HTTP 服务"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9108,
+        health_max_age: float = 7200,
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        """
+        初始化指标服务
+
+        :param host: 监听地址（容器内运行时使用 0.0.0.0）
+        :param port: 监听端口
+        :param health_max_age: 最近一次成功爬取距今超过该秒数时 /healthz 返回 503
+        :param registry: 指标注册表
+        """
+        self.host = host
+        self.port = port
+        self.health_max_age = health_max_age
+        self.registry = registry
+        self._httpd = None
+        self._thread = None
+
+    def start(self):
+        """启动服务（端口被占用时只记录错误，不影响爬取）"""
+        if self._httpd is not None:
+            return
+        try:
+            self._httpd = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        except OSError as e:
+            logger.error(f"× 指标服务启动失败 ({self.host}:{self.port}): {str(e)}")
+            return
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]  # port=0 时为实际分配的端口
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"✓ 指标服务已启动: http://{self.host}:{self.port}/metrics")
+
+    def close(self):
+        """停止服务"""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def _make_handler(self):
+        """构造请求处理类（绑定当前服务实例）"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                # 抓取指标的请求很频繁，不写访问日志
+                pass
+
+            def _send(self, status: int, body: str, content_type: str):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/metrics":
+                    self._send(200, server.registry.render(), "text/plain; version=0.0.4; charset=utf-8")
+                elif path == "/healthz":
+                    healthy, detail = health_status(server.health_max_age)
+                    self._send(200 if healthy else 503, json.dumps(detail), "application/json")
+                else:
+                    self._send(404, "not found\n", "text/plain; charset=utf-8")
+
+        return Handler
+
+    def __enter__(self):
+        """上下文管理器入口"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """上下文管理器出口"""
+        self.close()
+
+
+# 便捷函数
+def create_metrics_server_from_config(config: dict) -> MetricsServer | None:
+    """
+    从配置字典创建指标服务
+
+    :param config: 配置字典
+    :return: MetricsServer 实例或 None（未启用时）
+    """
+    metrics_config = config.get("metrics", {})
+    if not metrics_config.get("enabled", False):
+        return None
+
+    health_max_age = metrics_config.get("health_max_age")
+    if not health_max_age:
+        # 默认允许错过一次调度：两个调度间隔再加 10 分钟的爬取时间
+        scheduler_config = config.get("scheduler_config", {})
+        adaptive_config = scheduler_config.get("adaptive", {})
+        if adaptive_config.get("enabled", False):
+            # 自适应轮询时每个 KOL 至少按最长间隔爬取一次
+            interval = adaptive_config.get("max_interval_minutes", 60) * 60
+        else:
+            interval = (
+                scheduler_config.get("interval_hours", 1) * 3600
+                + scheduler_config.get("interval_minutes", 0) * 60
+            )
+        health_max_age = 2 * interval + 600
+
+    return MetricsServer(
+        host=metrics_config.get("host", "127.0.0.1"),
+        port=metrics_config.get("port", 9108),
+        health_max_age=health_max_age,
+    )
+
+
+def main():
+    """
+    命令行入口：python -m utils.metrics [--config config.json]
+    请求调度器进程的 /healthz（容器健康检查使用）；未启用 metrics 时没有可检查的端点，直接视为健康
+    """
+    parser = argparse.ArgumentParser(description="检查调度器的健康状态")
+    parser.add_argument("--config", default="config.json", help="配置文件路径")
+    parser.add_argument("--timeout", type=float, default=5, help="请求超时时间（秒）")
+    args = parser.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        metrics_config = json.load(f).get("metrics", {})
+    if not metrics_config.get("enabled", False):
+        print("metrics 未启用，跳过 /healthz 检查")
+        return
+
+    host = metrics_config.get("host", "127.0.0.1")
+    if host in ("", "0.0.0.0", "::"):
+        host = "127.0.0.1"
+    url = f"http://{host}:{metrics_config.get('port', 9108)}/healthz"
+    # 返回 503（最近一次成功爬取过久）或无法连接时 urlopen 抛出异常，进程以非零状态退出
+    with urllib.request.urlopen(url, timeout=args.timeout) as response:
+        print(response.read().decode("utf-8"))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"× 健康检查失败: {str(e)}", file=sys.stderr)
+        sys.exit(1)
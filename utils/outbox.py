@@ -0,0 +1,243 @@
+"""
+通知发件箱投递模块
+新文章与待发送通知在同一事务中写入数据库（notification_outbox 表），
+由投递线程批量取出、合并为一条飞书摘要消息发送，按令牌桶限速，失败后指数退避重试
+"""
+
+import random
+import threading
+import time
+
+from utils.connection_manager import ConnectionManager
+from utils.logger import setup_logger
+
+logger = setup_logger(
+    logger_name="outbox",
+    log_file="feishu_notifier.log",
+    log_level=20,  # logging.INFO
+)
+
+
+class TokenBucket:
+    """令牌桶限速器：平均每秒 rate 个令牌，最多积攒 capacity 个（允许短时突发）"""
+
+    def __init__(self, rate: float = 1.0, capacity: int = 5):
+        """
+        初始化令牌桶
+
+        :param rate: 每秒补充的令牌数
+        :param capacity: 桶容量
+        """
+        self.rate = max(rate, 1e-6)
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """按流逝时间补充令牌"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, stop_event: threading.Event = None) -> bool:
+        """
+        获取一个令牌（不足时等待）
+
+        :param stop_event: 等待期间被设置时放弃获取
+        :return: 是否获取成功
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+
+            if stop_event is None:
+                time.sleep(wait)
+            elif stop_event.wait(wait):
+                return False
+
+
+class OutboxDeliveryWorker:
+    """发件箱投递线程：领取到期通知 → 合并为摘要 → 限速发送 → 标记已发送或安排重试"""
+
+    def __init__(
+        self,
+        db_path: str = "database/binance_square.db",
+        performance_profile: bool = True,
+        fts_tokenizer: str = "trigram",
+        feishu_notifier=None,
+        batch_size: int = 10,
+        rate_per_second: float = 1.0,
+        burst: int = 5,
+        poll_interval: float = 5.0,
+        max_attempts: int = 8,
+        backoff_base: float = 5.0,
+        backoff_max: float = 600.0,
+        lease_seconds: float = 300.0,
+    ):
+        """
+        初始化投递线程
+
+        :param db_path: 数据库文件路径
+        :param performance_profile: 是否启用数据库性能模式
+        :param fts_tokenizer: 新建全文索引时使用的分词器（trigram/unicode61）
+        :param feishu_notifier: 飞书通知器实例
+        :param batch_size: 每条摘要消息最多包含的文章数
+        :param rate_per_second: 每秒最多发送的消息数（飞书机器人限制为 5 条/秒、100 条/分钟）
+        :param burst: 允许突发发送的消息数
+        :param poll_interval: 没有待发送通知时的轮询间隔（秒）
+        :param max_attempts: 最大发送次数（超过后标记为 failed）
+        :param backoff_base: 重试退避基数（秒），第 n 次失败后等待 backoff_base * 2^(n-1)
+        :param backoff_max: 重试退避上限（秒）
+        :param lease_seconds: 领取租约时间（秒），进程异常退出后超时的通知会被重新领取
+        """
+        self.db_path = db_path
+        self.performance_profile = performance_profile
+        self.fts_tokenizer = fts_tokenizer
+        self.feishu_notifier = feishu_notifier
+        self.batch_size = max(1, batch_size)
+        self.poll_interval = poll_interval
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+        self.rate_limiter = TokenBucket(rate_per_second, burst)
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self.stats = {"sent_messages": 0, "sent_articles": 0, "retries": 0, "failed": 0}
+
+    @property
+    def running(self) -> bool:
+        """投递线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """启动投递线程（启动后会先发送上次遗留的待发送通知）"""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="outbox-delivery", daemon=True)
+        self._thread.start()
+        logger.info("✓ 通知发件箱投递线程已启动")
+
+    def wake(self):
+        """有新通知写入时唤醒投递线程，无需等待轮询间隔"""
+        self._wake_event.set()
+
+    def stop(self, timeout: float = 30):
+        """
+        停止投递线程（未发送的通知保留在发件箱中，下次启动后继续发送）
+
+        :param timeout: 等待线程退出的最长时间（秒）
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._wake_event.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+        logger.info(f"✓ 通知发件箱投递线程已停止 - 统计: {self.stats}")
+
+    def _backoff_delay(self, attempts: int) -> float:
+        """计算第 attempts 次失败后的重试等待时间（带随机抖动）"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** max(0, attempts - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def deliver_once(self, db) -> int:
+        """
+        领取并发送一批到期通知
+
+        :param db: 当前线程的 DatabaseManager
+        :return: 本次领取的通知数量
+        """
+        items = db.claim_due_notifications(limit=self.batch_size, lease_seconds=self.lease_seconds)
+        if not items:
+            return 0
+
+        ids = [item["id"] for item in items]
+        if not self.rate_limiter.acquire(self._stop_event):
+            # 停止中：释放领取（尚未发送，不计入发送次数），下次启动后立即发送
+            db.release_notifications(ids)
+            return len(items)
+
+        try:
+            sent = self.feishu_notifier.notify_articles_digest([item["article"] for item in items])
+            error = "飞书接口返回失败"
+        except Exception as e:
+            sent = False
+            error = str(e)
+
+        if sent:
+            db.mark_notifications_sent(ids)
+            self.stats["sent_messages"] += 1
+            self.stats["sent_articles"] += len(items)
+            return len(items)
+
+        # 同一批通知一起重试，按其中最大的已发送次数计算退避
+        attempts = max(item["attempts"] for item in items) + 1
+        give_up = attempts >= self.max_attempts
+        db.mark_notifications_failed(
+            ids, error, next_attempt_at=time.time() + self._backoff_delay(attempts), give_up=give_up
+        )
+        if give_up:
+            self.stats["failed"] += len(items)
+            logger.error(f"× {len(items)} 条通知已发送 {attempts} 次仍失败，放弃发送: {error}")
+        else:
+            self.stats["retries"] += len(items)
+            logger.warning(f"! {len(items)} 条通知发送失败（第 {attempts} 次），稍后重试: {error}")
+        return len(items)
+
+    def _run(self):
+        """投递线程主循环"""
+        db = ConnectionManager.get(
+            self.db_path,
+            performance_profile=self.performance_profile,
+            fts_tokenizer=self.fts_tokenizer,
+        ).database()
+
+        while not self._stop_event.is_set():
+            try:
+                claimed = self.deliver_once(db)
+            except Exception as e:
+                logger.error(f"× 发件箱投递失败: {str(e)}")
+                claimed = 0
+
+            if claimed < self.batch_size:
+                # 没有更多到期通知，等待新通知写入或轮询间隔
+                self._wake_event.wait(self.poll_interval)
+                self._wake_event.clear()
+
+
+# 便捷函数
+def create_outbox_worker_from_config(config: dict, feishu_notifier=None) -> OutboxDeliveryWorker | None:
+    """
+    从配置字典创建发件箱投递线程
+
+    :param config: 配置字典
+    :param feishu_notifier: 飞书通知器实例
+    :return: OutboxDeliveryWorker 实例或 None（未启用或没有通知器时）
+    """
+    outbox_config = config.get("notification_outbox", {})
+    if not outbox_config.get("enabled", False) or feishu_notifier is None:
+        return None
+
+    database_config = config.get("database", {})
+    return OutboxDeliveryWorker(
+        db_path=database_config.get("db_path", "database/binance_square.db"),
+        performance_profile=database_config.get("performance_profile", False),
+        fts_tokenizer=database_config.get("fts_tokenizer", "trigram"),
+        feishu_notifier=feishu_notifier,
+        batch_size=outbox_config.get("batch_size", 10),
+        rate_per_second=outbox_config.get("rate_per_second", 1.0),
+        burst=outbox_config.get("burst", 5),
+        poll_interval=outbox_config.get("poll_interval", 5.0),
+        max_attempts=outbox_config.get("max_attempts", 8),
+        backoff_base=outbox_config.get("backoff_base", 5.0),
+        backoff_max=outbox_config.get("backoff_max", 600.0),
+    )
@@ -0,0 +1,325 @@
+"""
+文章异步写入流水线
+爬虫只负责产出文章，由有界队列分别驱动入库线程和通知线程：
+入库线程按批次写入数据库，通知线程发送飞书消息，队列满时对爬虫形成背压；
+启用通知发件箱时，通知随文章在同一事务中写入发件箱，由发件箱投递线程负责发送；
+启用图片下载时，新文章的图片交给下载线程池并发下载；
+submit 返回的 Future 在文章所在批次提交（或回滚）后完成，爬虫据此确认入库后再推进水位
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+
+from utils.connection_manager import ConnectionManager
+from utils.database import DatabaseManager
+from utils.logger import setup_logger
+from utils.media_store import create_media_downloader_from_config
+from utils.metrics import observe_phase
+from utils.outbox import create_outbox_worker_from_config
+
+logger = setup_logger(
+    logger_name="pipeline",
+    log_file="pipeline.log",
+    log_level=20,  # logging.INFO
+)
+
+_STOP = object()  # 工作线程退出信号
+
+
+class ArticlePipeline:
+    """文章写入流水线：爬虫 → [入库队列] → 入库线程 → [通知队列] → 通知线程"""
+
+    def __init__(
+        self,
+        db_path: str = "database/binance_square.db",
+        performance_profile: bool = True,
+        fts_tokenizer: str = "trigram",
+        feishu_notifier=None,
+        queue_size: int = 1000,
+        batch_size: int = 50,
+        batch_wait: float = 0.2,
+        enqueue_notifications: bool = False,
+        outbox=None,
+        media_downloader=None,
+    ):
+        """
+        初始化写入流水线
+
+        :param db_path: 数据库文件路径
+        :param performance_profile: 是否启用数据库性能模式
+        :param fts_tokenizer: 新建全文索引时使用的分词器（trigram/unicode61）
+        :param feishu_notifier: 飞书通知器实例（为 None 时不发送通知）
+        :param queue_size: 入库队列和通知队列的容量（队列满时 submit 阻塞）
+        :param batch_size: 入库线程单个事务最多写入的文章数
+        :param batch_wait: 入库线程凑批时等待后续文章的时间（秒）
+        :param enqueue_notifications: 是否将通知写入发件箱（而不是由通知线程直接发送）
+        :param outbox: 发件箱投递线程（随流水线启动和停止，为 None 时只写入发件箱不发送）
+        :param media_downloader: 图片下载器（随流水线启动和停止，为 None 时不下载图片）
+        """
+        self.db_path = db_path
+        self.performance_profile = performance_profile
+        self.fts_tokenizer = fts_tokenizer
+        self.feishu_notifier = feishu_notifier
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.enqueue_notifications = enqueue_notifications
+        self.outbox = outbox
+        self.media_downloader = media_downloader
+
+        self._persist_queue = queue.Queue(maxsize=queue_size)
+        self._notify_queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._error = None  # 入库线程无法工作（如无法连接数据库）时的异常，此后不再接收新文章
+        self.stats = {
+            "submitted": 0, "persisted": 0, "skipped": 0, "failed": 0,
+            "notified": 0, "notify_failed": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        """工作线程是否在运行（入库线程出错停止后为 False）"""
+        return bool(self._threads) and self._error is None
+
+    def start(self):
+        """启动入库线程和通知线程"""
+        with self._lock:
+            if self._threads:
+                return
+            self._threads = [
+                threading.Thread(target=self._persist_worker, name="pipeline-persist", daemon=True),
+                threading.Thread(target=self._notify_worker, name="pipeline-notify", daemon=True),
+            ]
+            for thread in self._threads:
+                thread.start()
+            if self.outbox is not None:
+                self.outbox.start()
+            if self.media_downloader is not None:
+                self.media_downloader.start()
+        logger.info("✓ 写入流水线已启动")
+
+    def submit(self, article: dict) -> Future:
+        """
+        提交一篇新文章（入库队列满时阻塞，形成背压）
+
+        :param article: 文章字典
+        :return: 入库结果（事务提交后完成，结果为是否新增；写入失败时带有对应异常）
+        """
+        if self._error is not None:
+            raise RuntimeError(f"写入流水线已停止: {str(self._error)}")
+        if not self.running:
+            self.start()
+        future = Future()
+        self._persist_queue.put((article, future))
+        self._count("submitted")
+        return future
+
+    def flush(self, wait_notifications: bool = True):
+        """
+        等待已提交的文章全部入库（以及发送通知）
+
+        :param wait_notifications: 是否同时等待通知发送完成
+        """
+        self._persist_queue.join()
+        if wait_notifications:
+            self._notify_queue.join()
+
+    def close(self):
+        """刷新所有待处理文章后停止工作线程"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        if not threads:
+            return
+
+        self.flush()
+        self._persist_queue.put(_STOP)
+        for thread in threads:
+            thread.join()
+        if self.outbox is not None:
+            self.outbox.stop()
+        if self.media_downloader is not None:
+            self.media_downloader.close()
+        logger.info(f"✓ 写入流水线已关闭 - 统计: {self.stats}")
+
+    def _count(self, key: str, value: int = 1):
+        """更新统计（爬虫线程、入库线程和通知线程同时更新）"""
+        with self._lock:
+            self.stats[key] += value
+
+    def _next_batch(self) -> tuple[list, bool]:
+        """
+        从入库队列中取出一批文章（阻塞等待第一篇，之后在 batch_wait 内尽量凑满一批）
+
+        :return: ((文章, Future) 列表, 是否收到退出信号)
+        """
+        item = self._persist_queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        while len(batch) < self.batch_size:
+            try:
+                item = self._persist_queue.get(timeout=self.batch_wait)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _persist_worker(self):
+        """入库线程：按批次写入数据库，并将真正新增的文章转交通知线程"""
+        db = None
+        try:
+            db = ConnectionManager.get(
+                self.db_path,
+                performance_profile=self.performance_profile,
+                fts_tokenizer=self.fts_tokenizer,
+            ).database()
+        except Exception as e:
+            # 继续消费队列（使已提交的文章失败），flush/close 不会因无人处理队列而挂起
+            self._error = e
+            logger.error(f"× 入库线程无法连接数据库，流水线停止接收新文章: {str(e)}")
+
+        while True:
+            batch, stop = self._next_batch()
+            try:
+                if batch:
+                    inserted = self._persist_batch(db, batch)
+                    if self.media_downloader is not None:
+                        for article in inserted:
+                            self.media_downloader.submit(
+                                DatabaseManager.generate_content_hash(article), article
+                            )
+                    if self.enqueue_notifications:
+                        if inserted and self.outbox is not None:
+                            self.outbox.wake()
+                    elif self.feishu_notifier:
+                        for article in inserted:
+                            self._notify_queue.put(article)
+            except Exception as e:
+                logger.error(f"× 入库线程处理失败: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._persist_queue.task_done()
+                if stop:
+                    # 收到退出信号本身也需要 task_done
+                    self._persist_queue.task_done()
+
+            if stop:
+                self._notify_queue.put(_STOP)
+                return
+
+    def _persist_batch(self, db, batch: list[tuple]) -> list[dict]:
+        """
+        在一个事务中写入一批文章，并完成每篇文章对应的 Future
+
+        :param db: 入库线程的 DatabaseManager
+        :param batch: (文章, Future) 列表
+        :return: 新增的文章列表（写入失败时为空）
+        """
+        if db is None:
+            self._fail_batch(batch, self._error)
+            return []
+
+        articles = [article for article, _ in batch]
+        try:
+            with observe_phase("db_insert"):
+                inserted = db.insert_articles_returning_new(
+                    articles,
+                    enqueue_notifications=self.enqueue_notifications,
+                    enqueue_media=self.media_downloader is not None,
+                )
+        except Exception as e:
+            logger.error(f"× 批次入库失败，{len(batch)} 篇文章未写入: {str(e)}")
+            self._fail_batch(batch, e)
+            return []
+
+        # inserted 按提交顺序排列，是 batch 的子序列（同一文章对象重复提交时只有第一次算新增）
+        remaining = iter(inserted)
+        next_inserted = next(remaining, None)
+        for article, future in batch:
+            is_new = article is next_inserted
+            if is_new:
+                next_inserted = next(remaining, None)
+            future.set_result(is_new)
+        self._count("persisted", len(inserted))
+        self._count("skipped", len(batch) - len(inserted))
+        return inserted
+
+    def _fail_batch(self, batch: list[tuple], error: Exception):
+        """
+        将一批文章标记为写入失败
+
+        :param batch: (文章, Future) 列表
+        :param error: 失败原因
+        """
+        self._count("failed", len(batch))
+        for _, future in batch:
+            future.set_exception(error)
+
+    def _notify_worker(self):
+        """通知线程：逐篇发送飞书通知，发送缓慢不会阻塞爬虫"""
+        while True:
+            article = self._notify_queue.get()
+            try:
+                if article is _STOP:
+                    return
+                if self.feishu_notifier.notify_new_article(article):
+                    self._count("notified")
+                else:
+                    self._count("notify_failed")
+            except Exception as e:
+                self._count("notify_failed")
+                logger.error(f"× 发送飞书通知失败: {str(e)}")
+            finally:
+                self._notify_queue.task_done()
+
+    def __enter__(self):
+        """上下文管理器入口"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """上下文管理器出口"""
+        self.close()
+
+
+# 便捷函数
+def create_pipeline_from_config(
+    config: dict, feishu_notifier=None, deliver_notifications: bool = True
+) -> ArticlePipeline | None:
+    """
+    从配置字典创建写入流水线
+
+    :param config: 配置字典
+    :param feishu_notifier: 飞书通知器实例
+    :param deliver_notifications: 是否在本进程中运行发件箱投递线程
+        （多进程模式下工作进程只写入发件箱，由主进程统一限速发送）
+    :return: ArticlePipeline 实例或 None（未启用时）
+    """
+    pipeline_config = config.get("pipeline", {})
+    if not pipeline_config.get("enabled", False):
+        return None
+
+    use_outbox = (
+        feishu_notifier is not None
+        and config.get("notification_outbox", {}).get("enabled", False)
+    )
+    database_config = config.get("database", {})
+    return ArticlePipeline(
+        db_path=database_config.get("db_path", "database/binance_square.db"),
+        performance_profile=database_config.get("performance_profile", False),
+        fts_tokenizer=database_config.get("fts_tokenizer", "trigram"),
+        feishu_notifier=feishu_notifier,
+        queue_size=pipeline_config.get("queue_size", 1000),
+        batch_size=pipeline_config.get("batch_size", 50),
+        batch_wait=pipeline_config.get("batch_wait", 0.2),
+        enqueue_notifications=use_outbox,
+        outbox=(
+            create_outbox_worker_from_config(config, feishu_notifier)
+            if use_outbox and deliver_notifications else None
+        ),
+        media_downloader=create_media_downloader_from_config(config),
+    )
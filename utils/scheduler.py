@@ -10,10 +10,15 @@ from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 
-from scrapers import BinanceSquareScraper
+from scrapers import BrowserSession, KOLScraperPool, ScraperFarm
+from scrapers.resource_blocker import create_resource_blocker_from_config
+from utils.adaptive_polling import create_polling_planner_from_config
 from utils.logger import setup_logger
-from utils.database import DatabaseManager
-from utils.feishu_notifier import create_feishu_notifier_from_config
+from utils.connection_manager import ConnectionManager
+from utils.exporter import create_exporter_from_config
+from utils.feishu_notifier import get_shared_feishu_notifier
+from utils.metrics import create_metrics_server_from_config
+from utils.pipeline import create_pipeline_from_config
 
 # 设置日志
 logger = setup_logger(
@@ -42,6 +47,12 @@ class SchedulerManager:
             "last_run_time": "",
             "last_run_status": "",
         }
+        self.browser_session = None  # 跨调度周期常驻的浏览器会话
+        self.pool = None  # 跨调度周期常驻的并发爬取池
+        self.pipeline = None  # 常驻的异步写入流水线（pipeline.enabled 时使用）
+        self.farm = None  # 多进程爬虫农场（farm.enabled 时使用）
+        self.metrics_server = None  # 指标和健康检查 HTTP 服务（metrics.enabled 时使用）
+        self.planner = None  # 自适应轮询规划器（scheduler_config.adaptive.enabled 时使用）
 
         # 注册事件监听器
         self.scheduler.add_listener(
@@ -79,57 +90,224 @@ class SchedulerManager:
         logger.error(f"× 任务执行失败 - 异常: {event.exception}")
         logger.error(f"统计: {self.job_stats}")
 
-    def scrape_job(self):
-        """爬虫任务函数"""
+    def scrape_job(self, kol_usernames: list[str] | None = None):
+        """
+        爬虫任务函数
+
+        :param kol_usernames: 本次爬取的 KOL，为 None 时爬取配置中的全部 KOL
+        """
         logger.info(f"\n{'=' * 80}")
         logger.info(f"定时任务开始执行 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         logger.info(f"{'=' * 80}")
 
         try:
             # 获取配置
-            kol_username = self.config.get("kol_username", "goingsun")
+            kol_usernames = kol_usernames or self._get_kol_usernames()
             scheduler_config = self.config.get("scheduler_config", {})
             headless = scheduler_config.get("headless", True)
+            max_concurrency = scheduler_config.get("max_concurrency", 3)
             db_path = self.config.get("database", {}).get("db_path", "database/binance_square.db")
 
-            logger.info(f"KOL 用户名: {kol_username}")
+            logger.info(f"KOL 列表: {', '.join(kol_usernames)}")
+            logger.info(f"并发上限: {max_concurrency}")
+            logger.info(f"爬取方式: {self.config.get('scrape_method', 'drission')}")
             logger.info(f"无头模式: {headless}")
             logger.info(f"数据库路径: {db_path}")
 
-            # 创建飞书通知器
-            feishu_notifier = create_feishu_notifier_from_config(self.config)
-            if feishu_notifier:
-                logger.info("✓ 飞书通知已启用")
-
-            # 创建爬虫实例
-            scraper = BinanceSquareScraper(
-                kol_username=kol_username,
-                headless=headless,
-                save_to_db=True,
-                db_path=db_path,
-                feishu_notifier=feishu_notifier,
-            )
-
-            # 执行爬取
-            with scraper:
-                new_articles = scraper.scrape()
+            # 创建飞书通知器（启用写入流水线时由流水线持有的通知器负责发送）
+            if self.pipeline is None:
+                feishu_notifier = get_shared_feishu_notifier(self.config)
+                if feishu_notifier:
+                    logger.info("✓ 飞书通知已启用")
+                self.pipeline = create_pipeline_from_config(self.config, feishu_notifier)
+                if self.pipeline is not None:
+                    # 立即启动，发件箱中上次遗留的通知无需等到有新文章才发送
+                    self.pipeline.start()
+            else:
+                feishu_notifier = self.pipeline.feishu_notifier
+
+            if self.config.get("farm", {}).get("enabled", False):
+                # 多进程模式：KOL 分片派发给各个工作进程
+                results = self._get_farm().run(kol_usernames)
+            else:
+                # 并发爬取池（共享常驻浏览器，每个 KOL 一个标签页）
+                scraper_kwargs = KOLScraperPool.scraper_kwargs_from_config(
+                    self.config, feishu_notifier, self.pipeline
+                )
+                pool = self._get_pool(headless, max_concurrency, scraper_kwargs)
+                results = pool.run(kol_usernames)
+
+            if self.planner is not None:
+                self.planner.record_results(results)
+
+            new_article_count = sum(len(r["new_articles"]) for r in results)
+            failed_kols = [r["kol_username"] for r in results if not r["success"]]
 
             # 记录结果
             logger.info(f"\n{'=' * 80}")
-            logger.info(f"✓ 任务执行完成 - 本次获取 {len(new_articles)} 篇新文章")
+            logger.info(f"✓ 任务执行完成 - 本次获取 {new_article_count} 篇新文章")
+            if failed_kols:
+                logger.warning(f"! 爬取失败的 KOL: {', '.join(failed_kols)}")
             logger.info(f"{'=' * 80}\n")
 
             # 可选：显示统计信息
-            if len(new_articles) > 0:
-                with DatabaseManager(db_path) as db:
-                    total_count = db.get_article_count()
-                    author_count = len(db.get_articles_by_author(kol_username))
-                    logger.info(f"数据库统计 - 总文章数: {total_count}, {kol_username} 的文章: {author_count}")
+            if new_article_count > 0:
+                db_config = self.config.get("database", {})
+                db = ConnectionManager.get(
+                    db_path,
+                    performance_profile=db_config.get("performance_profile", False),
+                    fts_tokenizer=db_config.get("fts_tokenizer", "trigram"),
+                ).database()
+                total_count = db.get_article_count()
+                logger.info(f"数据库统计 - 总文章数: {total_count}")
+                for result in results:
+                    if not result["new_articles"]:
+                        continue
+                    # 文章的 author 是页面显示的昵称，取本次新文章中的作者统计
+                    author = result["new_articles"][0].get("author", "")
+                    logger.info(
+                        f"  - {result['kol_username']} ({author}) 的文章: "
+                        f"{db.count_articles_by_author(author)}"
+                    )
+
+                # 增量导出新文章到文件
+                self._export_new_articles(db)
+
+            # 全部失败时抛出异常，交给任务失败监听器统计
+            if results and len(failed_kols) == len(results):
+                raise RuntimeError("所有 KOL 爬取均失败")
 
         except Exception as e:
             logger.error(f"× 爬虫任务执行失败: {str(e)}", exc_info=True)
             raise
 
+    def adaptive_scrape_job(self):
+        """自适应轮询任务：每个调度周期只爬取已到期且在全局预算内的 KOL"""
+        db_config = self.config.get("database", {})
+        db = ConnectionManager.get(
+            db_config.get("db_path", "database/binance_square.db"),
+            performance_profile=db_config.get("performance_profile", False),
+            fts_tokenizer=db_config.get("fts_tokenizer", "trigram"),
+        ).database()
+
+        if self.planner is None:
+            self.planner = create_polling_planner_from_config(self.config, self._get_kol_usernames())
+            self.planner.refresh(db)
+            logger.info("✓ 自适应轮询已启用:")
+            for line in self.planner.summary():
+                logger.info(f"  - {line}")
+
+        kol_usernames = self.planner.select_due()
+        if not kol_usernames:
+            return
+        try:
+            self.scrape_job(kol_usernames)
+        except Exception:
+            # 未产生爬取结果时（如浏览器启动失败）同样记录上次爬取时间，按最短间隔重试，
+            # 而不是每个周期都以最高优先级重新选中
+            self.planner.record_failure(kol_usernames)
+            raise
+        finally:
+            # 本次爬到的新文章计入发文速率，据此更新下次爬取时间
+            self.planner.refresh(db, kol_usernames)
+
+    def _export_new_articles(self, db):
+        """
+        将上次导出之后新增的文章导出到文件（output.scheduled_export 启用时）
+
+        :param db: 当前线程的 DatabaseManager
+        """
+        try:
+            exporter = create_exporter_from_config(self.config, db)
+            if exporter is not None:
+                exporter.export(incremental=True)
+        except Exception as e:
+            # 导出失败不影响爬取任务，下次会从同一标记继续导出
+            logger.error(f"× 导出文章失败: {str(e)}")
+
+    def _get_browser_session(self, headless: bool) -> BrowserSession:
+        """
+        获取常驻浏览器会话（首次调用时创建，后续调度周期复用已预热的 Chrome）
+
+        :param headless: 是否使用无头模式
+        :return: BrowserSession 实例
+        """
+        if self.browser_session is None:
+            browser_config = self.config.get("browser", {})
+            self.browser_session = BrowserSession(
+                headless=headless,
+                max_jobs=browser_config.get("max_jobs", 50),
+                max_memory_mb=browser_config.get("max_memory_mb", 1200),
+                user_data_dir=browser_config.get("user_data_dir", "/tmp/chrome-debug"),
+                resource_blocker=create_resource_blocker_from_config(self.config),
+            )
+            logger.info(
+                f"✓ 已创建常驻浏览器会话 (回收阈值: {self.browser_session.max_jobs} 个任务 / "
+                f"{self.browser_session.max_memory_mb}MB)"
+            )
+        return self.browser_session
+
+    def _get_pool(self, headless: bool, max_concurrency: int, scraper_kwargs: dict) -> KOLScraperPool:
+        """
+        获取常驻并发爬取池（工作线程及其数据库长连接在调度周期之间复用）
+
+        :param headless: 是否使用无头模式
+        :param max_concurrency: 并发上限
+        :param scraper_kwargs: 传给 BinanceSquareScraper 的参数（启动前传入，纯接口模式据此不启动浏览器）
+        :return: KOLScraperPool 实例
+        """
+        if self.pool is None:
+            self.pool = KOLScraperPool(
+                headless=headless,
+                max_concurrency=max_concurrency,
+                scraper_kwargs=scraper_kwargs,
+                browser_session=self._get_browser_session(headless),
+            )
+            self.pool.start()
+        else:
+            self.pool.scraper_kwargs = scraper_kwargs
+        return self.pool
+
+    def _close_browser_session(self):
+        """关闭常驻并发爬取池和浏览器会话"""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+        if self.browser_session is not None:
+            self.browser_session.close()
+            self.browser_session = None
+            logger.info("✓ 常驻浏览器已关闭")
+
+    def _get_farm(self) -> ScraperFarm:
+        """
+        获取多进程爬虫农场（首次调用时启动工作进程，后续调度周期复用）
+
+        :return: ScraperFarm 实例
+        """
+        if self.farm is None:
+            self.farm = ScraperFarm(self.config)
+            self.farm.start()
+            logger.info(f"✓ 爬虫农场已启动: {self.farm.worker_count} 个工作进程")
+        return self.farm
+
+    def _close_farm(self):
+        """关闭多进程爬虫农场"""
+        if self.farm is not None:
+            self.farm.close()
+            self.farm = None
+
+    def _get_kol_usernames(self) -> list[str]:
+        """
+        获取需要爬取的 KOL 列表
+        优先使用 kol_usernames，兼容旧的单个 kol_username 配置
+
+        :return: KOL 用户名列表
+        """
+        kol_usernames = self.config.get("kol_usernames") or []
+        if not kol_usernames:
+            kol_usernames = [self.config.get("kol_username", "goingsun")]
+        return list(dict.fromkeys(kol_usernames))
+
     def add_interval_job(self, hours: int = 1, minutes: int = 0):
         """
         添加间隔触发任务
@@ -147,6 +325,23 @@ class SchedulerManager:
         )
         logger.info(f"✓ 已添加间隔任务: 每 {hours} 小时 {minutes} 分钟执行一次")
 
+    def add_adaptive_job(self, tick_seconds: float = 60):
+        """
+        添加自适应轮询任务（按周期检查到期的 KOL，替代固定间隔任务）
+
+        :param tick_seconds: 调度周期（秒）
+        """
+        trigger = IntervalTrigger(seconds=tick_seconds)
+        self.scheduler.add_job(
+            self.adaptive_scrape_job,
+            trigger=trigger,
+            id="scrape_adaptive_job",
+            name="自适应轮询爬虫任务",
+            replace_existing=True,
+            coalesce=True,  # 爬取耗时超过一个周期时合并错过的周期
+        )
+        logger.info(f"✓ 已添加自适应轮询任务: 每 {tick_seconds} 秒检查一次到期的 KOL")
+
     def setup_jobs(self):
         """根据配置文件设置任务"""
         scheduler_config = self.config.get("scheduler_config", {})
@@ -156,19 +351,31 @@ class SchedulerManager:
             logger.warning("! 调度器未启用，请在 config.json 中设置 scheduler_config.enabled = true")
             sys.exit(0)
 
-        # 获取间隔配置
-        hours = scheduler_config.get("interval_hours", 1)
-        minutes = scheduler_config.get("interval_minutes", 0)
-
-        # 添加间隔任务
-        self.add_interval_job(hours=hours, minutes=minutes)
+        # 先启动指标服务，立即执行的首次任务同样会被记录
+        self.metrics_server = create_metrics_server_from_config(self.config)
+        if self.metrics_server is not None:
+            self.metrics_server.start()
+
+        adaptive_config = scheduler_config.get("adaptive", {})
+        if adaptive_config.get("enabled", False):
+            # 自适应轮询：每个 KOL 按发文频率独立安排爬取时间
+            self.add_adaptive_job(tick_seconds=adaptive_config.get("tick_seconds", 60))
+            job = self.adaptive_scrape_job
+        else:
+            # 获取间隔配置
+            hours = scheduler_config.get("interval_hours", 1)
+            minutes = scheduler_config.get("interval_minutes", 0)
+
+            # 添加间隔任务
+            self.add_interval_job(hours=hours, minutes=minutes)
+            job = self.scrape_job
 
         # 是否立即执行一次
         run_immediately = scheduler_config.get("run_immediately", False)
         if run_immediately:
             logger.info("立即执行一次爬虫任务...")
             try:
-                self.scrape_job()
+                job()
             except Exception as e:
                 logger.error(f"× 立即执行任务失败: {str(e)}")
 
@@ -203,6 +410,16 @@ class SchedulerManager:
         except (KeyboardInterrupt, SystemExit):
             logger.info("\n接收到停止信号，正在关闭调度器...")
             self.scheduler.shutdown()
+            self._close_browser_session()
+            self._close_farm()
+            if self.pipeline is not None:
+                # 刷新尚未入库和通知的文章
+                self.pipeline.close()
+                self.pipeline = None
+            ConnectionManager.close_all_instances()
+            if self.metrics_server is not None:
+                self.metrics_server.close()
+                self.metrics_server = None
             logger.info("✓ 调度器已停止")
             logger.info(f"运行统计: {self.job_stats}")
 
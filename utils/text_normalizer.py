@@ -0,0 +1,41 @@
+"""
+卡片文本规范化模块
+浏览器（innerText）和 JSON 接口（content 字段）返回的同一篇文章在空白、零宽字符和
+"展开"等折叠标记上存在差异；内容哈希和爬取水位都依赖文章内容，
+因此三种提取方式（dom / js / network）计算内容哈希和水位前缀前统一使用同一套规则规范化
+（入库的仍是原文，保留段落换行）。
+NORMALIZE_TEXT_JS 是同一规则的 JavaScript 实现，供注入脚本在页面内比对水位使用，修改时两处需保持一致
+"""
+
+import re
+
+# 零宽字符和 BOM（直接删除）
+_INVISIBLE_RE = re.compile(r"[\u200b\u200c\u200d\u2060\ufeff]")
+# 空白字符（与 JavaScript 的 \s 一致，不使用 Python 的 \s 以免两端规则不同）
+_WHITESPACE_RE = re.compile(r"[ \t\n\r\f\v\u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+")
+# 末尾的折叠标记（页面截断长文时追加的省略号和 "展开" 按钮文本）
+_FOLD_MARKER_RE = re.compile(
+    r"(?:\s*(?:\.{3}|…))?\s*(?:展开全文|展开|查看更多|显示更多|see more|show more|read more)$",
+    re.IGNORECASE,
+)
+
+NORMALIZE_TEXT_JS = r"""
+const normalizeText = (value) => String(value || '')
+    .replace(/[\u200b\u200c\u200d\u2060\ufeff]/g, '')
+    .replace(/[ \t\n\r\f\v\u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+/g, ' ')
+    .trim()
+    .replace(/(?:\s*(?:\.{3}|…))?\s*(?:展开全文|展开|查看更多|显示更多|see more|show more|read more)$/i, '')
+    .trim();
+"""
+
+
+def normalize_text(text) -> str:
+    """
+    规范化卡片文本：删除零宽字符，连续空白（含换行）合并为一个空格，去掉首尾空白和末尾的折叠标记
+
+    :param text: 原始文本（None 视为空字符串）
+    :return: 规范化后的文本
+    """
+    text = _INVISIBLE_RE.sub("", str(text or ""))
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    return _FOLD_MARKER_RE.sub("", text).strip()
@@ -0,0 +1,135 @@
+"""
+发布时间解析模块
+将页面上显示的发布时间（相对时间如 "5m"、"3小时前"，或 "01-05 10:20" 等绝对时间）
+按抓取时间换算为 Unix 时间戳，便于排序和按时间范围查询
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Union
+
+# 相对时间单位 -> 秒数（英文缩写、英文全称、中文）
+_UNIT_SECONDS = {
+    "s": 1, "sec": 1, "secs": 1, "second": 1, "seconds": 1, "秒": 1,
+    "m": 60, "min": 60, "mins": 60, "minute": 60, "minutes": 60, "分钟": 60, "分": 60,
+    "h": 3600, "hr": 3600, "hrs": 3600, "hour": 3600, "hours": 3600, "小时": 3600, "时": 3600,
+    "d": 86400, "day": 86400, "days": 86400, "天": 86400, "日": 86400,
+    "w": 604800, "week": 604800, "weeks": 604800, "周": 604800, "星期": 604800,
+}
+
+_RELATIVE_RE = re.compile(r"^(\d+)\s*([a-z]+|[一-鿿]+?)\s*(?:ago|前)?$", re.IGNORECASE)
+_JUST_NOW = {"just now", "now", "刚刚", "刚才"}
+_YESTERDAY_RE = re.compile(r"^(?:yesterday|昨天)\s*(\d{1,2}:\d{2})?$", re.IGNORECASE)
+_TIME_OF_DAY_RE = re.compile(r"^(?:today|今天)?\s*(\d{1,2}):(\d{2})$", re.IGNORECASE)
+
+# 带年份的绝对时间格式
+_ABSOLUTE_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%Y/%m/%d %H:%M",
+    "%Y/%m/%d",
+    "%Y年%m月%d日 %H:%M",
+    "%Y年%m月%d日",
+    "%b %d, %Y",
+    "%d %b %Y",
+)
+# 不带年份的格式（按抓取时间补全年份，晚于抓取时间则视为去年）
+_YEARLESS_FORMATS = (
+    "%m-%d %H:%M",
+    "%m-%d",
+    "%m/%d %H:%M",
+    "%m/%d",
+    "%m月%d日 %H:%M",
+    "%m月%d日",
+    "%b %d %H:%M",
+    "%b %d",
+    "%d %b",
+)
+
+
+def parse_scraped_at(value: Union[str, datetime, None]) -> datetime:
+    """
+    将数据库中的 scraped_at（SQLite CURRENT_TIMESTAMP，UTC）转换为本地时区时间
+
+    :param value: scraped_at 字符串或 datetime
+    :return: 带时区的本地时间（无法解析时返回当前时间）
+    """
+    if isinstance(value, datetime):
+        return value.astimezone()
+    try:
+        scraped_at = datetime.strptime(str(value), "%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return datetime.now().astimezone()
+    return scraped_at.replace(tzinfo=timezone.utc).astimezone()
+
+
+def parse_display_time(
+    text: str, reference: Optional[datetime] = None
+) -> Optional[float]:
+    """
+    将页面显示的发布时间换算为 Unix 时间戳
+
+    :param text: 页面显示的时间文本
+    :param reference: 抓取时间（相对时间以此为基准，默认当前时间）
+    :return: Unix 时间戳（秒），无法识别时返回 None
+    """
+    reference = (reference or datetime.now()).astimezone()
+    text = " ".join((text or "").split())
+    if not text:
+        return None
+    lowered = text.lower()
+
+    if lowered in _JUST_NOW:
+        return reference.timestamp()
+
+    # 纯数字视为秒/毫秒时间戳
+    if text.isdigit():
+        timestamp = float(text)
+        return timestamp / 1000 if timestamp > 1e12 else timestamp
+
+    match = _RELATIVE_RE.match(lowered)
+    if match and match.group(2) in _UNIT_SECONDS:
+        seconds = int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+        return (reference - timedelta(seconds=seconds)).timestamp()
+
+    try:
+        match = _YESTERDAY_RE.match(lowered)
+        if match:
+            day = reference - timedelta(days=1)
+            if match.group(1):
+                hour, minute = map(int, match.group(1).split(":"))
+                day = day.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            return day.timestamp()
+
+        match = _TIME_OF_DAY_RE.match(lowered)
+        if match:
+            return reference.replace(
+                hour=int(match.group(1)), minute=int(match.group(2)), second=0, microsecond=0
+            ).timestamp()
+    except ValueError:
+        # 时分超出范围（如 "25:00"），按无法识别处理
+        return None
+
+    local_tz = reference.tzinfo
+    for fmt in _ABSOLUTE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).replace(tzinfo=local_tz).timestamp()
+        except ValueError:
+            continue
+
+    for fmt in _YEARLESS_FORMATS:
+        try:
+            # 指定年份解析，避免 2 月 29 日在默认的 1900 年解析失败
+            parsed = datetime.strptime(f"{reference.year} {text}", f"%Y {fmt}")
+        except ValueError:
+            continue
+        parsed = parsed.replace(tzinfo=local_tz)
+        if parsed > reference + timedelta(days=1):
+            try:
+                parsed = parsed.replace(year=reference.year - 1)
+            except ValueError:
+                continue
+        return parsed.timestamp()
+
+    return None